@@ -10,6 +10,8 @@ from app.db.database import Base
 from app.db.models.user import User
 from app.db.models.project import Project
 from app.db.models.file import File
+from app.db.models.file_deletion import FileDeletion
+from app.db.models.upload_job import UploadJob
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
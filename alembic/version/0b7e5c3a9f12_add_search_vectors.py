@@ -0,0 +1,47 @@
+"""Add full-text search vectors to projects and files
+
+Revision ID: 0b7e5c3a9f12
+Revises: f1c2a7b9d054
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+PROJECTS_VECTOR = (
+    "setweight(to_tsvector('simple', translate(coalesce(name, ''), '._-/', '    ')), 'A') || "
+    "setweight(to_tsvector('simple', translate(coalesce(description, ''), '._-/', '    ')), 'B')"
+)
+FILES_VECTOR = (
+    "setweight(to_tsvector('simple', translate(coalesce(filename, ''), '._-/', '    ')), 'A') || "
+    "setweight(to_tsvector('simple', translate(coalesce(original_filename, ''), '._-/', '    ')), 'B')"
+)
+
+# revision identifiers, used by Alembic.
+revision = '0b7e5c3a9f12'
+down_revision = 'f1c2a7b9d054'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Colunas geradas (STORED): o Postgres recalcula o vetor a cada escrita
+    op.add_column('projects', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed(PROJECTS_VECTOR, persisted=True),
+    ))
+    op.add_column('files', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed(FILES_VECTOR, persisted=True),
+    ))
+    op.create_index('ix_projects_search_vector', 'projects', ['search_vector'], postgresql_using='gin')
+    op.create_index('ix_files_search_vector', 'files', ['search_vector'], postgresql_using='gin')
+
+
+def downgrade():
+    op.drop_index('ix_files_search_vector', table_name='files')
+    op.drop_index('ix_projects_search_vector', table_name='projects')
+    op.drop_column('files', 'search_vector')
+    op.drop_column('projects', 'search_vector')
@@ -0,0 +1,52 @@
+"""Add upload_jobs for asynchronous uploads
+
+Revision ID: 3e8a1f6c5d20
+Revises: 7c4d9e2b1a63
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '3e8a1f6c5d20'
+down_revision = '7c4d9e2b1a63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    upload_job_status = postgresql.ENUM('queued', 'processing', 'completed', 'failed', name='uploadjobstatus')
+    upload_job_status.create(op.get_bind())
+
+    op.create_table(
+        'upload_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column(
+            'status',
+            postgresql.ENUM('queued', 'processing', 'completed', 'failed', name='uploadjobstatus', create_type=False),
+            nullable=False,
+        ),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('uploader_id', sa.Integer(), nullable=False),
+        sa.Column('original_filename', sa.String(), nullable=False),
+        sa.Column('content_type', sa.String(), nullable=True),
+        sa.Column('file_size', sa.BigInteger(), nullable=False),
+        sa.Column('file_id', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['uploader_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['file_id'], ['files.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_upload_jobs_id'), 'upload_jobs', ['id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_upload_jobs_id'), table_name='upload_jobs')
+    op.drop_table('upload_jobs')
+    postgresql.ENUM(name='uploadjobstatus').drop(op.get_bind())
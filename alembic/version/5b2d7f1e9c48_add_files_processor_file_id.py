@@ -0,0 +1,25 @@
+"""Store the file processor id on files
+
+Revision ID: 5b2d7f1e9c48
+Revises: 3e8a1f6c5d20
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2d7f1e9c48'
+down_revision = '3e8a1f6c5d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Nulo nos arquivos já existentes: o id do processador não foi guardado
+    op.add_column('files', sa.Column('processor_file_id', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('files', 'processor_file_id')
@@ -0,0 +1,41 @@
+"""Add file_deletions outbox for file processor deletes
+
+Revision ID: 7c4d9e2b1a63
+Revises: 0b7e5c3a9f12
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c4d9e2b1a63'
+down_revision = '0b7e5c3a9f12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'file_deletions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('file_id', sa.Integer(), nullable=False),
+        sa.Column('file_path', sa.String(), nullable=True),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_file_deletions_id'), 'file_deletions', ['id'], unique=False)
+    op.create_index(
+        'ix_file_deletions_next_attempt_at', 'file_deletions', ['next_attempt_at'], unique=False,
+        postgresql_where=sa.text('next_attempt_at IS NOT NULL'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_file_deletions_next_attempt_at', table_name='file_deletions')
+    op.drop_index(op.f('ix_file_deletions_id'), table_name='file_deletions')
+    op.drop_table('file_deletions')
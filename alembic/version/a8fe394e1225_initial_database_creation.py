@@ -27,7 +27,7 @@ def upgrade():
         sa.Column('email', sa.String(), nullable=False),
         sa.Column('hashed_password', sa.String(), nullable=False),
         sa.Column('full_name', sa.String(), nullable=True),
-        sa.Column('role', sa.Enum('freelancer', 'client', 'admin', name='userrole'), nullable=False),
+        sa.Column('role', postgresql.ENUM('freelancer', 'client', 'admin', name='userrole', create_type=False), nullable=False),
         sa.Column('is_active', sa.Boolean(), server_default='true', nullable=False),
         sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
         sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
@@ -0,0 +1,52 @@
+"""Add composite indexes for hot filter paths
+
+Revision ID: d3d8d6e433f8
+Revises: a8fe394e1225
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3d8d6e433f8'
+down_revision = 'a8fe394e1225'
+branch_labels = None
+depends_on = None
+
+
+# (nome do índice, tabela, colunas) - cada índice cobre o filtro + ORDER BY id
+# usado pela paginação dos repositórios e serviços
+INDEXES = [
+    ('ix_files_project_id_id', 'files', ['project_id', 'id']),
+    ('ix_files_uploader_id_id', 'files', ['uploader_id', 'id']),
+    ('ix_projects_owner_id_id', 'projects', ['owner_id', 'id']),
+    ('ix_projects_client_id_id', 'projects', ['client_id', 'id']),
+    ('ix_users_role_id', 'users', ['role', 'id']),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
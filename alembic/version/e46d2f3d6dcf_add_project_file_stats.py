@@ -0,0 +1,41 @@
+"""Add denormalized file stats to projects
+
+Revision ID: e46d2f3d6dcf
+Revises: d3d8d6e433f8
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e46d2f3d6dcf'
+down_revision = 'd3d8d6e433f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('projects', sa.Column('file_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('projects', sa.Column('total_file_size', sa.BigInteger(), server_default='0', nullable=False))
+
+    # Preenche os contadores a partir dos arquivos já existentes
+    op.execute(
+        """
+        UPDATE projects AS p
+        SET file_count = stats.file_count,
+            total_file_size = stats.total_file_size
+        FROM (
+            SELECT project_id, count(*) AS file_count, coalesce(sum(file_size), 0) AS total_file_size
+            FROM files
+            GROUP BY project_id
+        ) AS stats
+        WHERE stats.project_id = p.id
+        """
+    )
+
+
+def downgrade():
+    op.drop_column('projects', 'total_file_size')
+    op.drop_column('projects', 'file_count')
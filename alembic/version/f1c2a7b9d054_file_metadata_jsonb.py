@@ -0,0 +1,38 @@
+"""Store file metadata as JSONB with a GIN index
+
+Revision ID: f1c2a7b9d054
+Revises: e46d2f3d6dcf
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c2a7b9d054'
+down_revision = 'e46d2f3d6dcf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # O texto já contém JSON (gravado com json.dumps); vazios viram NULL
+    op.alter_column(
+        'files', 'metadata',
+        type_=postgresql.JSONB(),
+        existing_type=sa.Text(),
+        postgresql_using="NULLIF(metadata, '')::jsonb",
+    )
+    op.create_index('ix_files_metadata', 'files', ['metadata'], postgresql_using='gin')
+
+
+def downgrade():
+    op.drop_index('ix_files_metadata', table_name='files')
+    op.alter_column(
+        'files', 'metadata',
+        type_=sa.Text(),
+        existing_type=postgresql.JSONB(),
+        postgresql_using='metadata::text',
+    )
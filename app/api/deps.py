@@ -13,16 +13,19 @@ from app.core.dependencies import (
     get_current_client_user,
     get_current_admin_or_freelancer_user,
 )
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
 from app.db.models.user import User
+from app.services.file_processor import get_file_processor
 
 # Re-export dependencies for use in API endpoints
 __all__ = [
     "get_db",
+    "get_async_db",
     "get_current_user",
     "get_current_active_user",
     "get_current_admin_user",
     "get_current_freelancer_user",
     "get_current_client_user",
     "get_current_admin_or_freelancer_user",
+    "get_file_processor",
 ]
\ No newline at end of file
@@ -1,36 +1,35 @@
 from datetime import timedelta
 from typing import Any 
 
-from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.v1.schemas.token import Token
 from app.api.v1.schemas.user import User, UserCreate
 from app.core.security import (
     create_access_token,
-    get_password_hash,
-    verify_password,
     get_current_user,
+    UserPrincipal,
 ) 
 
 from app.config import settings
-from app.db.database import get_db
-from app.db.models.user import User as UserModel
-from app.services import user_service
+from app.db.database import get_async_db, get_db
+from app.services import async_user_service, user_service
 
 router = APIRouter()
 
 @router.post("/login", response_model=Token)
-def login_access_token(
-    db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
+async def login_access_token(
+    db: AsyncSession = Depends(get_async_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth Token de Login Compatível, get para acesso do token para futuras requisições
     """
 
     # Autenticação usuário
-    user = user_service.authenticate(db, email=form_data.username, password=form_data.password)
+    user = await async_user_service.authenticate(db, email=form_data.username, password=form_data.password)
     if not user:
         raise HTTPException(status_code=400, detail="Email ou senha incorretos")
     elif not user.is_active:
@@ -46,24 +45,25 @@ def login_access_token(
     }
 
 @router.post("/register", response_model=User)
-def register_user(
+async def register_user(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_in: UserCreate,
 ) -> Any:
     """ Registrar novo usuário"""
     # Verificando se o email já está cadastrado
-    user = user_service.get_by_email(db, email=user_in.email)
+    user = await async_user_service.get_by_email(db, email=user_in.email)
     if user:
         raise HTTPException(status_code=400, detail="Um usuário com este email já existe no sistema")
     
     # Criando novo usuário
-    user = user_service.create(db, obj_in=user_in)
+    user = await async_user_service.create(db, obj_in=user_in)
     return user
 
 @router.get("/me", response_model=User)
 def read_users_me(
-    current_user: UserModel = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ) -> Any:
     """Receber usuário atual"""
-    return current_user
\ No newline at end of file
+    return user_service.get(db, id=current_user.id)
\ No newline at end of file
@@ -1,36 +1,87 @@
+import asyncio
 import json
-from typing import Any, List, Optional 
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
 import httpx
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File as FastAPIFile, Form, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, UploadFile, File as FastAPIFile, Form, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import Text, cast
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.v1.schemas.file import File, FileCreate, FileUpdate, FileDetail
-from app.core.security import get_current_active_user
-from app.db.database import get_db
+from app.api.v1.schemas.file import BatchUploadResult, File, FileCreate, FileUpdate, FileDetail, UploadJob
+from app.core.exceptions import PayloadTooLargeError, ServiceOverloadedError
+from app.core.response_cache import project_tag, response_cache, user_tag
+from app.core.security import UserPrincipal, get_current_active_user
+from app.db.database import get_async_db, get_db
+from app.db.models.file import File as FileModel
 from app.db.models.user import User, UserRole
-from app.services import file_service, project_service
+from app.db.pagination import set_next_cursor, set_next_rank_cursor
+from app.services import async_file_service, async_project_service, async_upload_job_service, file_service, project_service
+from app.services.file_deletion_worker import FileDeletionWorker, get_file_deletion_worker
+from app.services.file_processor import FileProcessorClient, forward_upload, get_file_processor
+from app.services.upload_job_runner import UploadJobRunner, get_upload_job_runner
+from app.utils.etag import compute_etag, etag_matches, not_modified, page_etag, set_etag
+from app.utils.export import EXPORT_FORMAT_PATTERN, export_response
+from app.utils.serialization import RowListSerializer
 from app.config import settings
 
 router = APIRouter()
 
-@router.post("/upload/", response_model=File)
+# Os metadados (JSONB) saem como texto e são decodificados pelo pydantic-core,
+# sem o json.loads por linha do codec do asyncpg
+file_list_serializer = RowListSerializer(
+    File, FileModel, columns={"metadata": cast(FileModel.metadata_, Text).label("metadata")}
+)
+# Colunas da listagem: as do schema mais updated_at, usado apenas no ETag
+file_list_columns = (*file_list_serializer.columns, FileModel.updated_at)
+
+def metadata_filters(
+    metadata: Optional[str] = Query(
+        None, description='Objeto JSON contido nos metadados, ex.: {"tags": ["signed"]}'
+    ),
+    metadata_key: List[str] = Query([], description="Chaves que devem existir nos metadados"),
+) -> Dict[str, Any]:
+    """
+    Filtros de metadados das listagens de arquivos (contenção e existência de chave)
+    """
+    contains = None
+    if metadata:
+        try:
+            contains = json.loads(metadata)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="O filtro metadata deve ser um JSON válido")
+        if not isinstance(contains, dict):
+            raise HTTPException(status_code=400, detail="O filtro metadata deve ser um objeto JSON")
+    return {"metadata_contains": contains, "metadata_keys": metadata_key}
+
+@router.post("/upload/", response_model=File, responses={202: {"model": UploadJob}})
 async def upload_file(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     project_id: int = Form(...),
     file: UploadFile = FastAPIFile(...),
-    current_user: User = Depends(get_current_active_user),
+    mode: str = Query("sync", pattern="^(sync|async)$"),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    file_processor: FileProcessorClient = Depends(get_file_processor),
+    upload_jobs: UploadJobRunner = Depends(get_upload_job_runner),
+    deletion_worker: FileDeletionWorker = Depends(get_file_deletion_worker),
 ) -> Any:
     """
     Upload de arquivo para um projeto
     
     Clientes pode dar upload de arquivos em seus projetos.
     Freelancers pode dar Upload de arquivos em projetos que eles são donos/estão trabalhando.
+    Com `mode=async` o arquivo é gravado em disco e a resposta é 202 com o job
+    de upload; o envio ao processador acontece em segundo plano e o andamento
+    é consultado em GET /files/jobs/{job_id} (header Location).
     """
 
     # Get the project
-    project = project_service.get(db=db, id=project_id)
+    project = await async_project_service.get(db=db, id=project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Projeto não encontrado")
     
@@ -38,76 +89,164 @@ async def upload_file(
     if (current_user.role == UserRole.FREELANCER and project.owner_id != current_user.id) or \
        (current_user.role == UserRole.CLIENT and project.client_id != current_user.id):
         raise HTTPException(status_code=403, detail="Usuário não autorizado a dar upload de arquivos neste projeto")
+
+    if mode == "async":
+        try:
+            staged = await upload_jobs.stage(file)
+        except (PayloadTooLargeError, ServiceOverloadedError) as exc:
+            raise exc.to_http_exception()
+        job = await upload_jobs.submit(staged, project_id=project_id, uploader_id=current_user.id)
+        return JSONResponse(
+            status_code=202,
+            content=jsonable_encoder(UploadJob.model_validate(job)),
+            headers={"Location": f"{settings.API_V1_STR}/files/jobs/{job.id}"},
+        )
     
-    # Ler conteúdo do arquivo
-    file_content = await file.read()
-
-    # Preparar dados para o upload do arquivo
-    file_data = {
-        "filename": file.filename,
-        "content_type": file.content_type,
-        "file_size": len(file_content),
-        "project_id": project_id,
-        "uploader_id": current_user.id,
-    }
+    # Enviar o arquivo para o serviço de armazenamento em blocos
+    try:
+        processed_data = await forward_upload(
+            file_processor, file, project_id=project_id, uploader_id=current_user.id
+        )
+    except PayloadTooLargeError as exc:
+        raise exc.to_http_exception()
+    except httpx.RequestError as exc:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Erro na comunicação com o processador de arquivos: {str(exc)}",
+        )
+
+    # Criar arquivo e gravar no banco de dados
+    file_in = FileCreate(
+        filename=processed_data["filename"],
+        project_id=project_id,
+    )
 
-    # Enviar o arquivo para o serviço de armazenamento
     try:
-        async with httpx.AsyncClient() as client:
-            files = {"file": (file.filename, file_content, file.content_type)}
-            data = {"metadata": json.dumps(file_data)}
-
-            response = await client.post(
-                f"{settings.FILE_PROCESSOR_URL}/api/files/upload",
-                files=files,
-                json=data,
-            )
+        file_obj = await async_file_service.create(
+            db=db,
+            obj_in=file_in,
+            file_data=processed_data,
+            uploader_id=current_user.id,
+        )
+    except Exception:
+        # O arquivo já está no processador: registrar a remoção no outbox
+        await db.rollback()
+        await async_file_service.discard_forwarded(db, files_data=[processed_data])
+        deletion_worker.notify()
+        raise
+
+    return file_obj
+
+@router.post("/upload/batch/", response_model=BatchUploadResult)
+async def upload_files_batch(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    project_id: int = Form(...),
+    files: List[UploadFile] = FastAPIFile(...),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    file_processor: FileProcessorClient = Depends(get_file_processor),
+    deletion_worker: FileDeletionWorker = Depends(get_file_deletion_worker),
+) -> Any:
+    """
+    Upload de vários arquivos para um projeto em uma única requisição
+
+    A verificação de projeto e permissão é feita uma vez para o lote. Os arquivos
+    são enviados ao processador com concorrência limitada e todos os registros
+    são gravados em uma única transação. Falhas individuais não interrompem o
+    lote e são reportadas por arquivo. Se a gravação falhar, a remoção dos
+    arquivos já enviados ao processador é registrada no outbox.
+    """
+    if len(files) > settings.MAX_BATCH_UPLOAD_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Máximo de {settings.MAX_BATCH_UPLOAD_FILES} arquivos por lote",
+        )
+
+    project = await async_project_service.get(db=db, id=project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Projeto não encontrado")
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Erro ao processar o arquivo: {response.text}",
+    # Checar se o usuário tem autorização para dar upload de arquivos neste projeto
+    if (current_user.role == UserRole.FREELANCER and project.owner_id != current_user.id) or \
+       (current_user.role == UserRole.CLIENT and project.client_id != current_user.id):
+        raise HTTPException(status_code=403, detail="Usuário não autorizado a dar upload de arquivos neste projeto")
+
+    semaphore = asyncio.Semaphore(settings.BATCH_UPLOAD_CONCURRENCY)
+
+    async def forward(upload: UploadFile) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        async with semaphore:
+            try:
+                processed = await forward_upload(
+                    file_processor, upload, project_id=project_id, uploader_id=current_user.id
                 )
+                return processed, None
+            except (PayloadTooLargeError, HTTPException) as exc:
+                return None, str(exc.detail)
+            except httpx.RequestError as exc:
+                return None, f"Erro na comunicação com o processador de arquivos: {str(exc)}"
 
-            # Obter a resposta do processador de arquivos
-            file_data = response.json()
+    outcomes = await asyncio.gather(*(forward(upload) for upload in files))
 
-            # Criar arquivo e gravar no banco de dados
-            file_in = FileCreate(
-                filename=file_data["filename"],
-                project_id=project_id,
+    # Gravar todos os arquivos processados com sucesso em uma única transação
+    forwarded = [processed for processed, _ in outcomes if processed is not None]
+    try:
+        created_files = iter(
+            await async_file_service.create_multi(
+                db=db, project_id=project_id, files_data=forwarded, uploader_id=current_user.id
             )
+        )
+    except Exception:
+        # Os arquivos já estão no processador: registrar a remoção no outbox
+        await db.rollback()
+        await async_file_service.discard_forwarded(db, files_data=forwarded)
+        deletion_worker.notify()
+        raise
 
-            file_obj = file_service.create(
-                db=db, 
-                obj_in=file_in, 
-                uploader_id=current_user.id
-            )
+    results = []
+    for upload, (processed, error) in zip(files, outcomes):
+        if processed is None:
+            results.append({"filename": upload.filename, "status": "failed", "error": error})
+        else:
+            results.append({"filename": upload.filename, "status": "created", "file": next(created_files)})
+
+    created = sum(1 for result in results if result["status"] == "created")
+    return {
+        "project_id": project_id,
+        "created": created,
+        "failed": len(results) - created,
+        "results": results,
+    }
 
-            return file_obj
-    
-    except httpx.RequestError as exc:
-        raise HTTPException(
-            status_code=503,
-            detail=f"Erro na comunicação com o processador de arquivos: {str(exc)}",
-        )
-    
 @router.get("/", response_model=List[File])
-def read_files(
-    db: Session = Depends(get_db),
+async def read_files(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     project_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    filters: Dict[str, Any] = Depends(metadata_filters),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """ 
     Recuperação de arquivos
 
     Caso o id do projeto seja fornecido, obtenha os arquivos do projeto,
     Caso contrário, pegue todos os arquivos que o usuário tem acesso.
+    Para paginação por cursor, envie o valor do header X-Next-Cursor em `cursor`.
+    `metadata` e `metadata_key` filtram pelos metadados dos arquivos.
+    Responde 304 quando o If-None-Match corresponde ao ETag da página.
     """
+    # Resposta em cache para este usuário e parâmetros. Mudanças no projeto (inclusive
+    # de owner/client) invalidam a tag, então um hit já passou pela checagem de permissão
+    tag = project_tag(project_id) if project_id else user_tag(current_user.id)
+    slot = await response_cache.lookup(request, user_id=current_user.id, tag=tag)
+    if slot.hit:
+        return response_cache.respond(request, slot)
+
     if project_id:
-        project = project_service.get(db=db, id=project_id)
+        project = await async_project_service.get(db=db, id=project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Projeto não encontrado")
         
@@ -115,48 +254,179 @@ def read_files(
         if (current_user.role == UserRole.FREELANCER and project.owner_id != current_user.id) or \
            (current_user.role == UserRole.CLIENT and project.client_id != current_user.id):
             raise HTTPException(status_code=403, detail="Usuário não autorizado a ver os arquivos deste projeto")
-        
+
+    # Colunas do schema e updated_at em uma única consulta: o ETag sai das
+    # mesmas linhas serializadas no corpo
+    columns = file_list_columns
+    if project_id:
         # Recuperar arquivos do projeto
-        files = file_service.get_multi_by_project(
-            db=db, project_id=project_id, skip=skip, limit=limit
+        files = await async_file_service.get_rows_by_project(
+            db=db, project_id=project_id, columns=columns, skip=skip, limit=limit, cursor=cursor, **filters
         )
     else:
         # Recuperar todos os arquivos que o usuário tem acesso
         if current_user.role == UserRole.FREELANCER:
-            files = file_service.get_multi_by_owner_projects(
-                db=db, uploader_id=current_user.id, skip=skip, limit=limit
+            files = await async_file_service.get_rows_by_owner_projects(
+                db=db, owner_id=current_user.id, columns=columns, skip=skip, limit=limit, cursor=cursor, **filters
             )
         else:
             # Recuperar todos os arquivos do cliente
-            file = file_service.get_multi_by_owner_projects(
-                db=db, uploader_id=current_user.id, skip=skip, limit=limit
+            files = await async_file_service.get_rows_by_client_projects(
+                db=db, client_id=current_user.id, columns=columns, skip=skip, limit=limit, cursor=cursor, **filters
             )
-    
-    return files
+
+    etag = page_etag("files", files)
+    if etag_matches(request, etag):
+        not_modified_response = not_modified(etag)
+        set_next_cursor(not_modified_response, files, limit)
+        return not_modified_response
+
+    set_next_cursor(response, files, limit)
+    set_etag(response, etag)
+    return await response_cache.store(slot, file_list_serializer.dump_json(files), response)
+
+@router.get("/export")
+async def export_files(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    project_id: Optional[int] = None,
+    format: str = Query("ndjson", pattern=EXPORT_FORMAT_PATTERN),
+    filters: Dict[str, Any] = Depends(metadata_filters),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Exportação de todos os arquivos acessíveis em NDJSON (padrão) ou CSV.
+
+    Mesmos filtros e permissões da listagem, mas sem paginação: as linhas são
+    lidas com um cursor no servidor e enviadas em streaming, com memória
+    constante independente do total.
+    """
+    columns = file_list_serializer.columns
+    yield_per = settings.EXPORT_YIELD_PER
+    if project_id:
+        project = await async_project_service.get(db=db, id=project_id)
+        if not project:
+            raise HTTPException(status_code=404, detail="Projeto não encontrado")
+
+        # Checar se o usuário tem autorização para ver os arquivos deste projeto
+        if (current_user.role == UserRole.FREELANCER and project.owner_id != current_user.id) or \
+           (current_user.role == UserRole.CLIENT and project.client_id != current_user.id):
+            raise HTTPException(status_code=403, detail="Usuário não autorizado a ver os arquivos deste projeto")
+
+        stream = partial(
+            async_file_service.stream_rows_by_project,
+            project_id=project_id, columns=columns, yield_per=yield_per, **filters
+        )
+    elif current_user.role == UserRole.FREELANCER:
+        stream = partial(
+            async_file_service.stream_rows_by_owner_projects,
+            owner_id=current_user.id, columns=columns, yield_per=yield_per, **filters
+        )
+    else:
+        stream = partial(
+            async_file_service.stream_rows_by_client_projects,
+            client_id=current_user.id, columns=columns, yield_per=yield_per, **filters
+        )
+
+    return export_response(stream, file_list_serializer, export_format=format, filename="files")
+
+@router.get("/search", response_model=List[File])
+async def search_files(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    q: str = Query(..., min_length=1, max_length=200),
+    project_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Busca de arquivos por nome, do mais relevante ao menos.
+
+    Mesmos filtros e permissões da listagem; o cursor da próxima página vem
+    no header X-Next-Cursor.
+    """
+    columns = file_list_serializer.columns
+    if project_id:
+        project = await async_project_service.get(db=db, id=project_id)
+        if not project:
+            raise HTTPException(status_code=404, detail="Projeto não encontrado")
+
+        # Checar se o usuário tem autorização para ver os arquivos deste projeto
+        if (current_user.role == UserRole.FREELANCER and project.owner_id != current_user.id) or \
+           (current_user.role == UserRole.CLIENT and project.client_id != current_user.id):
+            raise HTTPException(status_code=403, detail="Usuário não autorizado a ver os arquivos deste projeto")
+
+        files = await async_file_service.search_rows_by_project(
+            db=db, project_id=project_id, text=q, columns=columns, limit=limit, cursor=cursor
+        )
+    elif current_user.role == UserRole.FREELANCER:
+        files = await async_file_service.search_rows_by_owner_projects(
+            db=db, owner_id=current_user.id, text=q, columns=columns, limit=limit, cursor=cursor
+        )
+    else:
+        files = await async_file_service.search_rows_by_client_projects(
+            db=db, client_id=current_user.id, text=q, columns=columns, limit=limit, cursor=cursor
+        )
+
+    response = Response(content=file_list_serializer.dump_json(files), media_type="application/json")
+    set_next_rank_cursor(response, files, limit)
+    return response
+
+@router.get("/jobs/{job_id}", response_model=UploadJob)
+async def read_upload_job(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    job_id: int,
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Andamento de um upload assíncrono
+
+    Disponível para quem enviou o arquivo e para administradores. Ao concluir,
+    `file_id` identifica o arquivo criado; em caso de falha, `error` traz o motivo.
+    """
+    job = await async_upload_job_service.get(db=db, id=job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job de upload não encontrado")
+
+    if current_user.role != UserRole.ADMIN and job.uploader_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Usuário não autorizado a ver este job de upload")
+
+    return job
 
 @router.get("/{file_id}", response_model=FileDetail)
-def read_file(
+async def read_file(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     file_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Recuperar um arquivo específico pelo ID.
- 
+    Responde 304 quando o If-None-Match corresponde ao ETag do arquivo.
     """
-    file = file_service.get(db=db, id=file_id)
-    if not file:
+    # Versão do arquivo e ids do projeto para a checagem de permissão, em uma consulta
+    version = await async_file_service.get_version(db=db, id=file_id)
+    if not version:
         raise HTTPException(status_code=404, detail="Arquivo não encontrado")
-    
-    # Pegar o projeto associado ao arquivo
-    project = project_service.get(db=db, id=file.project_id)
 
     # Checar se o usuário tem autorização para ver o arquivo
-    if (current_user.role == UserRole.FREELANCER and project.owner_id != current_user.id) or \
-       (current_user.role == UserRole.CLIENT and project.client_id != current_user.id):
+    if (current_user.role == UserRole.FREELANCER and version.owner_id != current_user.id) or \
+       (current_user.role == UserRole.CLIENT and version.client_id != current_user.id):
         raise HTTPException(status_code=403, detail="Usuário não autorizado a ver este arquivo")
-    
+
+    etag = compute_etag("file", version.id, version.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    file = await async_file_service.get(db=db, id=file_id)
+    if not file:
+        raise HTTPException(status_code=404, detail="Arquivo não encontrado")
+
+    set_etag(response, etag)
     return file
 
 @router.delete("/{file_id}", response_model=File)
@@ -164,12 +434,14 @@ def delete_file(
     *,
     db: Session = Depends(get_db),
     file_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    deletion_worker: FileDeletionWorker = Depends(get_file_deletion_worker),
 ) -> Any:
     """
     Deletar um arquivo
     
     Apenas o dono do projeto(Freelancer) ou quem está subindo o arquivo(Uploader) pode deletá-lo.
+    A remoção no processador de arquivos é feita em segundo plano, a partir do outbox.
     """
     file = file_service.get(db=db, id=file_id)
     if not file:
@@ -182,18 +454,8 @@ def delete_file(
     if not (project.owner_id == current_user.id or file.uploader_id == current_user.id):
         raise HTTPException(status_code=403, detail="Usuário não autorizado a deletar este arquivo")
     
-    # Deletar o arquivo no processador de arquivos
-    try:
-        httpx.delete(f"{settings.FILE_PROCESSOR_URL}/api/files/{file_id}")
-    except httpx.RequestError:
-        # Log do erro mas continue o processo de deleção
-        pass
-
-    # Deletar o arquivo do banco de dados
-    file_service.delete(db=db, id=file_id)
+    # Deletar o arquivo do banco de dados e registrar a remoção no processador
+    file_service.remove(db=db, id=file_id)
+    deletion_worker.notify()
     
     return file
-
-
-
-
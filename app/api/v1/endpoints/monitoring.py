@@ -0,0 +1,80 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dependencies import get_current_admin_user
+from app.core.hashing import bulk_password_hasher, password_hasher
+from app.core.response_cache import response_cache
+from app.core.security import UserPrincipal, user_principal_cache
+from app.db.database import async_engine, engine, get_async_db
+from app.db.pool import pool_stats
+from app.services.file_deletion_worker import FileDeletionWorker, get_file_deletion_worker
+from app.services.upload_job_runner import UploadJobRunner, get_upload_job_runner
+
+router = APIRouter()
+
+@router.get("/db-pool")
+def read_db_pool_stats(
+    current_user: UserPrincipal = Depends(get_current_admin_user),
+) -> Any:
+    """
+    Estatísticas em tempo real dos pools de conexão com o banco de dados.
+    Apenas administradores.
+    """
+    return {
+        "sync": pool_stats(engine.pool),
+        "async": pool_stats(async_engine.sync_engine.pool),
+    }
+
+@router.get("/caches")
+def read_cache_stats(
+    current_user: UserPrincipal = Depends(get_current_admin_user),
+) -> Any:
+    """
+    Contadores dos caches em memória deste processo.
+    Apenas administradores.
+    """
+    return {
+        "user_principals": user_principal_cache.stats(),
+        "responses": response_cache.stats(),
+    }
+
+@router.get("/password-hasher")
+def read_password_hasher_stats(
+    current_user: UserPrincipal = Depends(get_current_admin_user),
+) -> Any:
+    """
+    Uso dos executores dedicados de hash de senhas.
+    Apenas administradores.
+    """
+    return {
+        "default": password_hasher.stats(),
+        "bulk": bulk_password_hasher.stats(),
+    }
+
+@router.get("/file-deletions")
+async def read_file_deletion_stats(
+    db: AsyncSession = Depends(get_async_db),
+    deletion_worker: FileDeletionWorker = Depends(get_file_deletion_worker),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
+) -> Any:
+    """
+    Tamanho do outbox de remoções no processador de arquivos e contadores do
+    worker deste processo. Apenas administradores.
+    """
+    return {
+        "queue": await deletion_worker.refresh_queue_metrics(db),
+        "worker": deletion_worker.stats(),
+    }
+
+@router.get("/upload-jobs")
+def read_upload_job_stats(
+    upload_jobs: UploadJobRunner = Depends(get_upload_job_runner),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
+) -> Any:
+    """
+    Fila, staging e contadores dos uploads assíncronos deste processo.
+    Apenas administradores.
+    """
+    return upload_jobs.stats()
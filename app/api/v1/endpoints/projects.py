@@ -1,22 +1,34 @@
+from functools import partial
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query 
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.v1.schemas.project import Project, ProjectCreate, ProjectUpdate, ProjectDetail
-from app.core.security import get_current_active_user
-from app.db.database import get_db 
+from app.core.response_cache import response_cache, user_tag
+from app.core.security import UserPrincipal, get_current_active_user
+from app.db.database import get_async_db, get_db 
+from app.db.models.project import Project as ProjectModel
 from app.db.models.user import User, UserRole
-from app.services import project_service
+from app.db.pagination import set_next_cursor, set_next_rank_cursor
+from app.services import async_project_service, project_service
+from app.services.file_deletion_worker import FileDeletionWorker, get_file_deletion_worker
+from app.utils.etag import compute_etag, etag_matches, not_modified, page_etag, set_etag
+from app.utils.export import EXPORT_FORMAT_PATTERN, export_response
+from app.utils.serialization import RowListSerializer
+from app.config import settings
 
 router = APIRouter()
 
+project_list_serializer = RowListSerializer(Project, ProjectModel)
+
 @router.post("/", response_model=Project)
 def create_project(
     *,
     db: Session = Depends(get_db),
     project_in: ProjectCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any: 
     """
     Endpoint para criar um novo Projeto.
@@ -37,47 +49,134 @@ def create_project(
     return project
 
 @router.get("/", response_model=List[Project])
-def read_projects(
-    db: Session = Depends(get_db),
+async def read_projects(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """ 
     Endpoint para Recuperar projetos 
     Freelancers podem ver todos os seus próprios projetos.
     Clientes pode ver todos os projetos em que eles fazem parte.
+    Para paginação por cursor, envie o valor do header X-Next-Cursor em `cursor`.
+    Responde 304 quando o If-None-Match corresponde ao ETag da página.
     """
+    # Resposta em cache para este usuário e parâmetros, invalidada pelas escritas nos projetos
+    slot = await response_cache.lookup(request, user_id=current_user.id, tag=user_tag(current_user.id))
+    if slot.hit:
+        return response_cache.respond(request, slot)
+
+    # Apenas as colunas do schema (incluindo updated_at), em uma única consulta:
+    # o ETag sai das mesmas linhas serializadas no corpo
+    columns = project_list_serializer.columns
     if current_user.role == UserRole.FREELANCER:
-        projects = project_service.get_multi_by_owner(
-            db=db, owner_id=current_user.id, skip=skip, limit=limit
+        projects = await async_project_service.get_rows_by_owner(
+            db=db, owner_id=current_user.id, columns=columns, skip=skip, limit=limit, cursor=cursor
         )
     else:
-        projects = project_service.get_multi_by_client(
-            db=db, client_id=current_user, skip=skip, limit=limit
+        projects = await async_project_service.get_rows_by_client(
+            db=db, client_id=current_user.id, columns=columns, skip=skip, limit=limit, cursor=cursor
         )
-    
-    return projects
+
+    etag = page_etag("projects", projects)
+    if etag_matches(request, etag):
+        not_modified_response = not_modified(etag)
+        set_next_cursor(not_modified_response, projects, limit)
+        return not_modified_response
+
+    set_next_cursor(response, projects, limit)
+    set_etag(response, etag)
+    return await response_cache.store(slot, project_list_serializer.dump_json(projects), response)
+
+@router.get("/export")
+async def export_projects(
+    *,
+    format: str = Query("ndjson", pattern=EXPORT_FORMAT_PATTERN),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Endpoint para Exportar todos os projetos do usuário em NDJSON (padrão) ou CSV.
+    Mesmas regras da listagem, lidos com cursor no servidor e enviados em streaming.
+    """
+    columns = project_list_serializer.columns
+    if current_user.role == UserRole.FREELANCER:
+        stream = partial(
+            async_project_service.stream_rows_by_owner,
+            owner_id=current_user.id, columns=columns, yield_per=settings.EXPORT_YIELD_PER
+        )
+    else:
+        stream = partial(
+            async_project_service.stream_rows_by_client,
+            client_id=current_user.id, columns=columns, yield_per=settings.EXPORT_YIELD_PER
+        )
+
+    return export_response(stream, project_list_serializer, export_format=format, filename="projects")
+
+@router.get("/search", response_model=List[Project])
+async def search_projects(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Endpoint para Buscar projetos por nome e descrição, do mais relevante ao menos.
+    Mesmas regras da listagem; o cursor da próxima página vem no header X-Next-Cursor.
+    """
+    columns = project_list_serializer.columns
+    if current_user.role == UserRole.FREELANCER:
+        projects = await async_project_service.search_rows_by_owner(
+            db=db, owner_id=current_user.id, text=q, columns=columns, limit=limit, cursor=cursor
+        )
+    else:
+        projects = await async_project_service.search_rows_by_client(
+            db=db, client_id=current_user.id, text=q, columns=columns, limit=limit, cursor=cursor
+        )
+
+    response = Response(content=project_list_serializer.dump_json(projects), media_type="application/json")
+    set_next_rank_cursor(response, projects, limit)
+    return response
+
 @router.get("/{project_id}", response_model=ProjectDetail)
-def read_project(
+async def read_project(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     project_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Endpoint para Recuperar um projeto específico pelo ID.
     Freelancers podem ver todos os seus próprios projetos.
+    Responde 304 quando o If-None-Match corresponde ao ETag do projeto.
     """
-    project = project_service.get(db=db, id=project_id)
-    if not project:
+    # Apenas as colunas de versão e permissão; o detalhe só é montado se mudou
+    version = await async_project_service.get_version(db=db, id=project_id)
+    if not version:
         raise HTTPException(status_code=404, detail="Projeto não encontrado")
     
     # Check if user has permission to view the project
-    if (current_user.role == UserRole.FREELANCER and project.owner_id != current_user.id) or \
-       (current_user.role == UserRole.CLIENT and project.client_id != current_user.id):
+    if (current_user.role == UserRole.FREELANCER and version.owner_id != current_user.id) or \
+       (current_user.role == UserRole.CLIENT and version.client_id != current_user.id):
         raise HTTPException(status_code=403, detail="Você não tem permissão para visualizar este projeto")
-    
+
+    etag = compute_etag("project", tuple(version))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    # owner e client em uma única consulta; file_count/total_file_size são colunas do projeto
+    project = await async_project_service.get_detail(db=db, id=project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Projeto não encontrado")
+
+    set_etag(response, etag)
     return project
 
 @router.put("/{project_id}", response_model=Project)
@@ -86,7 +185,7 @@ def update_project(
     db: Session = Depends(get_db),
     project_id: int,
     project_in: ProjectUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """ 
     Endpoint para Atualizar Projeto.
@@ -109,20 +208,24 @@ def delete_project (
     *,
     db: Session = Depends(get_db),
     project_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    deletion_worker: FileDeletionWorker = Depends(get_file_deletion_worker),
 ) -> Any:
     """ 
     Endpoint para Deletar um projeto 
-    Apenas o proprietário do projeto (Freelancer) pode deletar um projeto
+    Apenas o proprietário do projeto (Freelancer) pode deletar um projeto.
+    Os arquivos do projeto são removidos junto; a remoção no processador é
+    feita em segundo plano, a partir do outbox.
     """
     project = project_service.get(db=db, id=project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Projeto não encontrado")
     
     # Checando se o usuário tem permissão para deletar o projeto
-    if project_id != current_user.id:
+    if project.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Você não tem permissão para deletar este projeto")
     
     project = project_service.remove(db=db, id=project_id)
+    deletion_worker.notify()
 
     return project
@@ -1,64 +1,89 @@
-from typing import Any, List
+import csv
+import io
+import json
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Request, Response, UploadFile, status
 from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.v1.schemas.user import User, UserCreate, UserUpdate
-from app.core.security import get_current_active_user, get_password_hash
-from app.db.database import get_db
+from app.api.v1.schemas.user import User, UserCreate, UserImportItem, UserImportResult, UserUpdate
+from app.config import settings
+from app.core.dependencies import get_current_admin_user
+from app.core.response_cache import CLIENTS_TAG, response_cache
+from app.core.security import UserPrincipal, get_current_active_user
+from app.db.database import get_async_db, get_db
 from app.db.models.user import User as UserModel, UserRole
-from app.services import user_service
+from app.db.pagination import set_next_cursor
+from app.utils.serialization import RowListSerializer
+from app.services import async_user_service, user_service
 
 router = APIRouter()
 
+user_list_serializer = RowListSerializer(User, UserModel)
+
 @router.get("/", response_model=List[User])
 def read_users(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: UserModel = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """ 
     Recuperar usuário
     """
     # Se o usuário não for admin, ele só pode ver seu próprio usuário
     if current_user.role != UserRole.ADMIN:
-        users =  [current_user]
+        users =  [user_service.get(db, id=current_user.id)]
     else:
-        users = user_service.get_multi(db=db, skip=skip, limit=limit)
+        users = user_service.get_multi(db=db, skip=skip, limit=limit, cursor=cursor)
+        set_next_cursor(response, users, limit)
     
     return users
 
 @router.get("/clients", response_model=List[User])
-def read_clients(
-    db: Session = Depends(get_db),
+async def read_clients(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: UserModel = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """ 
     Recuperar clientes. Apenas para Freelancers e administradores.
     """
     if current_user.role not in [UserRole.FREELANCER, UserRole.ADMIN]:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBBIDDEN,
+            status_code=status.HTTP_403_FORBIDDEN,
             detail="Permissão negada. Apenas Freelancers e administradores podem ver clientes."
         )
     
+    # Resposta em cache, invalidada por qualquer escrita de usuário
+    slot = await response_cache.lookup(request, user_id=current_user.id, tag=CLIENTS_TAG)
+    if slot.hit:
+        return response_cache.respond(request, slot)
+
     # Obter todos os usuários com o papel de cliente
-    clients = user_service.get_multi_by_role(
-        db=db, role=UserRole.CLIENT, skip=skip, limit=limit
+    clients = await async_user_service.get_rows_by_role(
+        db=db, role=UserRole.CLIENT, columns=user_list_serializer.columns,
+        skip=skip, limit=limit, cursor=cursor,
     )
 
-    return clients
+    set_next_cursor(response, clients, limit)
+    return await response_cache.store(slot, user_list_serializer.dump_json(clients), response)
 
 @router.post("/", response_model=User)
 def create_user(
     *,
     db: Session = Depends(get_db),
     user_in: UserCreate,
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Cria um novo usuário. Apenas admins podem criar outros usuarios com papel de admin.
@@ -82,14 +107,114 @@ def create_user(
     user = user_service.create(db, obj_in=user_in)
     return user
 
+def _parse_import_rows(content: bytes, *, filename: Optional[str], content_type: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Linhas de uma importação: CSV com cabeçalho (email,password,full_name,role,is_active)
+    ou uma lista JSON de objetos. Células vazias do CSV usam o valor padrão.
+    """
+    name = (filename or "").lower()
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="O arquivo de importação deve estar em UTF-8")
+
+    if name.endswith(".csv") or content_type == "text/csv":
+        return [
+            {key: value for key, value in row.items() if key and value not in (None, "")}
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+    if name.endswith(".json") or content_type == "application/json":
+        try:
+            rows = json.loads(text)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="JSON inválido no arquivo de importação")
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail="O JSON de importação deve ser uma lista de usuários")
+        return rows
+    raise HTTPException(status_code=400, detail="Formato de importação não suportado (use CSV ou JSON)")
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    )
+
+@router.post("/import", response_model=UserImportResult)
+async def import_users(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    file: UploadFile = File(...),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
+) -> Any:
+    """
+    Importação em massa de usuários (CSV ou JSON). Apenas administradores.
+
+    Os emails já cadastrados são verificados em uma única consulta, as senhas
+    são processadas em paralelo no pool de processos e os novos usuários são
+    gravados com um único INSERT. Cada linha recebe o seu resultado.
+    """
+    rows = _parse_import_rows(await file.read(), filename=file.filename, content_type=file.content_type)
+    if len(rows) > settings.MAX_USER_IMPORT_ROWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Máximo de {settings.MAX_USER_IMPORT_ROWS} usuários por importação",
+        )
+
+    results: List[UserImportItem] = []
+    pending: Dict[str, UserImportItem] = {}
+    users_in: List[UserCreate] = []
+    for index, row in enumerate(rows, start=1):
+        email = row.get("email") if isinstance(row, dict) else None
+        try:
+            user_in = UserCreate.model_validate(row)
+        except ValidationError as exc:
+            results.append(UserImportItem(row=index, email=email, status="invalid", error=_validation_message(exc)))
+            continue
+
+        item = UserImportItem(row=index, email=user_in.email, status="created")
+        if user_in.email in pending:
+            item.status = "duplicate"
+            item.error = f"Email repetido na linha {pending[user_in.email].row}"
+        else:
+            pending[user_in.email] = item
+            users_in.append(user_in)
+        results.append(item)
+
+    # Emails já cadastrados não chegam a ter a senha processada
+    existing = await async_user_service.get_existing_emails(db, emails=list(pending))
+    for email in existing:
+        pending[email].status = "exists"
+        pending[email].error = "Um usuário com esse email já existe no sistema."
+
+    created = await async_user_service.create_multi(
+        db, objs_in=[user_in for user_in in users_in if user_in.email not in existing]
+    )
+    for email, item in pending.items():
+        if item.status != "created":
+            continue
+        if email in created:
+            item.id = created[email]
+        else:
+            # Cadastrado por outra requisição entre a verificação e o INSERT
+            item.status = "exists"
+            item.error = "Um usuário com esse email já existe no sistema."
+
+    return UserImportResult(
+        created=len(created),
+        skipped=sum(item.status in ("exists", "duplicate") for item in results),
+        failed=sum(item.status == "invalid" for item in results),
+        results=results,
+    )
+
 @router.get("/me", response_model=User)
 def read_user_me(
-    current_user: UserModel = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """ 
     Recuperar usuário atual.
     """
-    return current_user
+    return user_service.get(db, id=current_user.id)
 
 @router.put("/me", response_model=User)
 def update_user_me(
@@ -97,12 +222,13 @@ def update_user_me(
     db: Session = Depends(get_db),
     full_name: str = Body(None),
     password: str = Body(None),
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """ 
     Atualizar usuário atual.
     """
-    current_user_data = jsonable_encoder(current_user)
+    user = user_service.get(db, id=current_user.id)
+    current_user_data = jsonable_encoder(user)
     user_in = UserUpdate(**current_user_data)
 
     if full_name is not None:
@@ -110,20 +236,20 @@ def update_user_me(
     if password is not None:
         user_in.password = password
 
-    user = user_service.update(db, db_obj=current_user, obj_in=user_in)
+    user = user_service.update(db, db_obj=user, obj_in=user_in)
     return user
 
 @router.get("/{user_id}", response_model=User)
 def read_user_by_id(
     user_id: int,
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ) -> Any:
     """
     Obtem um usuario específico pelo ID
     """
     user = user_service.get(db, id=user_id)
-    if user == current_user:
+    if user is not None and user.id == current_user.id:
         return user
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
@@ -138,7 +264,7 @@ def update_user(
     db: Session = Depends(get_db),
     user_id: int,
     user_in: UserUpdate,
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Atualiza o usuário. Apenas administradores podem atualizar outros usuários.
@@ -176,7 +302,7 @@ def delete_user(
     *,
     db: Session = Depends(get_db),
     user_id: int,
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Deleta um usuário. Apenas administradores podem deletar outros usuários.
@@ -1,10 +1,11 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, users, projects, files
+from app.api.v1.endpoints import auth, users, projects, files, monitoring
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
-api_router.include_router(files.router, prefix="/files", tags=["files"])
\ No newline at end of file
+api_router.include_router(files.router, prefix="/files", tags=["files"])
+api_router.include_router(monitoring.router, prefix="/monitoring", tags=["monitoring"])
\ No newline at end of file
@@ -1,7 +1,9 @@
-from typing import Optional, Dict, Any
-from pydantic import BaseModel
+from typing import Optional, Dict, Any, List, Union
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, Json
 from datetime import datetime
 
+from app.db.models.upload_job import UploadJobStatus
+
 # Shared Properties
 class FileBase(BaseModel):
     filename: str
@@ -18,9 +20,51 @@ class FileUpdate(BaseModel):
 
 # Properties to return via API
 class File(FileBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     original_filename: str
     file_type: str
     file_size: int
     content_type: str
-    metadata: Optional[Dict[str, Any]] 
\ No newline at end of file
+    # Dict vindo do ORM (atributo metadata_) ou o texto do JSONB (listagens),
+    # decodificado no pydantic-core
+    metadata: Optional[Union[Json[Dict[str, Any]], Dict[str, Any]]] = Field(
+        default=None, validation_alias=AliasChoices("metadata_", "metadata")
+    )
+
+# Properties to return via API with upload details
+class FileDetail(File):
+    uploader_id: int
+    created_at: datetime
+    updated_at: datetime
+
+# Result of a single part in a batch upload
+class BatchUploadItem(BaseModel):
+    filename: Optional[str] = None
+    status: str  # "created" ou "failed"
+    file: Optional[File] = None
+    error: Optional[str] = None
+
+# Properties to return via API for a batch upload
+class BatchUploadResult(BaseModel):
+    project_id: int
+    created: int
+    failed: int
+    results: List[BatchUploadItem]
+
+
+# Properties to return via API for an asynchronous upload job
+class UploadJob(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    status: UploadJobStatus
+    project_id: int
+    original_filename: str
+    content_type: Optional[str] = None
+    file_size: int
+    file_id: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
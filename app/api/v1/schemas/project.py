@@ -1,8 +1,8 @@
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 
-from app.db.models.user import User
+from app.api.v1.schemas.user import User
 
 # Shared properties
 class ProjectBase(BaseModel):
@@ -19,20 +19,17 @@ class ProjectUpdate(ProjectBase):
 
 # Properties to return via API
 class Project(ProjectBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     owner_id: int
     client_id: int
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
-
 # Properties to return via API with owner and client details
 class ProjectDetail(Project):
-    owner: "User"
-    client: "User"
+    owner: User
+    client: User
     file_count: int
-
-    class Config:
-        orm_mode = True
+    total_file_size: int
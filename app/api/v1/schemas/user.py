@@ -1,5 +1,5 @@
-from typing import Optional
-from pydantic.v1 import BaseModel, EmailStr, field_validator
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
 from datetime import datetime
 
 from app.db.models.user import UserRole
@@ -28,9 +28,23 @@ class UserUpdate(UserBase):
 
 # Properties to return via API
 class User(UserBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
\ No newline at end of file
+# Resultado de cada linha de uma importação em massa
+class UserImportItem(BaseModel):
+    row: int
+    email: Optional[str] = None
+    status: str  # "created", "exists", "duplicate" ou "invalid"
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+# Properties to return via API for a bulk import
+class UserImportResult(BaseModel):
+    created: int
+    skipped: int
+    failed: int
+    results: List[UserImportItem]
@@ -1,16 +1,31 @@
 import secrets
 from typing import Any, Dict, List, Optional, Union
 
-from pydantic.v1 import AnyHttpUrl, BaseSettings, PostgresDsn, validator
-from pydantic_settings import BaseSettings  # Alterado aqui
+from pydantic import AnyHttpUrl, Field, PostgresDsn, ValidationInfo, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(case_sensitive=True, env_file=".env")
+
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = secrets.token_urlsafe(32)
     
     # Token settings
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+
+    # Cache of authenticated user principals (0 disables)
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 10000
+
+    # Password hashing executor (bcrypt)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PASSWORD_HASH_USE_PROCESSES: bool = False
+    # Pool de processos usado pela importação em massa de usuários
+    BULK_PASSWORD_HASH_WORKERS: int = 4
+    BULK_PASSWORD_HASH_MAX_PENDING: int = 8
+    MAX_USER_IMPORT_ROWS: int = 1000
     
     # CORS settings
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
@@ -23,30 +38,82 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = "postgres"
     POSTGRES_DB: str = "freela_facility"
 
-    SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn] = None
+    # Montada a partir de POSTGRES_* quando não informada
+    SQLALCHEMY_DATABASE_URI: Optional[str] = Field(default=None, validate_default=True)
+
+    # Database connection pool settings
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # segundos aguardando uma conexão livre
+    DB_POOL_RECYCLE: int = 1800  # segundos; -1 desativa
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # 0 desativa
+
+    # Cache de respostas das listagens (por usuário e parâmetros)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_BACKEND: str = "memory"  # "memory" (LRU por processo) ou "redis"
+    RESPONSE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_MAX_SIZE: int = 10000
 
     # External service URLs
     FILE_PROCESSOR_URL: str = "http://localhost:5000"
+    FILE_PROCESSOR_MAX_CONNECTIONS: int = 100
+    FILE_PROCESSOR_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    FILE_PROCESSOR_KEEPALIVE_EXPIRY: float = 30.0  # segundos
+    FILE_PROCESSOR_CONNECT_TIMEOUT: float = 5.0
+    FILE_PROCESSOR_READ_TIMEOUT: float = 60.0
+    FILE_PROCESSOR_WRITE_TIMEOUT: float = 60.0
+    FILE_PROCESSOR_POOL_TIMEOUT: float = 10.0
 
-    @validator("SQLALCHEMY_DATABASE_URI", pre=True)
-    def assemble_db_connection(cls, v: Optional[str], info):  # Mudança na assinatura
+    @field_validator("SQLALCHEMY_DATABASE_URI", mode="before")
+    @classmethod
+    def assemble_db_connection(cls, v: Optional[str], info: ValidationInfo) -> str:
         if isinstance(v, str):
             return v 
-        values = info.data  # Obter os valores de info.data
-        return PostgresDsn.build(
+        values = info.data
+        return str(PostgresDsn.build(
             scheme="postgresql",
-            user=values.get("POSTGRES_USER"),
+            username=values.get("POSTGRES_USER"),
             password=values.get("POSTGRES_PASSWORD"),
             host=values.get("POSTGRES_SERVER"),
-            path=f"/{values.get('POSTGRES_DB') or ''}",
-        )
+            path=values.get("POSTGRES_DB") or "",
+        ))
 
     # File upload settings
     MAX_UPLOAD_SIZE: int = 100 * 1024 * 1024  # 100 MB
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # 1 MB por leitura do arquivo enviado
+    MAX_BATCH_UPLOAD_FILES: int = 100
+    BATCH_UPLOAD_CONCURRENCY: int = 4  # envios simultâneos ao processador por lote
+
+    # Fila (outbox) de remoções no processador de arquivos, consumida em segundo plano
+    FILE_DELETION_WORKER_ENABLED: bool = True
+    FILE_DELETION_BATCH_SIZE: int = 50  # remoções reservadas por ciclo
+    FILE_DELETION_CONCURRENCY: int = 8  # chamadas simultâneas ao processador por lote
+    FILE_DELETION_POLL_INTERVAL: float = 5.0  # segundos entre consultas com a fila vazia
+    FILE_DELETION_LEASE_SECONDS: float = 300.0  # reserva de um lote antes de voltar à fila
+    FILE_DELETION_RETRY_BASE_SECONDS: float = 2.0  # backoff exponencial: base * 2^(tentativas - 1)
+    FILE_DELETION_RETRY_MAX_SECONDS: float = 600.0
+    FILE_DELETION_MAX_ATTEMPTS: int = 10
+
+    # Uploads assíncronos (?mode=async): arquivo gravado em staging e enviado por workers
+    UPLOAD_JOB_WORKERS: int = 4  # envios simultâneos ao processador
+    UPLOAD_STAGING_DIR: str = "/tmp/freela-facility-uploads"
+    UPLOAD_STAGING_MAX_BYTES: int = 2 * 1024 * 1024 * 1024  # 2 GB em staging neste processo
+    UPLOAD_JOB_MAX_PENDING: int = 100  # jobs aguardando ou em andamento neste processo
+
+    # Exportação (NDJSON/CSV): linhas buscadas por vez no cursor do servidor
+    EXPORT_YIELD_PER: int = 1000
+
+    # Métricas no formato do Prometheus em /metrics
+    METRICS_ENABLED: bool = True
 
-    class Config:
-        case_sensitive = True
-        env_file = ".env"
+    # Profiling de SQL por requisição: header Server-Timing e aviso de consultas
+    # idênticas repetidas (provável N+1) a partir do limite abaixo
+    SQL_PROFILING_ENABLED: bool = True
+    SQL_N_PLUS_ONE_THRESHOLD: int = 2
+    # Consultas acima deste tempo são registradas no log (0 desativa)
+    SLOW_QUERY_THRESHOLD_MS: int = 200
 
 
 settings = Settings()
\ No newline at end of file
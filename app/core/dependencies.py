@@ -5,11 +5,11 @@ from sqlalchemy.orm import Session
 
 from app.db.database import get_db
 from app.db.models.user import User, UserRole
-from app.core.security import get_current_active_user
+from app.core.security import UserPrincipal, get_current_active_user
 
 def get_current_admin_user(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> UserPrincipal:
     """
     Valida que o usuário atual é um administrador.
     Se não for, levanta uma exceção HTTP 403 (Forbidden).
@@ -22,8 +22,8 @@ def get_current_admin_user(
     return current_user
 
 def get_current_freelancer_user(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> UserPrincipal:
     """
     Valida que o usuário atual é um freelancer.
     Se não for, levanta uma exceção HTTP 403 (Forbidden).
@@ -36,8 +36,8 @@ def get_current_freelancer_user(
     return current_user
 
 def get_current_client_user(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> UserPrincipal:
     """
     Valida que o usuário atual é um cliente.
     Se não for, levanta uma exceção HTTP 403 (Forbidden).
@@ -50,8 +50,8 @@ def get_current_client_user(
     return current_user
 
 def get_current_admin_or_freelancer_user(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> UserPrincipal:
     """
     Valida que o usuário atual é um administrador ou freelancer.
     Se não for, levanta uma exceção HTTP 403 (Forbidden).
@@ -19,7 +19,7 @@ class ApplicationError(Exception):
     ) -> None:
         self.detail = detail or self.detail
         self.status_code = status_code or self.status_code
-        self.headers = headers
+        self.headers = headers or self.headers
         super().__init__(self.detail)
 
     def to_http_exception(self) -> HTTPException:
@@ -79,4 +79,21 @@ class ExternalServiceError(ApplicationError):
     External service error (e.g. API call to file processor).
     """
     status_code = status.HTTP_503_SERVICE_UNAVAILABLE
-    detail = "Error in external service"
\ No newline at end of file
+    detail = "Error in external service"
+
+
+class PayloadTooLargeError(ApplicationError):
+    """
+    Request payload exceeds the configured size limit.
+    """
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    detail = "Payload too large"
+
+
+class ServiceOverloadedError(ApplicationError):
+    """
+    Server is temporarily over capacity for this operation.
+    """
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    detail = "Service temporarily overloaded"
+    headers = {"Retry-After": "1"}
\ No newline at end of file
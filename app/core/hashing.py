@@ -0,0 +1,182 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Sequence
+
+from passlib.context import CryptContext
+
+from app.config import settings
+from app.core.exceptions import ServiceOverloadedError
+
+# Password hashing
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _hash_passwords(passwords: List[str]) -> List[str]:
+    return [pwd_context.hash(password) for password in passwords]
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Executa hash/verificação bcrypt em um executor dedicado e limitado.
+
+    O bcrypt é CPU-bound e, rodando no threadpool do Starlette, ocupa as
+    mesmas threads usadas pelos endpoints síncronos. Aqui o trabalho vai para
+    `max_workers` threads (ou processos) próprios, com no máximo `max_pending`
+    tarefas aguardando na fila; acima disso a chamada é rejeitada com
+    ServiceOverloadedError em vez de acumular latência.
+    """
+
+    def __init__(self, *, max_workers: int, max_pending: int, use_processes: bool = False) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.use_processes = use_processes
+        self._executor: Executor = self._create_executor()
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._failed = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+
+    def _create_executor(self) -> Executor:
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hasher")
+
+    def _reserve(self, count: int) -> None:
+        """
+        Reserva `count` vagas de uma vez, ou nenhuma
+        """
+        acquired = 0
+        while acquired < count and self._slots.acquire(blocking=False):
+            acquired += 1
+        if acquired < count:
+            for _ in range(acquired):
+                self._slots.release()
+            with self._lock:
+                self._rejected += 1
+            raise ServiceOverloadedError(detail="Muitas operações de senha em andamento, tente novamente")
+
+    def _submit(self, fn: Callable[..., Any], *args: Any, reserved: bool = False) -> Future:
+        if not reserved:
+            self._reserve(1)
+
+        start = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+
+        def _done(future: Future) -> None:
+            elapsed = time.perf_counter() - start
+            self._slots.release()
+            with self._lock:
+                self._in_flight -= 1
+                # Tarefas ainda na fila são canceladas no shutdown
+                if future.cancelled() or future.exception() is not None:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+                    self._total_seconds += elapsed
+                    self._max_seconds = max(self._max_seconds, elapsed)
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        future.add_done_callback(_done)
+        return future
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(_hash_password, password))
+
+    async def hash_many(self, passwords: Sequence[str]) -> List[str]:
+        """
+        Gera os hashes de um lote, dividido em um bloco por worker; em um pool
+        de processos cada bloco é uma única ida e volta entre processos. O lote
+        inteiro é aceito ou rejeitado de uma vez.
+        """
+        if not passwords:
+            return []
+        size = -(-len(passwords) // self.max_workers)
+        batches = [list(passwords[start:start + size]) for start in range(0, len(passwords), size)]
+        # Todas as vagas antes de enviar o primeiro bloco: um lote rejeitado no
+        # meio deixaria blocos já enviados ocupando vagas de uma requisição que falhou
+        self._reserve(len(batches))
+        futures: List[Future] = []
+        try:
+            for batch in batches:
+                futures.append(self._submit(_hash_passwords, batch, reserved=True))
+        except BaseException:
+            # _submit já devolveu a vaga do bloco que falhou
+            for _ in range(len(batches) - len(futures) - 1):
+                self._slots.release()
+            for future in futures:
+                future.cancel()
+            raise
+        chunks = await asyncio.gather(*(asyncio.wrap_future(future) for future in futures))
+        return [hashed for chunk in chunks for hashed in chunk]
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(
+            self._submit(_verify_password, plain_password, hashed_password)
+        )
+
+    def hash_blocking(self, password: str) -> str:
+        """
+        Versão para código síncrono; bloqueia a thread chamadora, mas o
+        trabalho de CPU continua limitado pelo executor dedicado.
+        """
+        return self._submit(_hash_password, password).result()
+
+    def verify_blocking(self, plain_password: str, hashed_password: str) -> bool:
+        return self._submit(_verify_password, plain_password, hashed_password).result()
+
+    def needs_update(self, hashed_password: str) -> bool:
+        return pwd_context.needs_update(hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._completed
+            return {
+                "executor": "process" if self.use_processes else "thread",
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                "completed": completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_seconds": self._total_seconds / completed if completed else 0.0,
+                "max_seconds": self._max_seconds,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    use_processes=settings.PASSWORD_HASH_USE_PROCESSES,
+)
+
+# Importação em massa: processos próprios, para não disputar o GIL nem os
+# workers usados pelo login e cadastro individuais
+bulk_password_hasher = PasswordHasher(
+    max_workers=settings.BULK_PASSWORD_HASH_WORKERS,
+    max_pending=settings.BULK_PASSWORD_HASH_MAX_PENDING,
+    use_processes=True,
+)
@@ -0,0 +1,378 @@
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from app.core.profiling import end_profile, start_profile
+
+# Limites (em segundos) dos buckets dos histogramas de latência
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS")
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+
+# Rota usada quando a requisição não corresponde a nenhuma rota registrada
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Counter:
+    """
+    Valor monotônico de um conjunto de labels
+    """
+
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def samples(self, name: str, labels: str) -> Iterable[str]:
+        yield f"{name}{labels} {_format(self._value)}"
+
+
+class Gauge(Counter):
+    """
+    Valor que sobe e desce (ex.: requisições em andamento)
+    """
+
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+
+class Histogram:
+    """
+    Histograma com buckets fixos de um conjunto de labels
+    """
+
+    __slots__ = ("buckets", "_counts", "_sum", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self._counts: List[int] = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def samples(self, name: str, labels: str) -> Iterable[str]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        bounds = [_format(bound) for bound in self.buckets] + ["+Inf"]
+        return histogram_samples(name, labels, zip(bounds, _accumulate(counts)), total)
+
+
+class MetricFamily:
+    """
+    Métrica com nome, tipo e nomes de labels; cada combinação de valores tem
+    o seu filho (Counter, Gauge ou Histogram).
+
+    Os filhos devem ser criados com `labels()` na inicialização e guardados
+    por quem os usa: o caminho da requisição só incrementa objetos existentes.
+    """
+
+    def __init__(
+        self, name: str, documentation: str, kind: str, factory: Callable[[], Any],
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Any:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} espera os labels {self.labelnames}")
+        with self._lock:
+            child = self._children.get(values)
+            if child is None:
+                child = self._children[values] = self._factory()
+            return child
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        with self._lock:
+            children = list(self._children.items())
+        for values, child in children:
+            yield from child.samples(self.name, format_labels(zip(self.labelnames, values)))
+
+
+class MetricsRegistry:
+    """
+    Conjunto de métricas expostas em /metrics, no formato texto do Prometheus.
+
+    `collectors` geram linhas adicionais no momento da coleta, para valores
+    lidos sob demanda (ex.: estado dos pools de conexão).
+    """
+
+    def __init__(self) -> None:
+        self._families: List[MetricFamily] = []
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    def _register(self, family: MetricFamily) -> MetricFamily:
+        self._families.append(family)
+        return family
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register(MetricFamily(name, documentation, "counter", Counter, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register(MetricFamily(name, documentation, "gauge", Gauge, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> MetricFamily:
+        return self._register(
+            MetricFamily(name, documentation, "histogram", lambda: Histogram(buckets), labelnames)
+        )
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for family in self._families:
+            lines.extend(family.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _accumulate(counts: Sequence[int]) -> Iterable[int]:
+    total = 0
+    for count in counts:
+        total += count
+        yield total
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    rendered = ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs)
+    return f"{{{rendered}}}" if rendered else ""
+
+
+def histogram_samples(
+    name: str, labels: str, cumulative: Iterable[Tuple[str, int]], total: float
+) -> List[str]:
+    """
+    Linhas _bucket/_sum/_count de um histograma a partir das contagens
+    cumulativas por limite (o último deve ser "+Inf")
+    """
+    inner = labels[1:-1] + "," if labels else ""
+    lines = []
+    count = 0
+    for bound, count in cumulative:
+        lines.append(f'{name}_bucket{{{inner}le="{bound}"}} {count}')
+    lines.append(f"{name}_sum{labels} {_format(total)}")
+    lines.append(f"{name}_count{labels} {count}")
+    return lines
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "Requisições HTTP concluídas", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP", ("method", "route")
+)
+HTTP_REQUESTS_IN_PROGRESS = registry.gauge(
+    "http_requests_in_progress", "Requisições HTTP em andamento", ("method",)
+)
+DB_QUERIES = registry.counter(
+    "http_request_db_queries_total", "Consultas SQL executadas pelas requisições", ("method", "route")
+)
+DB_SECONDS = registry.counter(
+    "http_request_db_seconds_total", "Tempo gasto em consultas SQL pelas requisições", ("method", "route")
+)
+FILE_PROCESSOR_DURATION = registry.histogram(
+    "file_processor_request_duration_seconds", "Latência das chamadas ao processador de arquivos",
+    ("operation",),
+)
+FILE_PROCESSOR_ERRORS = registry.counter(
+    "file_processor_errors_total",
+    "Chamadas ao processador de arquivos com erro de rede ou status >= 400",
+    ("operation",),
+)
+FILE_DELETION_QUEUE = registry.gauge(
+    "file_deletion_queue", "Remoções no outbox do processador de arquivos", ("state",)
+)
+FILE_DELETIONS = registry.counter(
+    "file_deletions_total", "Tentativas de remoção no processador de arquivos", ("result",)
+)
+UPLOAD_JOB_QUEUE = registry.gauge(
+    "upload_job_queue", "Uploads assíncronos deste processo", ("state",)
+)
+UPLOAD_JOBS = registry.counter(
+    "upload_jobs_total", "Uploads assíncronos concluídos", ("result",)
+)
+UPLOAD_STAGING_BYTES = registry.gauge(
+    "upload_staging_bytes", "Bytes de uploads assíncronos no diretório de staging"
+).labels()
+UPLOAD_BYTES = registry.counter(
+    "upload_bytes_total", "Bytes de arquivos enviados ao processador"
+).labels()
+
+
+class RouteMetrics:
+    """
+    Filhos já criados das métricas HTTP de um (método, rota)
+    """
+
+    __slots__ = ("duration", "db_queries", "db_seconds", "statuses")
+
+    def __init__(self, method: str, route: str) -> None:
+        self.duration = HTTP_REQUEST_DURATION.labels(method, route)
+        self.db_queries = DB_QUERIES.labels(method, route)
+        self.db_seconds = DB_SECONDS.labels(method, route)
+        self.statuses = tuple(HTTP_REQUESTS.labels(method, route, status) for status in STATUS_CLASSES)
+
+
+class HTTPMetrics:
+    """
+    Métricas HTTP por (método, template da rota), criadas na inicialização.
+
+    Com routers incluídos, scope["route"] é a rota original com o caminho
+    relativo ao router; o template completo é resolvido na primeira
+    requisição de cada rota e guardado por rota (cada router é incluído com
+    um único prefixo).
+    """
+
+    def __init__(self) -> None:
+        self._routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self._by_route: Dict[Tuple[int, str], RouteMetrics] = {}
+        self._in_progress = {method: HTTP_REQUESTS_IN_PROGRESS.labels(method) for method in HTTP_METHODS}
+        self._unmatched = {method: RouteMetrics(method, UNMATCHED_ROUTE) for method in HTTP_METHODS}
+        self._other = RouteMetrics("OTHER", UNMATCHED_ROUTE)
+        self._other_in_progress = HTTP_REQUESTS_IN_PROGRESS.labels("OTHER")
+
+    def register(self, method: str, path: str) -> None:
+        if (method, path) not in self._routes:
+            self._routes[(method, path)] = RouteMetrics(method, path)
+
+    def register_app(self, app: Any) -> None:
+        """
+        Registra as rotas do schema OpenAPI e as rotas de nível superior
+        """
+        for path, operations in app.openapi().get("paths", {}).items():
+            for method in operations:
+                if method.upper() in HTTP_METHODS:
+                    self.register(method.upper(), path)
+        for route in app.routes:
+            path = getattr(route, "path", None)
+            for method in getattr(route, "methods", None) or ():
+                if path is not None:
+                    self.register(method, path)
+
+    def in_progress(self, method: str) -> Gauge:
+        return self._in_progress.get(method, self._other_in_progress)
+
+    def route(self, method: str, scope: Dict[str, Any]) -> RouteMetrics:
+        route = scope.get("route")
+        if route is None:
+            return self._unmatched.get(method, self._other)
+
+        key = (id(route), method)
+        metrics = self._by_route.get(key)
+        if metrics is None:
+            template = _route_template(route, scope["path"])
+            metrics = self._routes.get((method, template)) or self._unmatched.get(method, self._other)
+            self._by_route[key] = metrics
+        return metrics
+
+
+def _route_template(route: Any, path: str) -> str:
+    """
+    Prefixo do caminho da requisição + caminho da rota (ex.: /api/v1/files + /{file_id})
+    """
+    route_path = getattr(route, "path", "")
+    path_regex = getattr(route, "path_regex", None)
+    if path_regex is None:
+        return route_path
+    index = 0
+    while index != -1:
+        if path_regex.match(path[index:]):
+            return path[:index] + route_path
+        index = path.find("/", index + 1)
+    return route_path
+
+
+http_metrics = HTTPMetrics()
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede latência, status e consultas SQL por rota.
+
+    A rota (template, ex.: /api/v1/files/{file_id}) é lida de scope["route"]
+    depois do roteamento, e o tempo inclui o envio de respostas em streaming.
+    """
+
+    def __init__(self, app: Any, metrics: HTTPMetrics = http_metrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_progress = self.metrics.in_progress(method)
+        profile, token = start_profile()
+        status_code = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            end_profile(token)
+
+            route = self.metrics.route(method, scope)
+            route.duration.observe(elapsed)
+            route.statuses[min(max(status_code // 100, 1), 5) - 1].inc()
+            if profile.db_queries:
+                route.db_queries.inc(profile.db_queries)
+                route.db_seconds.inc(profile.db_seconds)
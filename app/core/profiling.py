@@ -0,0 +1,181 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Tamanho máximo do SQL incluído nos logs
+MAX_LOGGED_STATEMENT = 2000
+
+
+class RequestProfile:
+    """
+    Tempos e consultas da requisição atual.
+
+    Criado pelo middleware mais externo (métricas ou profiling) e preenchido
+    pelos hooks do SQLAlchemy, pelo cliente do processador de arquivos e
+    pelos serializadores. `statements` só é mantido com o profiling ativo.
+    """
+
+    __slots__ = (
+        "db_queries", "db_seconds", "file_processor_seconds", "serialization_seconds", "statements",
+    )
+
+    def __init__(self, *, track_statements: bool = False) -> None:
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.file_processor_seconds = 0.0
+        self.serialization_seconds = 0.0
+        self.statements: Optional[Dict[str, int]] = {} if track_statements else None
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Consultas idênticas executadas `threshold` vezes ou mais (provável N+1)
+        """
+        if not self.statements:
+            return []
+        return sorted(
+            ((statement, count) for statement, count in self.statements.items() if count >= threshold),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+
+_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _profile.get()
+
+
+def start_profile(*, track_statements: bool = False) -> Tuple[RequestProfile, Optional[Token]]:
+    """
+    Reaproveita o perfil já criado por um middleware externo ou cria um novo;
+    o token (quando não for None) deve ser passado a `end_profile`
+    """
+    profile = _profile.get()
+    if profile is not None:
+        if track_statements and profile.statements is None:
+            profile.statements = {}
+        return profile, None
+    profile = RequestProfile(track_statements=track_statements)
+    return profile, _profile.set(profile)
+
+
+def end_profile(token: Optional[Token]) -> None:
+    if token is not None:
+        _profile.reset(token)
+
+
+def add_file_processor_time(seconds: float) -> None:
+    profile = _profile.get()
+    if profile is not None:
+        profile.file_processor_seconds += seconds
+
+
+@contextmanager
+def serialization_timer() -> Iterator[None]:
+    """
+    Soma o tempo do bloco à serialização da requisição atual
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile = _profile.get()
+        if profile is not None:
+            profile.serialization_seconds += time.perf_counter() - start
+
+
+def server_timing(profile: RequestProfile, total_seconds: float) -> str:
+    """
+    Valor do header Server-Timing (durações em milissegundos)
+    """
+    return (
+        f'db;dur={profile.db_seconds * 1000:.1f};desc="{profile.db_queries} queries", '
+        f"file-processor;dur={profile.file_processor_seconds * 1000:.1f}, "
+        f"serialization;dur={profile.serialization_seconds * 1000:.1f}, "
+        f"total;dur={total_seconds * 1000:.1f}"
+    )
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI que publica o header Server-Timing (banco, processador de
+    arquivos, serialização) e registra consultas repetidas na mesma
+    requisição como provável N+1.
+
+    Em respostas em streaming o header reflete o que foi gasto até o início
+    do envio do corpo.
+    """
+
+    def __init__(self, app: Any, *, n_plus_one_threshold: int = settings.SQL_N_PLUS_ONE_THRESHOLD) -> None:
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile, token = start_profile(track_statements=True)
+        start = time.perf_counter()
+
+        async def send_with_timing(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                headers.append(
+                    (b"server-timing", server_timing(profile, time.perf_counter() - start).encode("latin-1"))
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_profile(token)
+            for statement, count in profile.repeated_statements(self.n_plus_one_threshold):
+                logger.warning(
+                    "Provável N+1 em %s %s: consulta executada %d vezes: %s",
+                    scope["method"], scope["path"], count, statement[:MAX_LOGGED_STATEMENT],
+                )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started_at = getattr(context, "_query_started_at", None)
+    if started_at is None:
+        return
+    elapsed = time.perf_counter() - started_at
+
+    profile = _profile.get()
+    if profile is not None:
+        profile.db_queries += 1
+        profile.db_seconds += elapsed
+        if profile.statements is not None:
+            profile.statements[statement] = profile.statements.get(statement, 0) + 1
+
+    threshold_ms = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold_ms and elapsed * 1000 >= threshold_ms:
+        logger.warning(
+            "Consulta lenta (%.1f ms): %s", elapsed * 1000, statement[:MAX_LOGGED_STATEMENT]
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Mede as consultas do engine (síncrono ou `async_engine.sync_engine`):
+    total e tempo por requisição, consultas repetidas e log de consultas lentas
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,296 @@
+import hashlib
+import itertools
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional, Protocol
+
+from anyio import to_thread
+from fastapi import Request, Response
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.utils.etag import etag_matches, not_modified
+
+# Headers das respostas de listagem guardados junto com o corpo
+CACHED_HEADERS = ("etag", "cache-control", "x-next-cursor")
+
+
+def user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def project_tag(project_id: int) -> str:
+    return f"project:{project_id}"
+
+
+# Listagem de clientes (/users/clients), invalidada por qualquer escrita de usuário
+CLIENTS_TAG = "clients"
+
+
+def project_tags(project_id: int, owner_id: int, client_id: int) -> Iterable[str]:
+    """
+    Tags afetadas por uma escrita no projeto ou em seus arquivos
+    """
+    return (project_tag(project_id), user_tag(owner_id), user_tag(client_id))
+
+
+class ResponseCacheBackend(Protocol):
+    """
+    Armazenamento das respostas e das gerações de cada tag.
+
+    As entradas são gravadas sob uma chave que inclui a geração atual da tag;
+    invalidar a tag apenas incrementa a geração, tornando as entradas antigas
+    inalcançáveis até expirarem.
+    """
+
+    name: str
+    # Indica se as operações fazem I/O bloqueante (devem sair do event loop)
+    blocking: bool
+
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    def set(self, key: str, value: bytes, ttl: int) -> None: ...
+
+    def get_generation(self, tag: str) -> int: ...
+
+    def bump_generation(self, tag: str) -> int: ...
+
+
+class MemoryResponseCacheBackend:
+    """
+    Backend LRU em memória (padrão). Cada processo tem a sua cópia, então
+    invalidações feitas em um worker só alcançam os demais pelo TTL.
+
+    As gerações ficam em um LRU com o mesmo tamanho e TTL das entradas e vêm
+    de um contador único, nunca reutilizado. Uma tag sem registro usa o piso
+    (`_floor`): quando uma geração expira pelo TTL, as entradas anteriores a
+    ela já expiraram; quando é descartada pelo tamanho, o piso avança e
+    invalida todas as tags sem registro.
+    """
+
+    name = "memory"
+    blocking = False
+
+    def __init__(self, *, maxsize: int, ttl: float) -> None:
+        self._entries: TTLCache[str, bytes] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: TTLCache[str, int] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._counter = itertools.count(1)
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._entries.set(key, value)
+
+    def get_generation(self, tag: str) -> int:
+        generation = self._generations.get(tag)
+        return self._floor if generation is None else generation
+
+    def bump_generation(self, tag: str) -> int:
+        with self._lock:
+            generation = next(self._counter)
+            evictions = self._generations.evictions
+            self._generations.set(tag, generation)
+            if self._generations.evictions != evictions:
+                self._floor = next(self._counter)
+            return generation
+
+
+class RedisResponseCacheBackend:
+    """
+    Backend sobre o protocolo Redis (GET/SET EX/INCR), compartilhado entre
+    workers. Recebe qualquer cliente síncrono compatível com redis-py, o que
+    permite usar um fake local no lugar do servidor.
+    """
+
+    name = "redis"
+    blocking = True
+
+    def __init__(self, client: Any, *, prefix: str = "response-cache") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisResponseCacheBackend":
+        try:
+            import redis
+        except ImportError as exc:  # pragma: no cover - dependência opcional
+            raise RuntimeError(
+                "RESPONSE_CACHE_BACKEND=redis requer o pacote 'redis' instalado"
+            ) from exc
+        return cls(redis.Redis.from_url(url, socket_timeout=0.5), **kwargs)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(f"{self.prefix}:{key}")
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.client.set(f"{self.prefix}:{key}", value, ex=ttl)
+
+    def get_generation(self, tag: str) -> int:
+        value = self.client.get(f"{self.prefix}:gen:{tag}")
+        return int(value) if value is not None else 0
+
+    def bump_generation(self, tag: str) -> int:
+        return int(self.client.incr(f"{self.prefix}:gen:{tag}"))
+
+
+@dataclass
+class CacheSlot:
+    """
+    Chave de uma resposta (já com a geração da tag) e o valor encontrado
+    """
+
+    key: str
+    body: Optional[bytes] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def hit(self) -> bool:
+        return self.body is not None
+
+
+class ResponseCache:
+    """
+    Cache de respostas de listagem por (rota, usuário, parâmetros da query).
+
+    Um hit devolve o corpo já serializado sem consultar o banco; o ETag
+    guardado permite responder 304 também a partir do cache. As escritas nos
+    serviços invalidam as tags afetadas depois do commit.
+    """
+
+    def __init__(self, backend: ResponseCacheBackend, *, ttl: int, enabled: bool = True) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled and ttl > 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @classmethod
+    def from_settings(cls, config=settings) -> "ResponseCache":
+        if config.RESPONSE_CACHE_BACKEND == "redis":
+            backend: ResponseCacheBackend = RedisResponseCacheBackend.from_url(
+                config.RESPONSE_CACHE_REDIS_URL
+            )
+        else:
+            backend = MemoryResponseCacheBackend(
+                maxsize=config.RESPONSE_CACHE_MAX_SIZE, ttl=config.RESPONSE_CACHE_TTL_SECONDS
+            )
+        return cls(
+            backend,
+            ttl=config.RESPONSE_CACHE_TTL_SECONDS,
+            enabled=config.RESPONSE_CACHE_ENABLED,
+        )
+
+    async def _run(self, fn, *args):
+        if self.backend.blocking:
+            return await to_thread.run_sync(fn, *args)
+        return fn(*args)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @staticmethod
+    def _key(request: Request, *, user_id: int, tag: str, generation: int) -> str:
+        params = sorted(request.query_params.multi_items())
+        digest = hashlib.blake2b(
+            json.dumps([request.url.path, params]).encode("utf-8"), digest_size=12
+        ).hexdigest()
+        return f"{tag}@{generation}:{user_id}:{digest}"
+
+    async def lookup(self, request: Request, *, user_id: int, tag: str) -> CacheSlot:
+        """
+        Procura a resposta da requisição; o slot retornado é usado em `store`
+        mesmo após um miss, para gravar sob a geração lida aqui
+        """
+        if not self.enabled:
+            return CacheSlot(key="")
+        try:
+            generation = await self._run(self.backend.get_generation, tag)
+            key = self._key(request, user_id=user_id, tag=tag, generation=generation)
+            value = await self._run(self.backend.get, key)
+        except Exception:
+            # Falhas do backend não devem derrubar a listagem
+            self._count("errors")
+            return CacheSlot(key="")
+
+        if value is None:
+            self._count("misses")
+            return CacheSlot(key=key)
+
+        self._count("hits")
+        raw_headers, _, body = value.partition(b"\n")
+        return CacheSlot(key=key, body=body, headers=json.loads(raw_headers))
+
+    def respond(self, request: Request, slot: CacheSlot) -> Response:
+        """
+        Resposta a partir de um hit, com 304 quando o ETag guardado confere
+        """
+        etag = slot.headers.get("etag")
+        if etag and etag_matches(request, etag):
+            response = not_modified(etag)
+            if "x-next-cursor" in slot.headers:
+                response.headers["x-next-cursor"] = slot.headers["x-next-cursor"]
+            return response
+        return Response(content=slot.body, media_type="application/json", headers=slot.headers)
+
+    async def store(self, slot: CacheSlot, body: bytes, response: Response) -> Response:
+        """
+        Grava o corpo JSON já serializado no cache e devolve a resposta com os
+        headers já definidos em `response`
+        """
+        headers = {name: value for name, value in response.headers.items() if name in CACHED_HEADERS}
+
+        if slot.key:
+            value = json.dumps(headers).encode("utf-8") + b"\n" + body
+            try:
+                await self._run(self.backend.set, slot.key, value, self.ttl)
+                self._count("stores")
+            except Exception:
+                self._count("errors")
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def invalidate(self, *tags: str) -> None:
+        """
+        Invalida as respostas das tags; chamar depois do commit da escrita
+        """
+        if not self.enabled:
+            return
+        for tag in tags:
+            try:
+                self.backend.bump_generation(tag)
+                self._count("invalidations")
+            except Exception:
+                self._count("errors")
+
+    async def ainvalidate(self, *tags: str) -> None:
+        if self.backend.blocking:
+            await to_thread.run_sync(self.invalidate, *tags)
+        else:
+            self.invalidate(*tags)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend.name,
+                "enabled": self.enabled,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "stores": self.stores,
+                "invalidations": self.invalidations,
+                "errors": self.errors,
+            }
+
+
+response_cache = ResponseCache.from_settings()
@@ -1,30 +1,50 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Optional, Union
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.core.cache import TTLCache
+from app.core.hashing import password_hasher
 from app.db.database import get_db
-from app.db.models.user import User
+from app.db.models.user import User, UserRole
 from app.api.v1.schemas.token import TokenPayload
 
-# Password hashing
-pwd_context = CryptContext(schemas=["bcrypt"], deprecated="auto")
-
 # OAuth2 schema
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """
+    Dados do usuário autenticado necessários para autorização
+    """
+    id: int
+    email: str
+    role: UserRole
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserPrincipal":
+        return cls(id=user.id, email=user.email, role=user.role, is_active=user.is_active)
+
+
+# Cache de principals por id de usuário, invalidado por user_service.update/remove
+user_principal_cache: "TTLCache[int, UserPrincipal]" = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
 def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
     """
     Cria um token JWT com o subject e o tempo de expiração fornecidos.
     """
     if expires_delta:
-        expire = datetime.utcnow(datetime.timezone.utc) + expires_delta
+        expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
@@ -36,19 +56,19 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifica se a senha fornecida é igual à senha hash
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.verify_blocking(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """
     Gera o hash da senha fornecida
     """
-    return pwd_context.hash(password)
+    return password_hasher.hash_blocking(password)
 
 
 
 def get_current_user(
         db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+) -> UserPrincipal:
     """
     Obtem o usuário atual a partir do token JWT
     """
@@ -68,15 +88,19 @@ def get_current_user(
     except (JWTError, ValidationError) as e:
         raise credentials_exception
     
-    # Get user from database using the user_id from the token
-    user = db.query(User).filter(User.id == token_data.sub).first()
-    if user is None:
-        raise credentials_exception
-    return user
+    # Get user principal from cache, falling back to the database
+    principal = user_principal_cache.get(token_data.sub)
+    if principal is None:
+        user = db.query(User).filter(User.id == token_data.sub).first()
+        if user is None:
+            raise credentials_exception
+        principal = UserPrincipal.from_user(user)
+        user_principal_cache.set(principal.id, principal)
+    return principal
 
 def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> UserPrincipal:
     """
     Get the current active user.
     """
@@ -1,15 +1,109 @@
-from sqlalchemy import create_engine
+import shlex
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import URL, create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
+from app.core.metrics import registry
+from app.core.profiling import instrument_engine
+from app.db.pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, pool_metrics
+
+def _pool_options() -> dict:
+    """
+    Opções de pool comuns aos engines síncrono e assíncrono
+    """
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
 
 # Create SQLAlchemy engine
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI)
+engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URI,
+    poolclass=InstrumentedQueuePool,
+    connect_args=(
+        {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+        if settings.DB_STATEMENT_TIMEOUT_MS
+        else {}
+    ),
+    **_pool_options(),
+)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Parâmetros do libpq sem equivalente direto no asyncpg; traduzidos para connect_args
+_LIBPQ_ONLY_PARAMS = ("sslmode", "options", "application_name", "connect_timeout")
+
+def _libpq_options_settings(options: str) -> Dict[str, str]:
+    """
+    Converte o parâmetro `options` do libpq ("-c chave=valor", "--chave=valor")
+    em server_settings do asyncpg
+    """
+    server_settings = {}
+    tokens = shlex.split(options)
+    for index, token in enumerate(tokens):
+        if token == "-c" and index + 1 < len(tokens):
+            setting = tokens[index + 1]
+        elif token.startswith("-c") or token.startswith("--"):
+            setting = token[2:]
+        else:
+            continue
+        key, sep, value = setting.partition("=")
+        if sep:
+            server_settings[key.replace("-", "_")] = value
+    return server_settings
+
+def _async_database_url(uri: str) -> Tuple[URL, Dict[str, Any]]:
+    """
+    URL do driver asyncpg a partir da URI configurada, com os parâmetros
+    exclusivos do libpq removidos da query e traduzidos para connect_args
+    """
+    url = make_url(uri)
+    # Parâmetros repetidos chegam como tupla; vale o último, como no libpq
+    query = {key: value[-1] if isinstance(value, tuple) else value for key, value in url.query.items()}
+    connect_args: Dict[str, Any] = {}
+    server_settings: Dict[str, str] = {}
+    if "sslmode" in query:
+        connect_args["ssl"] = query["sslmode"]
+    if "connect_timeout" in query:
+        connect_args["timeout"] = float(query["connect_timeout"])
+    if "application_name" in query:
+        server_settings["application_name"] = query["application_name"]
+    if "options" in query:
+        server_settings.update(_libpq_options_settings(query["options"]))
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+    if server_settings:
+        connect_args["server_settings"] = server_settings
+    url = url.set(drivername="postgresql+asyncpg").difference_update_query(_LIBPQ_ONLY_PARAMS)
+    return url, connect_args
+
+# Create async SQLAlchemy engine (asyncpg), coexisting with the sync engine
+_async_url, _async_connect_args = _async_database_url(settings.SQLALCHEMY_DATABASE_URI)
+async_engine = create_async_engine(
+    _async_url,
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    connect_args=_async_connect_args,
+    **_pool_options(),
+)
+
+# Consultas e tempo de banco por requisição, consultas lentas e estado dos pools em /metrics
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+registry.add_collector(lambda: pool_metrics({"sync": engine.pool, "async": async_engine.sync_engine.pool}))
+
+# Create AsyncSessionLocal class
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -21,12 +115,19 @@ def get_db():
     finally:
         db.close()
 
+# Dependency for getting async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Function to initialize database
 def init_db():
     # Import all models here to ensure they are registered with SQLAlchemy
     from app.db.models.user import User
     from app.db.models.project import Project
     from app.db.models.file import File
+    from app.db.models.file_deletion import FileDeletion
+    from app.db.models.upload_job import UploadJob
 
     # Create all tables
     Base.metadata.create_all(bind=engine)
@@ -1,11 +1,20 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, BigInteger
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Integer, String, ForeignKey, DateTime, BigInteger, Index
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from app.db.database import Base
+from app.db.search import tsvector_sql
 
 class File(Base):
     __tablename__ = "files"
+    __table_args__ = (
+        Index("ix_files_project_id_id", "project_id", "id"),
+        Index("ix_files_uploader_id_id", "uploader_id", "id"),
+        # Filtros por conteúdo (@>) e por chave (?) nos metadados
+        Index("ix_files_metadata", "metadata", postgresql_using="gin"),
+        Index("ix_files_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, nullable=False)
@@ -14,11 +23,19 @@ class File(Base):
     file_type = Column(String, nullable=False)
     file_size = Column(BigInteger, nullable=False)
     content_type = Column(String, nullable=False)
-    metadata = Column(Text)  # JSON string with metadata
+    # Id devolvido pelo processador no upload, usado para remover o arquivo lá;
+    # nulo em arquivos gravados antes de ele ser guardado
+    processor_file_id = Column(Integer)
+    # "metadata" é reservado no declarative; a coluna mantém o nome
+    metadata_ = Column("metadata", JSONB)
     uploader_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # Busca textual, mantida pelo banco (coluna gerada); não é carregada com o objeto
+    search_vector = deferred(Column(
+        TSVECTOR, Computed(tsvector_sql(("filename", "A"), ("original_filename", "B")), persisted=True)
+    ))
 
     # Relationships
     uploader = relationship("User", back_populates="files")
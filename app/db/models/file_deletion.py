@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, text
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+class FileDeletion(Base):
+    """
+    Outbox de remoções pendentes no processador de arquivos.
+
+    Gravada na mesma transação que remove o arquivo do banco e consumida pelo
+    FileDeletionWorker. `next_attempt_at` nulo indica que as tentativas se
+    esgotaram e a remoção precisa de intervenção manual.
+    """
+    __tablename__ = "file_deletions"
+    __table_args__ = (
+        # Apenas as remoções ainda pendentes são consultadas pelo worker
+        Index(
+            "ix_file_deletions_next_attempt_at", "next_attempt_at",
+            postgresql_where=text("next_attempt_at IS NOT NULL"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Id do arquivo no processador (File.processor_file_id), não o id da tabela
+    # files; sem chave estrangeira: a linha do arquivo já foi removida
+    file_id = Column(Integer, nullable=False)
+    file_path = Column(String)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime, server_default=func.now())
+    last_error = Column(Text)
+    created_at = Column(DateTime, server_default=func.now())
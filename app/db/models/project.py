@@ -1,50 +1,33 @@
-from sqlalchemy import Boolean, Column, String, Integer, DateTime, Enum
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
-
-from app.db.database import Base
-
-import enum
-
-class UserRole(str, enum.Enum):
-    FREELANCER = "freelancer"
-    CLIENT = "client"
-    ADMIN = "admin"
-
-class User(Base):
-    __tablename__ = "users"
-
-    id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True, index=True, nullable=False)
-    hashed_password = Column(String, nullable=False)
-    full_name = Column(String)
-    role = Column(Enum(UserRole), default=UserRole.CLIENT)
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
-
-    # Relationships
-    projects_owned = relationship("Project", back_populates="owner", foreign_keys="Project.owner_id")
-    projects_client = relationship("Project", back_populates="client", foreign_keys="Project.client_id")
-    files = relationship("File", back_populates="uploader")
-
-# app/db/models/project.py
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Integer, String, ForeignKey, DateTime, Text, Index, BigInteger
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from app.db.database import Base
+from app.db.search import tsvector_sql
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_owner_id_id", "owner_id", "id"),
+        Index("ix_projects_client_id_id", "client_id", "id"),
+        Index("ix_projects_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     description = Column(Text)
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     client_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Contadores desnormalizados, mantidos por file_service na mesma transação
+    file_count = Column(Integer, nullable=False, default=0, server_default="0")
+    total_file_size = Column(BigInteger, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # Busca textual, mantida pelo banco (coluna gerada); não é carregada com o objeto
+    search_vector = deferred(Column(
+        TSVECTOR, Computed(tsvector_sql(("name", "A"), ("description", "B")), persisted=True)
+    ))
 
     # Relationships
     owner = relationship("User", back_populates="projects_owned", foreign_keys=[owner_id])
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, BigInteger, Enum, Text
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+import enum
+
+class UploadJobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class UploadJob(Base):
+    """
+    Upload assíncrono (POST /files/upload/?mode=async).
+
+    Criado depois que o arquivo foi gravado no diretório de staging e
+    atualizado pelo UploadJobRunner; `file_id` aponta para o arquivo criado
+    quando o job termina com sucesso.
+    """
+    __tablename__ = "upload_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(
+        Enum(UploadJobStatus, name="uploadjobstatus", values_callable=lambda statuses: [status.value for status in statuses]),
+        nullable=False,
+        default=UploadJobStatus.QUEUED,
+    )
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    uploader_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    original_filename = Column(String, nullable=False)
+    content_type = Column(String)
+    file_size = Column(BigInteger, nullable=False)
+    file_id = Column(Integer, ForeignKey("files.id", ondelete="SET NULL"))
+    error = Column(Text)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
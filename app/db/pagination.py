@@ -0,0 +1,120 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import Response
+from sqlalchemy import and_, or_
+
+from app.core.exceptions import ValidationError
+
+QueryType = TypeVar("QueryType")
+
+# Header com o cursor da próxima página nas respostas de listagem
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode(payload: Dict[str, Any]) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _decode(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, binascii.Error):
+        raise ValidationError(detail="Cursor de paginação inválido")
+    if not isinstance(payload, dict) or not isinstance(payload.get("id"), int):
+        raise ValidationError(detail="Cursor de paginação inválido")
+    return payload
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Gera um cursor opaco a partir do último id da página
+    """
+    return _encode({"id": last_id})
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Extrai o último id visto de um cursor gerado por `encode_cursor`
+    """
+    return _decode(cursor)["id"]
+
+
+def encode_rank_cursor(rank: float, last_id: int) -> str:
+    """
+    Cursor de resultados ordenados por relevância: (rank, id) do último item
+    """
+    return _encode({"rank": rank, "id": last_id})
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    payload = _decode(cursor)
+    rank = payload.get("rank")
+    if not isinstance(rank, (int, float)) or isinstance(rank, bool):
+        raise ValidationError(detail="Cursor de paginação inválido")
+    return float(rank), payload["id"]
+
+
+def paginate(
+    query: QueryType, model: Any, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> QueryType:
+    """
+    Aplica paginação a uma Query (sync) ou Select (async), ordenando por id.
+
+    Com `cursor` usa keyset (`id > último id`), cujo custo não depende da
+    profundidade da página; sem cursor mantém o OFFSET de `skip` por
+    compatibilidade.
+    """
+    query = query.order_by(model.id)
+    if cursor is not None:
+        query = query.where(model.id > decode_cursor(cursor))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def paginate_ranked(
+    query: QueryType, model: Any, rank: Any, *, limit: int = 100, cursor: Optional[str] = None
+) -> QueryType:
+    """
+    Paginação keyset de resultados ordenados por relevância (rank desc, id).
+
+    O rank é recalculado pela mesma expressão em cada página, então a
+    comparação com o valor guardado no cursor é exata.
+    """
+    query = query.order_by(rank.desc(), model.id)
+    if cursor is not None:
+        last_rank, last_id = decode_rank_cursor(cursor)
+        query = query.where(or_(rank < last_rank, and_(rank == last_rank, model.id > last_id)))
+    return query.limit(limit)
+
+
+def next_cursor(items: Sequence[Any], limit: int) -> Optional[str]:
+    """
+    Cursor da próxima página, ou None quando esta é a última
+    """
+    if not items or len(items) < limit:
+        return None
+    return encode_cursor(items[-1].id)
+
+
+def set_next_cursor(response: Response, items: Sequence[Any], limit: int) -> None:
+    """
+    Publica o cursor da próxima página no header X-Next-Cursor, mantendo o
+    corpo das listagens inalterado
+    """
+    cursor = next_cursor(items, limit)
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
+
+def set_next_rank_cursor(response: Response, rows: Sequence[Any], limit: int) -> None:
+    """
+    Como `set_next_cursor`, para linhas de busca com as colunas `rank` e `id`
+    """
+    if rows and len(rows) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_rank_cursor(rows[-1].rank, rows[-1].id)
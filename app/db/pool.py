@@ -0,0 +1,143 @@
+import bisect
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.metrics import format_labels, histogram_samples
+
+# Limites (em segundos) dos buckets do histograma de espera por conexão
+WAIT_TIME_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class PoolWaitStats:
+    """
+    Histograma cumulativo do tempo de espera para obter uma conexão do pool
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = WAIT_TIME_BUCKETS) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counts: List[int] = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._max = 0.0
+        self._timeouts = 0
+
+    def observe(self, seconds: float) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+            if seconds > self._max:
+                self._max = seconds
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total_sum, total_max, timeouts = self._sum, self._max, self._timeouts
+
+        cumulative = 0
+        histogram = {}
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            histogram["+Inf" if bound == float("inf") else str(bound)] = cumulative
+
+        return {
+            "count": cumulative,
+            "sum_seconds": total_sum,
+            "max_seconds": total_max,
+            "timeouts": timeouts,
+            "buckets": histogram,
+        }
+
+
+class _WaitTimeInstrumentedPool:
+    """
+    Mixin que mede o tempo gasto em `connect()` (espera na fila + abertura
+    da conexão + pre-ping), registrando-o em `wait_stats`.
+    """
+
+    wait_stats: PoolWaitStats
+
+    def connect(self):  # type: ignore[override]
+        start = time.perf_counter()
+        try:
+            connection = super().connect()  # type: ignore[misc]
+        except exc.TimeoutError:
+            self.wait_stats.record_timeout()
+            raise
+        self.wait_stats.observe(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_WaitTimeInstrumentedPool, QueuePool):
+    wait_stats = PoolWaitStats()
+
+
+class InstrumentedAsyncAdaptedQueuePool(_WaitTimeInstrumentedPool, AsyncAdaptedQueuePool):
+    wait_stats = PoolWaitStats()
+
+
+def pool_stats(pool: Pool) -> Dict[str, Any]:
+    """
+    Retorna o estado atual do pool e o histograma de espera por conexão
+    """
+    stats: Dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, _WaitTimeInstrumentedPool):
+        stats["wait_time"] = pool.wait_stats.snapshot()
+    return stats
+
+
+POOL_GAUGES = (
+    ("db_pool_size", "size", "Tamanho configurado do pool de conexões"),
+    ("db_pool_checked_out", "checked_out", "Conexões em uso"),
+    ("db_pool_checked_in", "checked_in", "Conexões livres no pool"),
+    ("db_pool_overflow", "overflow", "Conexões abertas além de pool_size"),
+)
+
+
+def pool_metrics(pools: Dict[str, Pool]) -> Iterable[str]:
+    """
+    Estado dos pools no formato texto do Prometheus, lido no momento da coleta
+    """
+    stats = {name: pool_stats(pool) for name, pool in pools.items()}
+    for metric, key, documentation in POOL_GAUGES:
+        yield f"# HELP {metric} {documentation}"
+        yield f"# TYPE {metric} gauge"
+        for name, values in stats.items():
+            if key in values:
+                yield f"{metric}{format_labels([('engine', name)])} {values[key]}"
+
+    yield "# HELP db_pool_timeouts_total Esperas por conexão que estouraram pool_timeout"
+    yield "# TYPE db_pool_timeouts_total counter"
+    for name, values in stats.items():
+        if "wait_time" in values:
+            yield f"db_pool_timeouts_total{format_labels([('engine', name)])} {values['wait_time']['timeouts']}"
+
+    yield "# HELP db_pool_wait_seconds Tempo para obter uma conexão do pool"
+    yield "# TYPE db_pool_wait_seconds histogram"
+    for name, values in stats.items():
+        if "wait_time" in values:
+            wait_time = values["wait_time"]
+            yield from histogram_samples(
+                "db_pool_wait_seconds",
+                format_labels([("engine", name)]),
+                wait_time["buckets"].items(),
+                wait_time["sum_seconds"],
+            )
@@ -1,9 +1,14 @@
-from typing import Dict, Generic, List, Optional, Type, TypeVar, Union, Any
+from typing import AsyncIterator, Dict, Generic, List, Optional, Sequence, Type, TypeVar, Union, Any
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import Row, Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.interfaces import ORMOption
 
 from app.db.database import Base
+from app.db.pagination import paginate, paginate_ranked
+from app.db.search import search_query, search_rank
 
 ModelType = TypeVar("ModelType", bound=Base) # type: ignore
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -18,17 +23,17 @@ class BaseRepository(Generic[ModelType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
     
-    def get(self, db: Session, id: Any) -> Optional[ModelType]:
+    def get(self, db: Session, id: Any, *, options: Sequence[ORMOption] = ()) -> Optional[ModelType]:
         """
-        Obtém um objeto pelo id
+        Obtém um objeto pelo id, aplicando as opções de carregamento informadas
         """
-        return db.query(self.model).filter(self.model.id == id).first()
+        return db.query(self.model).options(*options).filter(self.model.id == id).first()
     
-    def get_multi(self, db: Session, *, skip: int = 0, limit: int = 0) -> List[ModelType]:
+    def get_multi(self, db: Session, *, skip: int = 0, limit: int = 0, cursor: Optional[str] = None) -> List[ModelType]:
         """
         Obtém uma lista de objetos
         """
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return paginate(db.query(self.model), self.model, skip=skip, limit=limit, cursor=cursor).all()
     
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """
@@ -51,7 +56,7 @@ class BaseRepository(Generic[ModelType]):
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.dict(exclude_unset=True)
+            update_data = obj_in.model_dump(exclude_unset=True)
         
         for field in obj_data:
             if field in update_data:
@@ -72,4 +77,119 @@ class BaseRepository(Generic[ModelType]):
         db.delete(obj)
         db.commit()
         
+        return obj
+
+
+class AsyncBaseRepository(Generic[ModelType]):
+    """
+    Classe <Base> assíncrona para repositórios com operações CRUD em comum
+    """
+
+    def __init__(self, model: Type[ModelType]):
+        self.model = model
+
+    async def get(self, db: AsyncSession, id: Any, *, options: Sequence[ORMOption] = ()) -> Optional[ModelType]:
+        """
+        Obtém um objeto pelo id, aplicando as opções de carregamento informadas
+        """
+        return await db.get(self.model, id, options=options)
+
+    async def get_multi(self, db: AsyncSession, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[ModelType]:
+        """
+        Obtém uma lista de objetos
+        """
+        result = await db.execute(
+            paginate(select(self.model), self.model, skip=skip, limit=limit, cursor=cursor)
+        )
+        return list(result.scalars().all())
+
+    async def get_rows(
+        self, db: AsyncSession, query: Select, columns: Sequence[Any], *,
+        skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+    ) -> List[Row]:
+        """
+        Obtém apenas as colunas informadas das linhas da página, sem montar objetos ORM
+        """
+        query = query.with_only_columns(*columns)
+        result = await db.execute(
+            paginate(query, self.model, skip=skip, limit=limit, cursor=cursor)
+        )
+        return list(result.all())
+
+    async def search_rows(
+        self, db: AsyncSession, query: Select, columns: Sequence[Any], *,
+        text: str, limit: int = 100, cursor: Optional[str] = None,
+    ) -> List[Row]:
+        """
+        Busca textual na coluna `search_vector` do modelo, ordenada por
+        relevância; as linhas trazem as colunas informadas mais `rank`
+        """
+        ts_query = search_query(text)
+        rank = search_rank(self.model.search_vector, ts_query)
+        query = (
+            query.with_only_columns(*columns, rank.label("rank"))
+            .where(self.model.search_vector.op("@@")(ts_query))
+        )
+        result = await db.execute(paginate_ranked(query, self.model, rank, limit=limit, cursor=cursor))
+        return list(result.all())
+
+    async def stream_rows(
+        self, db: AsyncSession, query: Select, columns: Sequence[Any], *, yield_per: int = 1000
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Percorre todas as linhas da consulta com um cursor no servidor, em blocos
+        de `yield_per` linhas, mantendo a memória constante
+        """
+        query = (
+            query.with_only_columns(*columns)
+            .order_by(self.model.id)
+            .execution_options(yield_per=yield_per)
+        )
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        """
+        Cria um novo objeto
+        """
+        obj_in_data = jsonable_encoder(obj_in)
+        db_obj = self.model(**obj_in_data)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+
+        return db_obj
+
+    async def update(
+        self, db: AsyncSession, *, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        """
+        Atualiza um objeto
+        """
+        obj_data = jsonable_encoder(db_obj)
+
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        for field in obj_data:
+            if field in update_data:
+                setattr(db_obj, field, update_data[field])
+
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[ModelType]:
+        """
+        Deletar um Objeto
+        """
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+
         return obj
\ No newline at end of file
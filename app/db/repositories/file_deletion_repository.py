@@ -0,0 +1,103 @@
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.models.file_deletion import FileDeletion
+from app.db.repositories.base import AsyncBaseRepository, BaseRepository
+
+
+class FileDeletionRepository(BaseRepository[FileDeletion]):
+    """
+    Repository for the file deletion outbox.
+    """
+
+    def enqueue(self, db: Session, *, file_id: int, file_path: Optional[str] = None) -> None:
+        """
+        Registra a remoção sem commit, na transação que remove o arquivo;
+        `file_id` é o id do arquivo no processador, não o da tabela files
+        """
+        db.add(FileDeletion(file_id=file_id, file_path=file_path))
+
+
+file_deletion_repository = FileDeletionRepository(FileDeletion)
+
+
+class AsyncFileDeletionRepository(AsyncBaseRepository[FileDeletion]):
+    """
+    Async repository for the file deletion outbox.
+    """
+
+    async def enqueue(self, db: AsyncSession, *, file_id: int, file_path: Optional[str] = None) -> None:
+        """
+        Registra a remoção sem commit; `file_id` é o id do arquivo no processador
+        """
+        db.add(FileDeletion(file_id=file_id, file_path=file_path))
+
+    async def claim_due(self, db: AsyncSession, *, limit: int, lease: timedelta) -> List[FileDeletion]:
+        """
+        Reserva até `limit` remoções vencidas, adiando `next_attempt_at` pelo
+        tempo do lease; linhas reservadas por outro worker são ignoradas
+        (SKIP LOCKED) e as de um worker que caiu voltam ao fim do lease
+        """
+        now = func.now()
+        due = (
+            select(FileDeletion.id)
+            .where(FileDeletion.next_attempt_at <= now)
+            .order_by(FileDeletion.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            update(FileDeletion)
+            .where(FileDeletion.id.in_(due))
+            .values(next_attempt_at=now + lease)
+            .returning(FileDeletion)
+        )
+        return list(result.scalars().all())
+
+    async def delete_many(self, db: AsyncSession, *, ids: Sequence[int]) -> None:
+        if ids:
+            await db.execute(delete(FileDeletion).where(FileDeletion.id.in_(ids)))
+
+    async def reschedule(
+        self, db: AsyncSession, *, id: int, attempts: int, retry_in: Optional[timedelta], error: str
+    ) -> None:
+        """
+        Registra uma tentativa com erro; sem `retry_in` as tentativas se encerram
+        """
+        await db.execute(
+            update(FileDeletion)
+            .where(FileDeletion.id == id)
+            .values(
+                attempts=attempts,
+                next_attempt_at=func.now() + retry_in if retry_in is not None else None,
+                last_error=error,
+            )
+        )
+
+    async def get_stats(self, db: AsyncSession) -> Dict[str, Any]:
+        """
+        Tamanho da fila: remoções pendentes, esgotadas e idade da mais antiga
+        """
+        row = (await db.execute(
+            select(
+                func.count().filter(FileDeletion.next_attempt_at.is_not(None)),
+                func.count().filter(FileDeletion.next_attempt_at.is_(None)),
+                func.extract(
+                    "epoch",
+                    func.now() - func.min(FileDeletion.created_at).filter(FileDeletion.next_attempt_at.is_not(None)),
+                ),
+            )
+        )).one()
+        return {
+            "pending": row[0],
+            "failed": row[1],
+            "oldest_pending_seconds": float(row[2]) if row[2] is not None else None,
+        }
+
+
+async_file_deletion_repository = AsyncFileDeletionRepository(FileDeletion)
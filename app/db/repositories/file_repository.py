@@ -1,10 +1,13 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
+from sqlalchemy import Row, Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.db.pagination import paginate
 from app.db.models.file import File
 from app.db.models.project import Project
-from app.db.repositories.base import BaseRepository
+from app.db.repositories.base import AsyncBaseRepository, BaseRepository
 
 
 class FileRepository(BaseRepository[File]):
@@ -13,62 +16,153 @@ class FileRepository(BaseRepository[File]):
     """
 
     def get_multi_by_project(
-        self, db: Session, *, project_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, project_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
     ) -> List[File]:
         """
         Get files by project ID.
         """
-        return (
+        query = (
             db.query(File)
             .filter(File.project_id == project_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return paginate(query, File, skip=skip, limit=limit, cursor=cursor).all()
     
     def get_multi_by_uploader(
-        self, db: Session, *, uploader_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, uploader_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
     ) -> List[File]:
         """
         Get files by uploader ID.
         """
-        return (
+        query = (
             db.query(File)
             .filter(File.uploader_id == uploader_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return paginate(query, File, skip=skip, limit=limit, cursor=cursor).all()
     
     def get_multi_by_owner_projects(
-        self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
     ) -> List[File]:
         """
         Get files from projects owned by a user.
         """
-        return (
+        query = (
             db.query(File)
             .join(Project, File.project_id == Project.id)
             .filter(Project.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return paginate(query, File, skip=skip, limit=limit, cursor=cursor).all()
     
     def get_multi_by_client_projects(
-        self, db: Session, *, client_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, client_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
     ) -> List[File]:
         """
         Get files from projects where a user is a client.
         """
-        return (
+        query = (
             db.query(File)
             .join(Project, File.project_id == Project.id)
             .filter(Project.client_id == client_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return paginate(query, File, skip=skip, limit=limit, cursor=cursor).all()
+
+
+file_repository = FileRepository(File)
+
+
+class AsyncFileRepository(AsyncBaseRepository[File]):
+    """
+    Async repository for File model.
+    """
+
+    def select_by_project(self, project_id: int) -> Select:
+        return select(File).where(File.project_id == project_id)
+
+    def select_by_uploader(self, uploader_id: int) -> Select:
+        return select(File).where(File.uploader_id == uploader_id)
+
+    def select_by_owner_projects(self, owner_id: int) -> Select:
+        return (
+            select(File)
+            .join(Project, File.project_id == Project.id)
+            .where(Project.owner_id == owner_id)
+        )
+
+    def select_by_client_projects(self, client_id: int) -> Select:
+        return (
+            select(File)
+            .join(Project, File.project_id == Project.id)
+            .where(Project.client_id == client_id)
+        )
+
+    def filter_metadata(
+        self, query: Select, *, contains: Optional[Dict[str, Any]] = None, keys: Sequence[str] = ()
+    ) -> Select:
+        """
+        Filter by metadata containment (@>) and key existence (?), both
+        served by the GIN index on files.metadata.
+        """
+        if contains:
+            query = query.where(File.metadata_.contains(contains))
+        for key in keys:
+            query = query.where(File.metadata_.has_key(key))
+        return query
+
+    async def get_version(self, db: AsyncSession, *, file_id: int) -> Optional[Row]:
+        """
+        Get only the file version (id, updated_at) and the project ids needed
+        for permission checks, without loading the File object.
+        """
+        query = (
+            select(File.id, File.updated_at, File.project_id, Project.owner_id, Project.client_id)
+            .join(Project, File.project_id == Project.id)
+            .where(File.id == file_id)
+        )
+        result = await db.execute(query)
+        return result.first()
+
+    async def get_multi_by_project(
+        self, db: AsyncSession, *, project_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[File]:
+        """
+        Get files by project ID.
+        """
+        result = await db.execute(
+            paginate(self.select_by_project(project_id), File, skip=skip, limit=limit, cursor=cursor)
+        )
+        return list(result.scalars().all())
+
+    async def get_multi_by_uploader(
+        self, db: AsyncSession, *, uploader_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[File]:
+        """
+        Get files by uploader ID.
+        """
+        result = await db.execute(
+            paginate(self.select_by_uploader(uploader_id), File, skip=skip, limit=limit, cursor=cursor)
+        )
+        return list(result.scalars().all())
+
+    async def get_multi_by_owner_projects(
+        self, db: AsyncSession, *, owner_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[File]:
+        """
+        Get files from projects owned by a user.
+        """
+        result = await db.execute(
+            paginate(self.select_by_owner_projects(owner_id), File, skip=skip, limit=limit, cursor=cursor)
+        )
+        return list(result.scalars().all())
+
+    async def get_multi_by_client_projects(
+        self, db: AsyncSession, *, client_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[File]:
+        """
+        Get files from projects where a user is a client.
+        """
+        result = await db.execute(
+            paginate(self.select_by_client_projects(client_id), File, skip=skip, limit=limit, cursor=cursor)
+        )
+        return list(result.scalars().all())
 
 
-file_repository = FileRepository(File)
\ No newline at end of file
+async_file_repository = AsyncFileRepository(File)
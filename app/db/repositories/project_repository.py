@@ -1,9 +1,26 @@
-from typing import List, Optional 
+from typing import List, Optional, Sequence
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
 
+from app.db.pagination import paginate
 from app.db.models.project import Project 
-from app.db.repositories.base import BaseRepository
+from app.db.models.user import User
+from app.db.repositories.base import AsyncBaseRepository, BaseRepository
+
+# Estratégias de carregamento de owner/client: "joined" (uma única consulta,
+# melhor para um projeto) ou "selectin" (uma consulta extra por relação para
+# toda a lista, melhor para listagens)
+LOADER_STRATEGIES = {"joined": joinedload, "selectin": selectinload}
+
+def detail_options(strategy: str = "joined") -> List[ORMOption]:
+    """
+    Opções para carregar owner e client junto com o projeto
+    """
+    loader = LOADER_STRATEGIES[strategy]
+    return [loader(Project.owner), loader(Project.client)]
 
 class ProjectRepository(BaseRepository[Project]):
     """
@@ -11,37 +28,114 @@ class ProjectRepository(BaseRepository[Project]):
     """
 
     def get_multi_by_owner(
-            self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100
+            self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+            options: Sequence[ORMOption] = (),
     ) -> List[Project]:
         """
         Obtém uma lista de projetos por proprietário
         """
-        return (
+        query = (
             db.query(Project)
+            .options(*options)
             .filter(Project.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return paginate(query, Project, skip=skip, limit=limit, cursor=cursor).all()
     
     def get_multi_by_client(
-            self, db: Session, *, client_id: int, skip: int = 0, limit: int = 100
+            self, db: Session, *, client_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+            options: Sequence[ORMOption] = (),
     ) -> List[Project]:
         """
         Obtém uma lista de projetos por cliente ID
         """
-        return (
+        query = (
             db.query(Project)
+            .options(*options)
             .filter(Project.client_id == client_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return paginate(query, Project, skip=skip, limit=limit, cursor=cursor).all()
     
+    def get_detail(self, db: Session, *, project_id: int, strategy: str = "joined") -> Optional[Project]:
+        """
+        Obtém um projeto com owner e client carregados
+        """
+        return self.get(db, project_id, options=detail_options(strategy))
+
     def get_project_with_files(self, db: Session, *, project_id: int) -> Optional[Project]:
         """
         Obtém um projeto com arquivos associados
         """
         return (db.query(Project).filter(Project.id == project_id).first())
 
-project_repository = ProjectRepository(Project)
\ No newline at end of file
+project_repository = ProjectRepository(Project)
+
+
+class AsyncProjectRepository(AsyncBaseRepository[Project]):
+    """
+    Repositório assíncrono para o modelo de Projeto
+    """
+
+    def select_by_owner(self, owner_id: int, *, options: Sequence[ORMOption] = ()) -> Select:
+        return select(Project).options(*options).where(Project.owner_id == owner_id)
+
+    def select_by_client(self, client_id: int, *, options: Sequence[ORMOption] = ()) -> Select:
+        return select(Project).options(*options).where(Project.client_id == client_id)
+
+    async def get_version(self, db: AsyncSession, *, project_id: int) -> Optional[Row]:
+        """
+        Obtém apenas as colunas que definem a versão do detalhe do projeto
+        (incluindo o updated_at de owner e client), sem montar os objetos
+        """
+        owner = aliased(User)
+        client = aliased(User)
+        query = (
+            select(
+                Project.id,
+                Project.owner_id,
+                Project.client_id,
+                Project.updated_at,
+                Project.file_count,
+                Project.total_file_size,
+                owner.updated_at.label("owner_updated_at"),
+                client.updated_at.label("client_updated_at"),
+            )
+            .join(owner, Project.owner_id == owner.id)
+            .join(client, Project.client_id == client.id)
+            .where(Project.id == project_id)
+        )
+        result = await db.execute(query)
+        return result.first()
+
+    async def get_multi_by_owner(
+            self, db: AsyncSession, *, owner_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+            options: Sequence[ORMOption] = (),
+    ) -> List[Project]:
+        """
+        Obtém uma lista de projetos por proprietário
+        """
+        result = await db.execute(
+            paginate(self.select_by_owner(owner_id, options=options), Project, skip=skip, limit=limit, cursor=cursor)
+        )
+        return list(result.scalars().all())
+
+    async def get_multi_by_client(
+            self, db: AsyncSession, *, client_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+            options: Sequence[ORMOption] = (),
+    ) -> List[Project]:
+        """
+        Obtém uma lista de projetos por cliente ID
+        """
+        result = await db.execute(
+            paginate(self.select_by_client(client_id, options=options), Project, skip=skip, limit=limit, cursor=cursor)
+        )
+        return list(result.scalars().all())
+
+    async def get_detail(
+            self, db: AsyncSession, *, project_id: int, strategy: str = "joined"
+    ) -> Optional[Project]:
+        """
+        Obtém um projeto com owner e client carregados
+        """
+        return await self.get(db, project_id, options=detail_options(strategy))
+
+async_project_repository = AsyncProjectRepository(Project)
@@ -0,0 +1,40 @@
+from typing import Optional, Sequence
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.upload_job import UploadJob, UploadJobStatus
+from app.db.repositories.base import AsyncBaseRepository
+
+
+class AsyncUploadJobRepository(AsyncBaseRepository[UploadJob]):
+    """
+    Async repository for asynchronous upload jobs.
+    """
+
+    async def set_status(
+        self, db: AsyncSession, *, id: int, status: UploadJobStatus,
+        file_id: Optional[int] = None, error: Optional[str] = None,
+    ) -> None:
+        await db.execute(
+            update(UploadJob)
+            .where(UploadJob.id == id)
+            .values(status=status, file_id=file_id, error=error)
+        )
+
+    async def fail_unfinished(self, db: AsyncSession, *, ids: Sequence[int], error: str) -> None:
+        """
+        Marca como falhos os jobs informados que ainda não terminaram
+        """
+        if ids:
+            await db.execute(
+                update(UploadJob)
+                .where(
+                    UploadJob.id.in_(ids),
+                    UploadJob.status.in_((UploadJobStatus.QUEUED, UploadJobStatus.PROCESSING)),
+                )
+                .values(status=UploadJobStatus.FAILED, error=error)
+            )
+
+
+async_upload_job_repository = AsyncUploadJobRepository(UploadJob)
@@ -1,9 +1,13 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Set
 
+from sqlalchemy import Row, Select, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.db.pagination import paginate
 from app.db.models.user import User, UserRole
-from app.db.repositories.base import BaseRepository
+from app.db.repositories.base import AsyncBaseRepository, BaseRepository
 
 class UserRepository(BaseRepository[User]):
     """
@@ -17,29 +21,85 @@ class UserRepository(BaseRepository[User]):
         return db.query(User).filter(User.email == email).first()
     
     def get_by_role(
-            self, db: Session, *, role: UserRole, skip: int = 0, limit: int = 0 
+            self, db: Session, *, role: UserRole, skip: int = 0, limit: int = 0, cursor: Optional[str] = None 
     ) -> List[User]:
         """ 
         Obtem usuário pela função(role)
         """
-        return db.query(User).filter(User.role == role).offset(skip).limit(limit).all()
+        query = db.query(User).filter(User.role == role)
+        return paginate(query, User, skip=skip, limit=limit, cursor=cursor).all()
     
-    def get_clients(self, db: Session, *, skip: int = 0, limit: int = 0) -> List[User]:
+    def get_clients(self, db: Session, *, skip: int = 0, limit: int = 0, cursor: Optional[str] = None) -> List[User]:
         """
         Obtem clientes
         """
-        return self.get_by_role(db, role=UserRole.CLIENT, skip=skip, limit=limit)
+        return self.get_by_role(db, role=UserRole.CLIENT, skip=skip, limit=limit, cursor=cursor)
     
-    def get_freelancers(self, db: Session, *, skip: int = 0, limit: int = 0) -> List[User]:
+    def get_freelancers(self, db: Session, *, skip: int = 0, limit: int = 0, cursor: Optional[str] = None) -> List[User]:
         """
         Obtem freelancers
         """
-        return self.get_by_role(db, role=UserRole.FREELANCER, skip=skip, limit=limit)
+        return self.get_by_role(db, role=UserRole.FREELANCER, skip=skip, limit=limit, cursor=cursor)
     
-    def get_admins(self, db: Session, *, skip: int = 0, limit: int = 0) -> List[User]:
+    def get_admins(self, db: Session, *, skip: int = 0, limit: int = 0, cursor: Optional[str] = None) -> List[User]:
         """
         Obtem administradores
         """
-        return self.get_by_role(db, role=UserRole.ADMIN, skip=skip, limit=limit)
+        return self.get_by_role(db, role=UserRole.ADMIN, skip=skip, limit=limit, cursor=cursor)
     
-user_repository = UserRepository(User)
\ No newline at end of file
+user_repository = UserRepository(User)
+
+
+class AsyncUserRepository(AsyncBaseRepository[User]):
+    """
+    Repositório assíncrono para o modelo de usuario
+    """
+
+    def select_by_role(self, role: UserRole) -> Select:
+        return select(User).where(User.role == role)
+
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[User]:
+        """
+        Obtém um usuário pelo email
+        """
+        result = await db.execute(select(User).where(User.email == email))
+        return result.scalars().first()
+
+    async def get_by_role(
+            self, db: AsyncSession, *, role: UserRole, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[User]:
+        """ 
+        Obtem usuário pela função(role)
+        """
+        result = await db.execute(
+            paginate(self.select_by_role(role), User, skip=skip, limit=limit, cursor=cursor)
+        )
+        return list(result.scalars().all())
+
+    async def get_existing_emails(self, db: AsyncSession, *, emails: Sequence[str]) -> Set[str]:
+        """
+        Emails já cadastrados dentre os informados, em uma única consulta (IN)
+        """
+        if not emails:
+            return set()
+        result = await db.execute(select(User.email).where(User.email.in_(emails)))
+        return set(result.scalars().all())
+
+    async def insert_many(self, db: AsyncSession, *, values: List[Dict[str, Any]]) -> List[Row]:
+        """
+        Insere vários usuários com um único INSERT multi-linhas. Emails que já
+        existirem (ex.: criados em paralelo) são ignorados; retorna (id, email)
+        apenas das linhas inseridas.
+        """
+        if not values:
+            return []
+        statement = (
+            insert(User)
+            .values(values)
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User.id, User.email)
+        )
+        result = await db.execute(statement)
+        return list(result.all())
+
+async_user_repository = AsyncUserRepository(User)
\ No newline at end of file
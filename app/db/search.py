@@ -0,0 +1,36 @@
+from typing import Tuple
+
+from sqlalchemy import cast, func
+from sqlalchemy.dialects.postgresql import REGCONFIG, REAL
+from sqlalchemy.sql.elements import ColumnElement
+
+# Configuração sem stemming: nomes de projetos e arquivos misturam idiomas
+SEARCH_CONFIG = "simple"
+
+
+def tsvector_sql(*weighted_columns: Tuple[str, str]) -> str:
+    """
+    Expressão SQL de uma coluna tsvector gerada a partir de (coluna, peso).
+
+    Pontos, sublinhados, hífens e barras viram espaços para que nomes como
+    `contrato_final.pdf` sejam indexados como palavras separadas.
+    """
+    return " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+        f"translate(coalesce({column}, ''), '._-/', '    ')), '{weight}')"
+        for column, weight in weighted_columns
+    )
+
+
+def search_query(text: str) -> ColumnElement:
+    """
+    tsquery a partir do texto digitado (sintaxe de busca web: aspas, OR, -)
+    """
+    return func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), text)
+
+
+def search_rank(vector: ColumnElement, query: ColumnElement) -> ColumnElement:
+    """
+    Relevância do documento para a busca (maior primeiro)
+    """
+    return func.ts_rank_cd(vector, query, type_=REAL)
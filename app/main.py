@@ -1,18 +1,61 @@
-from fastapi import FastAPI, Depends, HTTPException
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from sqlalchemy.orm import Session
 import uvicorn
 
 from app.api.v1.router import api_router
+from app.core.exceptions import ApplicationError
+from app.core.hashing import bulk_password_hasher, password_hasher
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, http_metrics, registry
+from app.core.profiling import ProfilingMiddleware
 from app.core.security import get_current_active_user
 from app.db.database import get_db, init_db
+from app.services.file_deletion_worker import FileDeletionWorker
+from app.services.file_processor import FileProcessorClient
+from app.services.upload_job_runner import UploadJobRunner
 from app.config import settings
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Inicialização do banco de dados
+    init_db()
+
+    # Métricas de cada rota criadas uma única vez, antes da primeira requisição
+    http_metrics.register_app(app)
+
+    # Cliente com pool de conexões para o processador de arquivos
+    app.state.file_processor = FileProcessorClient.from_settings(settings)
+
+    # Remoções no processador a partir do outbox, fora das requisições
+    app.state.file_deletion_worker = FileDeletionWorker.from_settings(app.state.file_processor, settings)
+    if settings.FILE_DELETION_WORKER_ENABLED:
+        app.state.file_deletion_worker.start()
+
+    # Pool de workers dos uploads assíncronos
+    app.state.upload_job_runner = UploadJobRunner.from_settings(
+        app.state.file_processor, settings, deletion_worker=app.state.file_deletion_worker
+    )
+    app.state.upload_job_runner.start()
+    try:
+        yield
+    finally:
+        await app.state.upload_job_runner.stop()
+        await app.state.file_deletion_worker.stop()
+        await app.state.file_processor.aclose()
+        password_hasher.shutdown()
+        bulk_password_hasher.shutdown()
+
+
 app = FastAPI(
     title="Freela Facility API",
     description="API principal para gerenciamento de freelancers, clientes, projetos e arquivos",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configuração de CORS
@@ -29,16 +72,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
 
+# Server-Timing e detecção de N+1; usa o perfil da requisição criado pelas métricas
+if settings.SQL_PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Adicionado por último para ficar por fora dos demais middlewares
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Conversão de erros da aplicação levantados fora dos endpoints (serviços, dependências)
+@app.exception_handler(ApplicationError)
+async def application_error_handler(request: Request, exc: ApplicationError):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers=exc.headers,
+    )
+
 # Inclusão das rotas da API
 app.include_router(api_router, prefix="/api/v1")
 
-# Inicialização do banco de dados
-@app.on_event("startup")
-async def startup_event():
-    init_db()
-
 @app.get("/health", tags=["Health"])
 def health_check():
     """
@@ -46,6 +102,14 @@ def health_check():
     """
     return {"status": "healthy"}
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    def metrics():
+        """
+        Métricas da aplicação no formato texto do Prometheus.
+        """
+        return Response(content=registry.render(), media_type=METRICS_CONTENT_TYPE)
+
 # Personalização da documentação OpenAPI (Swagger)
 def custom_openapi():
     if app.openapi_schema:
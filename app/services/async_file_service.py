@@ -0,0 +1,248 @@
+import logging
+from typing import AsyncIterator, List, Optional, Dict, Any, Sequence, Tuple
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.response_cache import project_tags, response_cache
+from app.db.models.file import File
+from app.db.repositories.file_deletion_repository import async_file_deletion_repository
+from app.db.repositories.file_repository import async_file_repository
+from app.api.v1.schemas.file import FileCreate
+from app.services import async_project_service
+
+logger = logging.getLogger(__name__)
+
+# Colunas que identificam a versão de um arquivo (ETag das listagens)
+VERSION_COLUMNS = (File.id, File.updated_at)
+
+async def get(db: AsyncSession, id: int) -> Optional[File]:
+    return await async_file_repository.get(db, id)
+
+async def get_version(db: AsyncSession, id: int) -> Optional[Row]:
+    return await async_file_repository.get_version(db, file_id=id)
+
+async def get_multi(
+        db: AsyncSession, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[File]:
+    return await async_file_repository.get_multi(db, skip=skip, limit=limit, cursor=cursor)
+
+async def get_multi_by_project(
+        db: AsyncSession, *, project_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[File]:
+    return await async_file_repository.get_multi_by_project(
+        db, project_id=project_id, skip=skip, limit=limit, cursor=cursor
+    )
+
+async def get_multi_by_uploader(
+    db: AsyncSession, *, uploader_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[File]:
+    return await async_file_repository.get_multi_by_uploader(
+        db, uploader_id=uploader_id, skip=skip, limit=limit, cursor=cursor
+    )
+
+async def get_multi_by_owner_projects(
+    db: AsyncSession, *, owner_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[File]:
+    return await async_file_repository.get_multi_by_owner_projects(
+        db, owner_id=owner_id, skip=skip, limit=limit, cursor=cursor
+    )
+
+async def get_multi_by_client_projects(
+    db: AsyncSession, *, client_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[File]:
+    return await async_file_repository.get_multi_by_client_projects(
+        db, client_id=client_id, skip=skip, limit=limit, cursor=cursor
+    )
+
+async def get_rows_by_project(
+    db: AsyncSession, *, project_id: int, columns: Sequence[Any] = VERSION_COLUMNS,
+    skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+    metadata_contains: Optional[Dict[str, Any]] = None, metadata_keys: Sequence[str] = (),
+) -> List[Row]:
+    query = async_file_repository.filter_metadata(
+        async_file_repository.select_by_project(project_id), contains=metadata_contains, keys=metadata_keys
+    )
+    return await async_file_repository.get_rows(db, query, columns, skip=skip, limit=limit, cursor=cursor)
+
+async def get_rows_by_owner_projects(
+    db: AsyncSession, *, owner_id: int, columns: Sequence[Any] = VERSION_COLUMNS,
+    skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+    metadata_contains: Optional[Dict[str, Any]] = None, metadata_keys: Sequence[str] = (),
+) -> List[Row]:
+    query = async_file_repository.filter_metadata(
+        async_file_repository.select_by_owner_projects(owner_id), contains=metadata_contains, keys=metadata_keys
+    )
+    return await async_file_repository.get_rows(db, query, columns, skip=skip, limit=limit, cursor=cursor)
+
+async def get_rows_by_client_projects(
+    db: AsyncSession, *, client_id: int, columns: Sequence[Any] = VERSION_COLUMNS,
+    skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+    metadata_contains: Optional[Dict[str, Any]] = None, metadata_keys: Sequence[str] = (),
+) -> List[Row]:
+    query = async_file_repository.filter_metadata(
+        async_file_repository.select_by_client_projects(client_id), contains=metadata_contains, keys=metadata_keys
+    )
+    return await async_file_repository.get_rows(db, query, columns, skip=skip, limit=limit, cursor=cursor)
+
+async def search_rows_by_project(
+    db: AsyncSession, *, project_id: int, text: str, columns: Sequence[Any],
+    limit: int = 100, cursor: Optional[str] = None,
+) -> List[Row]:
+    return await async_file_repository.search_rows(
+        db, async_file_repository.select_by_project(project_id), columns, text=text, limit=limit, cursor=cursor
+    )
+
+async def search_rows_by_owner_projects(
+    db: AsyncSession, *, owner_id: int, text: str, columns: Sequence[Any],
+    limit: int = 100, cursor: Optional[str] = None,
+) -> List[Row]:
+    return await async_file_repository.search_rows(
+        db, async_file_repository.select_by_owner_projects(owner_id), columns, text=text, limit=limit, cursor=cursor
+    )
+
+async def search_rows_by_client_projects(
+    db: AsyncSession, *, client_id: int, text: str, columns: Sequence[Any],
+    limit: int = 100, cursor: Optional[str] = None,
+) -> List[Row]:
+    return await async_file_repository.search_rows(
+        db, async_file_repository.select_by_client_projects(client_id), columns, text=text, limit=limit, cursor=cursor
+    )
+
+def stream_rows_by_project(
+    db: AsyncSession, *, project_id: int, columns: Sequence[Any], yield_per: int = 1000,
+    metadata_contains: Optional[Dict[str, Any]] = None, metadata_keys: Sequence[str] = (),
+) -> AsyncIterator[Sequence[Row]]:
+    query = async_file_repository.filter_metadata(
+        async_file_repository.select_by_project(project_id), contains=metadata_contains, keys=metadata_keys
+    )
+    return async_file_repository.stream_rows(db, query, columns, yield_per=yield_per)
+
+def stream_rows_by_owner_projects(
+    db: AsyncSession, *, owner_id: int, columns: Sequence[Any], yield_per: int = 1000,
+    metadata_contains: Optional[Dict[str, Any]] = None, metadata_keys: Sequence[str] = (),
+) -> AsyncIterator[Sequence[Row]]:
+    query = async_file_repository.filter_metadata(
+        async_file_repository.select_by_owner_projects(owner_id), contains=metadata_contains, keys=metadata_keys
+    )
+    return async_file_repository.stream_rows(db, query, columns, yield_per=yield_per)
+
+def stream_rows_by_client_projects(
+    db: AsyncSession, *, client_id: int, columns: Sequence[Any], yield_per: int = 1000,
+    metadata_contains: Optional[Dict[str, Any]] = None, metadata_keys: Sequence[str] = (),
+) -> AsyncIterator[Sequence[Row]]:
+    query = async_file_repository.filter_metadata(
+        async_file_repository.select_by_client_projects(client_id), contains=metadata_contains, keys=metadata_keys
+    )
+    return async_file_repository.stream_rows(db, query, columns, yield_per=yield_per)
+
+async def add(
+    db: AsyncSession, *, obj_in: FileCreate, file_data: Dict[str, Any], uploader_id: int
+) -> Tuple[File, Optional[Row]]:
+    """
+    Adiciona o arquivo e ajusta as estatísticas do projeto sem commit.
+    Retorna também o projeto afetado, cujas tags o chamador invalida depois
+    do commit
+    """
+    db_obj = File(
+        filename=file_data.get("filename"),
+        original_filename=file_data.get("original_filename", file_data.get("filename")),
+        file_path=file_data.get("file_path"),
+        file_type=file_data.get("file_type"),
+        file_size=file_data.get("file_size"),
+        content_type=file_data.get("content_type"),
+        processor_file_id=file_data.get("id"),
+        metadata_=file_data.get("metadata", {}),
+        uploader_id=uploader_id,
+        project_id=obj_in.project_id,
+    )
+    db.add(db_obj)
+    project = await async_project_service.adjust_file_stats(
+        db, project_id=obj_in.project_id, file_count=1, total_file_size=db_obj.file_size or 0
+    )
+    await db.flush()
+    return db_obj, project
+
+async def create(
+    db: AsyncSession, *, obj_in: FileCreate, file_data: Dict[str, Any], uploader_id: int
+) -> File:
+    db_obj, project = await add(db, obj_in=obj_in, file_data=file_data, uploader_id=uploader_id)
+    await db.commit()
+    await db.refresh(db_obj)
+    if project:
+        await response_cache.ainvalidate(*project_tags(*project))
+
+    return db_obj
+
+async def create_multi(
+    db: AsyncSession, *, project_id: int, files_data: List[Dict[str, Any]], uploader_id: int
+) -> List[File]:
+    """
+    Cria vários arquivos de um mesmo projeto em uma única transação
+    """
+    db_objs = [
+        File(
+            filename=file_data.get("filename"),
+            original_filename=file_data.get("original_filename", file_data.get("filename")),
+            file_path=file_data.get("file_path"),
+            file_type=file_data.get("file_type"),
+            file_size=file_data.get("file_size"),
+            content_type=file_data.get("content_type"),
+            processor_file_id=file_data.get("id"),
+            metadata_=file_data.get("metadata", {}),
+            uploader_id=uploader_id,
+            project_id=project_id,
+        )
+        for file_data in files_data
+    ]
+    if not db_objs:
+        return []
+
+    db.add_all(db_objs)
+    project = await async_project_service.adjust_file_stats(
+        db,
+        project_id=project_id,
+        file_count=len(db_objs),
+        total_file_size=sum(db_obj.file_size or 0 for db_obj in db_objs),
+    )
+    await db.commit()
+    if project:
+        await response_cache.ainvalidate(*project_tags(*project))
+
+    return db_objs
+
+async def discard_forwarded(db: AsyncSession, *, files_data: Sequence[Dict[str, Any]]) -> None:
+    """
+    Registra no outbox a remoção de arquivos já enviados ao processador cujo
+    registro não foi gravado (`id` é o identificador devolvido pelo processador,
+    o mesmo guardado em File.processor_file_id)
+    """
+    for file_data in files_data:
+        if file_data.get("id") is not None:
+            await async_file_deletion_repository.enqueue(
+                db, file_id=file_data["id"], file_path=file_data.get("file_path")
+            )
+    await db.commit()
+
+async def remove(db: AsyncSession, *, id: int) -> File:
+    """
+    Remove o arquivo e registra a remoção no processador no outbox, na mesma
+    transação; o FileDeletionWorker faz a chamada depois do commit
+    """
+    obj = await db.get(File, id)
+    await db.delete(obj)
+    if obj.processor_file_id is not None:
+        await async_file_deletion_repository.enqueue(
+            db, file_id=obj.processor_file_id, file_path=obj.file_path
+        )
+    else:
+        # Sem o id do processador não há como remover o arquivo lá com segurança
+        logger.warning("Arquivo %s removido sem id no processador; %s fica no processador", obj.id, obj.file_path)
+    project = await async_project_service.adjust_file_stats(
+        db, project_id=obj.project_id, file_count=-1, total_file_size=-(obj.file_size or 0)
+    )
+    await db.commit()
+    if project:
+        await response_cache.ainvalidate(*project_tags(*project))
+
+    return obj
@@ -0,0 +1,146 @@
+from typing import AsyncIterator, List, Optional, Dict, Any, Sequence, Union
+
+from sqlalchemy import Row, update as sql_update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
+
+from app.core.response_cache import project_tags, response_cache
+from app.db.models.project import Project
+from app.db.repositories.project_repository import async_project_repository
+from app.api.v1.schemas.project import ProjectCreate, ProjectUpdate
+
+# Colunas que identificam a versão de um projeto (ETag das listagens)
+VERSION_COLUMNS = (Project.id, Project.updated_at)
+
+async def get(db: AsyncSession, id: int, *, options: Sequence[ORMOption] = ()) -> Optional[Project]:
+    return await async_project_repository.get(db, id, options=options)
+
+async def get_detail(db: AsyncSession, id: int, *, strategy: str = "joined") -> Optional[Project]:
+    return await async_project_repository.get_detail(db, project_id=id, strategy=strategy)
+
+async def get_version(db: AsyncSession, id: int) -> Optional[Row]:
+    return await async_project_repository.get_version(db, project_id=id)
+
+async def get_multi(
+    db: AsyncSession, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Project]:
+    return await async_project_repository.get_multi(db, skip=skip, limit=limit, cursor=cursor)
+
+async def get_multi_by_owner(
+    db: AsyncSession, *, owner_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+    options: Sequence[ORMOption] = (),
+) -> List[Project]:
+    return await async_project_repository.get_multi_by_owner(
+        db, owner_id=owner_id, skip=skip, limit=limit, cursor=cursor, options=options
+    )
+
+async def get_multi_by_client(
+    db: AsyncSession, *, client_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+    options: Sequence[ORMOption] = (),
+) -> List[Project]:
+    return await async_project_repository.get_multi_by_client(
+        db, client_id=client_id, skip=skip, limit=limit, cursor=cursor, options=options
+    )
+
+async def get_rows_by_owner(
+    db: AsyncSession, *, owner_id: int, columns: Sequence[Any] = VERSION_COLUMNS,
+    skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+) -> List[Row]:
+    return await async_project_repository.get_rows(
+        db, async_project_repository.select_by_owner(owner_id), columns, skip=skip, limit=limit, cursor=cursor
+    )
+
+async def get_rows_by_client(
+    db: AsyncSession, *, client_id: int, columns: Sequence[Any] = VERSION_COLUMNS,
+    skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+) -> List[Row]:
+    return await async_project_repository.get_rows(
+        db, async_project_repository.select_by_client(client_id), columns, skip=skip, limit=limit, cursor=cursor
+    )
+
+async def search_rows_by_owner(
+    db: AsyncSession, *, owner_id: int, text: str, columns: Sequence[Any],
+    limit: int = 100, cursor: Optional[str] = None,
+) -> List[Row]:
+    return await async_project_repository.search_rows(
+        db, async_project_repository.select_by_owner(owner_id), columns, text=text, limit=limit, cursor=cursor
+    )
+
+async def search_rows_by_client(
+    db: AsyncSession, *, client_id: int, text: str, columns: Sequence[Any],
+    limit: int = 100, cursor: Optional[str] = None,
+) -> List[Row]:
+    return await async_project_repository.search_rows(
+        db, async_project_repository.select_by_client(client_id), columns, text=text, limit=limit, cursor=cursor
+    )
+
+def stream_rows_by_owner(
+    db: AsyncSession, *, owner_id: int, columns: Sequence[Any], yield_per: int = 1000
+) -> AsyncIterator[Sequence[Row]]:
+    return async_project_repository.stream_rows(
+        db, async_project_repository.select_by_owner(owner_id), columns, yield_per=yield_per
+    )
+
+def stream_rows_by_client(
+    db: AsyncSession, *, client_id: int, columns: Sequence[Any], yield_per: int = 1000
+) -> AsyncIterator[Sequence[Row]]:
+    return async_project_repository.stream_rows(
+        db, async_project_repository.select_by_client(client_id), columns, yield_per=yield_per
+    )
+
+async def create_with_owner(
+        db: AsyncSession, *, obj_in: ProjectCreate, owner_id: int
+) -> Project:
+    db_obj = Project(
+        name=obj_in.name,
+        description=obj_in.description,
+        owner_id=owner_id,
+        client_id=obj_in.client_id,
+    )
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    await response_cache.ainvalidate(*project_tags(db_obj.id, db_obj.owner_id, db_obj.client_id))
+
+    return db_obj
+
+async def update(
+        db: AsyncSession,
+        *,
+        db_obj: Project,
+        obj_in: Union[ProjectUpdate, Dict[str, Any]]
+) -> Project:
+    if isinstance(obj_in, dict):
+        update_data = obj_in
+    else: 
+        update_data = obj_in.model_dump(exclude_unset=True)
+
+    for field in update_data:
+        setattr(db_obj, field, update_data[field])
+
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    await response_cache.ainvalidate(*project_tags(db_obj.id, db_obj.owner_id, db_obj.client_id))
+
+    return db_obj
+
+async def remove(db: AsyncSession, *, id: int) -> Project:
+    obj = await async_project_repository.remove(db, id=id)
+    await response_cache.ainvalidate(*project_tags(obj.id, obj.owner_id, obj.client_id))
+
+    return obj
+
+async def adjust_file_stats(
+        db: AsyncSession, *, project_id: int, file_count: int, total_file_size: int
+) -> Optional[Row]:
+    result = await db.execute(
+        sql_update(Project)
+        .where(Project.id == project_id)
+        .values(
+            file_count=Project.file_count + file_count,
+            total_file_size=Project.total_file_size + total_file_size,
+        )
+        .returning(Project.id, Project.owner_id, Project.client_id)
+    )
+    return result.first()
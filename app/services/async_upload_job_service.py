@@ -0,0 +1,72 @@
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.schemas.file import FileCreate
+from app.core.response_cache import project_tags, response_cache
+from app.db.models.file import File
+from app.db.models.upload_job import UploadJob, UploadJobStatus
+from app.db.repositories.file_deletion_repository import async_file_deletion_repository
+from app.db.repositories.upload_job_repository import async_upload_job_repository
+from app.services import async_file_service
+
+async def get(db: AsyncSession, id: int) -> Optional[UploadJob]:
+    return await async_upload_job_repository.get(db, id)
+
+async def create(
+    db: AsyncSession, *, project_id: int, uploader_id: int,
+    original_filename: str, content_type: Optional[str], file_size: int,
+) -> UploadJob:
+    db_obj = UploadJob(
+        status=UploadJobStatus.QUEUED,
+        project_id=project_id,
+        uploader_id=uploader_id,
+        original_filename=original_filename,
+        content_type=content_type,
+        file_size=file_size,
+    )
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    return db_obj
+
+async def start(db: AsyncSession, *, id: int) -> None:
+    await async_upload_job_repository.set_status(db, id=id, status=UploadJobStatus.PROCESSING)
+    await db.commit()
+
+async def complete(db: AsyncSession, *, job: UploadJob, file_data: Dict[str, Any]) -> File:
+    """
+    Cria o arquivo processado e conclui o job na mesma transação
+    """
+    file_obj, project = await async_file_service.add(
+        db,
+        obj_in=FileCreate(filename=file_data["filename"], project_id=job.project_id),
+        file_data=file_data,
+        uploader_id=job.uploader_id,
+    )
+    await async_upload_job_repository.set_status(
+        db, id=job.id, status=UploadJobStatus.COMPLETED, file_id=file_obj.id
+    )
+    await db.commit()
+    if project:
+        await response_cache.ainvalidate(*project_tags(*project))
+    return file_obj
+
+async def fail(
+    db: AsyncSession, *, id: int, error: str, forwarded: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Marca o job como falho. `forwarded` é o arquivo já enviado ao processador
+    sem registro gravado: a remoção, pelo id devolvido pelo processador, entra
+    no outbox na mesma transação
+    """
+    if forwarded is not None and forwarded.get("id") is not None:
+        await async_file_deletion_repository.enqueue(
+            db, file_id=forwarded["id"], file_path=forwarded.get("file_path")
+        )
+    await async_upload_job_repository.set_status(db, id=id, status=UploadJobStatus.FAILED, error=error)
+    await db.commit()
+
+async def fail_unfinished(db: AsyncSession, *, ids: Sequence[int], error: str) -> None:
+    await async_upload_job_repository.fail_unfinished(db, ids=ids, error=error)
+    await db.commit()
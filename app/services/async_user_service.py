@@ -0,0 +1,96 @@
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.hashing import bulk_password_hasher, password_hasher
+from app.core.response_cache import CLIENTS_TAG, response_cache
+from app.db.models.user import User, UserRole
+from app.db.repositories.user_repository import async_user_repository
+from app.api.v1.schemas.user import UserCreate
+
+async def get(db: AsyncSession, id: int) -> Optional[User]:
+    return await async_user_repository.get(db, id)
+
+async def get_by_email(db: AsyncSession, *, email: str) -> Optional[User]:
+    return await async_user_repository.get_by_email(db, email=email)
+
+async def get_multi(
+    db: AsyncSession, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[User]:
+    return await async_user_repository.get_multi(db, skip=skip, limit=limit, cursor=cursor)
+
+async def get_multi_by_role(
+    db: AsyncSession, *, role: UserRole, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[User]:
+    return await async_user_repository.get_by_role(db, role=role, skip=skip, limit=limit, cursor=cursor)
+
+async def get_rows_by_role(
+    db: AsyncSession, *, role: UserRole, columns: Sequence[Any],
+    skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+) -> List[Row]:
+    return await async_user_repository.get_rows(
+        db, async_user_repository.select_by_role(role), columns, skip=skip, limit=limit, cursor=cursor
+    )
+
+async def create(db: AsyncSession, *, obj_in: UserCreate) -> User:
+    db_obj = User(
+        email=obj_in.email,
+        hashed_password=await password_hasher.hash(obj_in.password),
+        full_name=obj_in.full_name,
+        role=obj_in.role,
+        is_active=obj_in.is_active,
+    )
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    await response_cache.ainvalidate(CLIENTS_TAG)
+
+    return db_obj
+
+async def get_existing_emails(db: AsyncSession, *, emails: Sequence[str]) -> Set[str]:
+    return await async_user_repository.get_existing_emails(db, emails=emails)
+
+async def create_multi(db: AsyncSession, *, objs_in: List[UserCreate]) -> Dict[str, int]:
+    """
+    Cria vários usuários em uma única transação: senhas no pool de processos
+    da importação e um único INSERT multi-linhas. Retorna {email: id} dos
+    criados; emails que já existiam no momento do insert ficam de fora.
+    """
+    if not objs_in:
+        return {}
+
+    hashed_passwords = await bulk_password_hasher.hash_many([obj_in.password for obj_in in objs_in])
+    rows = await async_user_repository.insert_many(
+        db,
+        values=[
+            {
+                "email": obj_in.email,
+                "hashed_password": hashed_password,
+                "full_name": obj_in.full_name,
+                "role": obj_in.role or UserRole.CLIENT,
+                "is_active": obj_in.is_active,
+            }
+            for obj_in, hashed_password in zip(objs_in, hashed_passwords)
+        ],
+    )
+    await db.commit()
+    if rows:
+        await response_cache.ainvalidate(CLIENTS_TAG)
+
+    return {email: id for id, email in rows}
+
+async def authenticate(db: AsyncSession, *, email: str, password: str) -> Optional[User]:
+    user = await get_by_email(db, email=email)
+    if not user:
+        return None
+    if not await password_hasher.verify(password, user.hashed_password):
+        return None
+
+    # Atualiza o hash quando o custo/esquema configurado mudou
+    if password_hasher.needs_update(user.hashed_password):
+        user.hashed_password = await password_hasher.hash(password)
+        db.add(user)
+        await db.commit()
+
+    return user
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from fastapi import Request
+
+from app.config import Settings, settings
+from app.core.metrics import FILE_DELETION_QUEUE, FILE_DELETIONS
+from app.db.database import AsyncSessionLocal
+from app.db.models.file_deletion import FileDeletion
+from app.db.repositories.file_deletion_repository import async_file_deletion_repository
+from app.services.file_processor import FileProcessorClient
+
+logger = logging.getLogger(__name__)
+
+_PENDING = FILE_DELETION_QUEUE.labels("pending")
+_FAILED = FILE_DELETION_QUEUE.labels("failed")
+_DELETED = FILE_DELETIONS.labels("deleted")
+_RETRIED = FILE_DELETIONS.labels("retried")
+_GAVE_UP = FILE_DELETIONS.labels("gave_up")
+
+
+class FileDeletionWorker:
+    """
+    Consome o outbox de remoções (file_deletions) em segundo plano.
+
+    A cada ciclo reserva um lote de remoções vencidas, chama o processador
+    com até `concurrency` remoções simultâneas e, em uma transação curta,
+    apaga as concluídas (404 conta como concluída) e reagenda as com erro
+    com backoff exponencial. Após `max_attempts` a remoção fica no outbox
+    com `next_attempt_at` nulo. Vários processos podem rodar o worker: a
+    reserva usa SKIP LOCKED e um lease.
+    """
+
+    def __init__(
+        self,
+        file_processor: FileProcessorClient,
+        *,
+        batch_size: int,
+        concurrency: int,
+        poll_interval: float,
+        lease: float,
+        retry_base: float,
+        retry_max: float,
+        max_attempts: int,
+        session_factory: Any = AsyncSessionLocal,
+    ) -> None:
+        self.file_processor = file_processor
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease = timedelta(seconds=lease)
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.max_attempts = max_attempts
+        self.session_factory = session_factory
+        self._wakeup = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.deleted = 0
+        self.retried = 0
+        self.gave_up = 0
+
+    @classmethod
+    def from_settings(
+        cls, file_processor: FileProcessorClient, config: Settings = settings
+    ) -> "FileDeletionWorker":
+        return cls(
+            file_processor,
+            batch_size=config.FILE_DELETION_BATCH_SIZE,
+            concurrency=config.FILE_DELETION_CONCURRENCY,
+            poll_interval=config.FILE_DELETION_POLL_INTERVAL,
+            lease=config.FILE_DELETION_LEASE_SECONDS,
+            retry_base=config.FILE_DELETION_RETRY_BASE_SECONDS,
+            retry_max=config.FILE_DELETION_RETRY_MAX_SECONDS,
+            max_attempts=config.FILE_DELETION_MAX_ATTEMPTS,
+        )
+
+    def start(self) -> None:
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._stopping = False
+            self._task = asyncio.create_task(self._run(), name="file-deletion-worker")
+
+    async def stop(self) -> None:
+        """
+        Encerra o worker depois do ciclo em andamento. Cancelar no meio do
+        lote deixaria as remoções reservadas presas até o lease expirar
+        """
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+
+    def notify(self) -> None:
+        """
+        Acorda o worker depois do commit de uma remoção, sem esperar o intervalo;
+        pode ser chamado de endpoints síncronos, na threadpool
+        """
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                claimed = await self.drain_once()
+            except Exception:
+                logger.exception("Falha ao processar o outbox de remoções de arquivos")
+                claimed = 0
+            if claimed >= self.batch_size or self._stopping:
+                # Lote cheio: provavelmente há mais remoções vencidas
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def retry_delay(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.retry_base * 2 ** (attempts - 1), self.retry_max))
+
+    async def _delete(self, semaphore: asyncio.Semaphore, deletion: FileDeletion) -> Optional[str]:
+        """
+        Remove o arquivo no processador; retorna a mensagem de erro, se houver
+        """
+        async with semaphore:
+            try:
+                response = await self.file_processor.delete(deletion.file_id)
+            except httpx.RequestError as exc:
+                return f"{type(exc).__name__}: {exc}"
+        if response.status_code < 400 or response.status_code == 404:
+            return None
+        return f"HTTP {response.status_code}: {response.text[:500]}"
+
+    async def drain_once(self) -> int:
+        """
+        Processa um lote; retorna quantas remoções foram reservadas
+        """
+        async with self.session_factory() as db:
+            deletions = await async_file_deletion_repository.claim_due(
+                db, limit=self.batch_size, lease=self.lease
+            )
+            await db.commit()
+
+            if deletions:
+                semaphore = asyncio.Semaphore(self.concurrency)
+                errors = await asyncio.gather(*(self._delete(semaphore, item) for item in deletions))
+                await self._record(db, list(zip(deletions, errors)))
+
+            await self.refresh_queue_metrics(db)
+        return len(deletions)
+
+    async def _record(self, db: Any, results: List[Tuple[FileDeletion, Optional[str]]]) -> None:
+        done = [deletion.id for deletion, error in results if error is None]
+        await async_file_deletion_repository.delete_many(db, ids=done)
+        self.deleted += len(done)
+        _DELETED.inc(len(done))
+
+        for deletion, error in results:
+            if error is None:
+                continue
+            attempts = deletion.attempts + 1
+            retry_in = self.retry_delay(attempts) if attempts < self.max_attempts else None
+            await async_file_deletion_repository.reschedule(
+                db, id=deletion.id, attempts=attempts, retry_in=retry_in, error=error
+            )
+            if retry_in is None:
+                self.gave_up += 1
+                _GAVE_UP.inc()
+                logger.error(
+                    "Remoção do arquivo %s no processador abandonada após %d tentativas: %s",
+                    deletion.file_id, attempts, error,
+                )
+            else:
+                self.retried += 1
+                _RETRIED.inc()
+        await db.commit()
+
+    async def refresh_queue_metrics(self, db: Any) -> Dict[str, Any]:
+        stats = await async_file_deletion_repository.get_stats(db)
+        _PENDING.set(stats["pending"])
+        _FAILED.set(stats["failed"])
+        return stats
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "batch_size": self.batch_size,
+            "concurrency": self.concurrency,
+            "deleted": self.deleted,
+            "retried": self.retried,
+            "gave_up": self.gave_up,
+        }
+
+
+def get_file_deletion_worker(request: Request) -> FileDeletionWorker:
+    """
+    Dependência que retorna o worker criado no lifespan da aplicação
+    """
+    return request.app.state.file_deletion_worker
@@ -0,0 +1,160 @@
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from fastapi import HTTPException, Request, UploadFile
+
+from app.config import Settings, settings
+from app.core.exceptions import PayloadTooLargeError
+from app.core.metrics import FILE_PROCESSOR_DURATION, FILE_PROCESSOR_ERRORS, UPLOAD_BYTES
+from app.core.profiling import add_file_processor_time
+from app.utils.streaming import MultipartUploadStream
+
+
+class _OperationMetrics:
+    """
+    Filhos das métricas de uma operação, criados uma única vez
+    """
+
+    def __init__(self, operation: str) -> None:
+        self.duration = FILE_PROCESSOR_DURATION.labels(operation)
+        self.errors = FILE_PROCESSOR_ERRORS.labels(operation)
+
+    async def observe(self, call) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await call
+        except httpx.RequestError:
+            self.errors.inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.duration.observe(elapsed)
+            add_file_processor_time(elapsed)
+        if response.status_code >= 400:
+            self.errors.inc()
+        return response
+
+
+_UPLOAD_METRICS = _OperationMetrics("upload")
+_DELETE_METRICS = _OperationMetrics("delete")
+
+
+class FileProcessorClient:
+    """
+    Cliente HTTP compartilhado para a API de processamento de arquivos.
+
+    Mantém um pool de conexões keep-alive durante todo o ciclo de vida da
+    aplicação, evitando o custo de abrir e fechar conexões TCP a cada chamada.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        limits: httpx.Limits,
+        timeout: httpx.Timeout,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            limits=limits,
+            timeout=timeout,
+            transport=transport,
+        )
+
+    @classmethod
+    def from_settings(
+        cls, config: Settings = settings, transport: Optional[httpx.AsyncBaseTransport] = None
+    ) -> "FileProcessorClient":
+        """
+        Cria o cliente a partir das configurações da aplicação
+        """
+        return cls(
+            config.FILE_PROCESSOR_URL,
+            limits=httpx.Limits(
+                max_connections=config.FILE_PROCESSOR_MAX_CONNECTIONS,
+                max_keepalive_connections=config.FILE_PROCESSOR_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=config.FILE_PROCESSOR_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                connect=config.FILE_PROCESSOR_CONNECT_TIMEOUT,
+                read=config.FILE_PROCESSOR_READ_TIMEOUT,
+                write=config.FILE_PROCESSOR_WRITE_TIMEOUT,
+                pool=config.FILE_PROCESSOR_POOL_TIMEOUT,
+            ),
+            transport=transport,
+        )
+
+    async def upload(self, upload_stream: MultipartUploadStream) -> httpx.Response:
+        """
+        Envia um arquivo em streaming para o processador
+        """
+        try:
+            return await _UPLOAD_METRICS.observe(self._client.post(
+                "/api/files/upload",
+                content=upload_stream,
+                headers={"Content-Type": upload_stream.content_type},
+            ))
+        finally:
+            UPLOAD_BYTES.inc(upload_stream.bytes_read)
+
+    async def delete(self, file_id: int) -> httpx.Response:
+        """
+        Remove um arquivo do processador
+        """
+        return await _DELETE_METRICS.observe(self._client.delete(f"/api/files/{file_id}"))
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+async def forward_upload(
+    file_processor: FileProcessorClient, file: UploadFile, *, project_id: int, uploader_id: int
+) -> Dict[str, Any]:
+    """
+    Envia um arquivo em streaming ao processador e retorna os dados processados.
+
+    Levanta PayloadTooLargeError, httpx.RequestError ou HTTPException (resposta
+    diferente de 200 do processador).
+    """
+    # Rejeitar de imediato quando o tamanho declarado já excede o limite
+    if file.size is not None and file.size > settings.MAX_UPLOAD_SIZE:
+        raise PayloadTooLargeError(
+            detail=f"O arquivo excede o tamanho máximo de {settings.MAX_UPLOAD_SIZE} bytes"
+        )
+
+    # Preparar dados para o upload do arquivo; file_size é calculado durante o envio
+    file_data = {
+        "filename": file.filename,
+        "content_type": file.content_type,
+        "project_id": project_id,
+        "uploader_id": uploader_id,
+    }
+    upload_stream = MultipartUploadStream(
+        file,
+        metadata=file_data,
+        chunk_size=settings.UPLOAD_CHUNK_SIZE,
+        max_size=settings.MAX_UPLOAD_SIZE,
+    )
+
+    response = await file_processor.upload(upload_stream)
+    if response.status_code != 200:
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=f"Erro ao processar o arquivo: {response.text}",
+        )
+
+    # Obter a resposta do processador de arquivos
+    processed_data = response.json()
+    processed_data.setdefault("original_filename", file.filename)
+    processed_data.setdefault("content_type", file.content_type)
+    processed_data.setdefault("file_size", upload_stream.bytes_read)
+    return processed_data
+
+
+def get_file_processor(request: Request) -> FileProcessorClient:
+    """
+    Dependência que retorna o cliente criado no lifespan da aplicação
+    """
+    return request.app.state.file_processor
@@ -1,41 +1,64 @@
-import json 
+import logging
 from typing import List, Optional, Dict, Any, Union 
 
 from sqlalchemy.orm import Session
+from app.core.response_cache import project_tags, response_cache
+from app.db.pagination import paginate
 from app.db.models.file import File 
+from app.db.models.project import Project
+from app.db.repositories.file_deletion_repository import file_deletion_repository
 from app.api.v1.schemas.file import FileCreate, FileUpdate
+from app.services import project_service
+
+logger = logging.getLogger(__name__)
 
 def get(db: Session, id: int) -> Optional[File]:
     return db.query(File).filter(File.id == id).first()
 
 def get_multi(
-        db: Session, *, skip: int = 0, limit: int = 100
+        db: Session, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
 ) -> List[File]:
-    return db.query(File).offset(skip).limit(limit).all()
+    return paginate(db.query(File), File, skip=skip, limit=limit, cursor=cursor).all()
 
 def get_multi_by_project(
-        db: Session, *, project_id: int, skip: int = 0, limit: int = 100
+        db: Session, *, project_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
 ) -> List[File]:
-    return(
+    query = (
         db.query(File)
         .filter(File.project_id == project_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
     )
+    return paginate(query, File, skip=skip, limit=limit, cursor=cursor).all()
 
 def get_multi_by_uploader(
-    db: Session, *, uploader_id: int, skip: int = 0, limit: int = 100
+    db: Session, *, uploader_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
 ) -> List[File]:
-    return(
+    query = (
         db.query(File)
         .filter(File.uploader_id == uploader_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
     )
+    return paginate(query, File, skip=skip, limit=limit, cursor=cursor).all()
 
 def get_multi_by_owner_projects(
+    db: Session, *, owner_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[File]:
+    query = (
+        db.query(File)
+        .join(Project, File.project_id == Project.id)
+        .filter(Project.owner_id == owner_id)
+    )
+    return paginate(query, File, skip=skip, limit=limit, cursor=cursor).all()
+
+def get_multi_by_client_projects(
+    db: Session, *, client_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[File]:
+    query = (
+        db.query(File)
+        .join(Project, File.project_id == Project.id)
+        .filter(Project.client_id == client_id)
+    )
+    return paginate(query, File, skip=skip, limit=limit, cursor=cursor).all()
+
+def create(
     db: Session, *, obj_in: FileCreate, file_data: Dict[str, Any], uploader_id: int
 ) -> File:
     db_obj = File(
@@ -45,13 +68,19 @@ def get_multi_by_owner_projects(
         file_type=file_data.get("file_type"),
         file_size=file_data.get("file_size"),
         content_type=file_data.get("content_type"),
-        metadata=json.dumps(file_data.get("metadata", {})),
+        processor_file_id=file_data.get("id"),
+        metadata_=file_data.get("metadata", {}),
         uploader_id=uploader_id,
         project_id=obj_in.project_id,
     )
     db.add(db_obj)
+    project = project_service.adjust_file_stats(
+        db, project_id=obj_in.project_id, file_count=1, total_file_size=db_obj.file_size or 0
+    )
     db.commit()
     db.refresh(db_obj)
+    if project:
+        response_cache.invalidate(*project_tags(*project))
 
     return db_obj
 
@@ -64,12 +93,12 @@ def update(
     if isinstance(obj_in, dict):
         update_data = obj_in
     else:
-        update_data = obj_in.dict(exclude_unset=True)
+        update_data = obj_in.model_dump(exclude_unset=True)
+    if "metadata" in update_data:
+        # Campo "metadata" da API, atributo metadata_ no modelo
+        update_data = dict(update_data)
+        update_data["metadata_"] = update_data.pop("metadata")
     
-    # Handle metadata as JSON
-    if "metadata" in update_data and update_data["metadata"]:
-        update_data["metadata"] = json.dumps(update_data["metadata"])
-
     for field in update_data:
         if field in update_data:
             setattr(db_obj, field, update_data[field])
@@ -77,13 +106,30 @@ def update(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    project = project_service.get(db, db_obj.project_id)
+    if project:
+        response_cache.invalidate(*project_tags(project.id, project.owner_id, project.client_id))
     
     return db_obj
 
 def remove(db: Session, *, id: int) -> File:
+    """
+    Remove o arquivo e registra a remoção no processador no outbox, na mesma
+    transação; o FileDeletionWorker faz a chamada depois do commit
+    """
     obj = db.query(File).get(id)
     db.delete(obj)
+    if obj.processor_file_id is not None:
+        file_deletion_repository.enqueue(db, file_id=obj.processor_file_id, file_path=obj.file_path)
+    else:
+        # Sem o id do processador não há como remover o arquivo lá com segurança
+        logger.warning("Arquivo %s removido sem id no processador; %s fica no processador", obj.id, obj.file_path)
+    project = project_service.adjust_file_stats(
+        db, project_id=obj.project_id, file_count=-1, total_file_size=-(obj.file_size or 0)
+    )
     db.commit()
+    if project:
+        response_cache.invalidate(*project_tags(*project))
     
     return obj
         
\ No newline at end of file
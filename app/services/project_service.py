@@ -1,39 +1,45 @@
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Sequence, Union
 
+from sqlalchemy import Row, delete as sql_delete, update as sql_update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.interfaces import ORMOption
 
+from app.core.response_cache import project_tags, response_cache
+from app.db.pagination import paginate
+from app.db.models.file import File
 from app.db.models.project import Project
+from app.db.repositories.file_deletion_repository import file_deletion_repository
+from app.db.repositories.project_repository import detail_options
 from app.api.v1.schemas.project import ProjectCreate, ProjectUpdate
 
-def get(db: Session, id: int) -> Optional[Project]:
-    return db.query(Project).filter(Project.id == id).first()
+def get(db: Session, id: int, *, options: Sequence[ORMOption] = ()) -> Optional[Project]:
+    return db.query(Project).options(*options).filter(Project.id == id).first()
+
+def get_detail(db: Session, id: int, *, strategy: str = "joined") -> Optional[Project]:
+    return get(db, id, options=detail_options(strategy))
 
 def get_multi(
-    db: Session, *, skip: int = 0, limit: int = 100
+    db: Session, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
 ) -> List[Project]:
-    return db.query(Project).offset(skip).limit(limit).all()
+    return paginate(db.query(Project), Project, skip=skip, limit=limit, cursor=cursor).all()
 
 def get_multi_by_owner(
-    db: Session, *, owner_id: int, skip: int = 0, limit: int = 100    
+    db: Session, *, owner_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None    
 ) -> List[Project]:
-    return (
+    query = (
         db.query(Project)
         .filter(Project.owner_id == owner_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
     )
+    return paginate(query, Project, skip=skip, limit=limit, cursor=cursor).all()
 
 def get_multi_by_client(
-        db: Session, *, client_id: int, skip: int = 0, limit: int = 100
+        db: Session, *, client_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
 ) -> List[Project]:
-    return (
+    query = (
         db.query(Project)
         .filter(Project.client_id == client_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
     )
+    return paginate(query, Project, skip=skip, limit=limit, cursor=cursor).all()
 
 def create(db: Session, *, obj_in: ProjectCreate) -> Project:
     db_obj = Project(
@@ -59,6 +65,7 @@ def create_with_owner(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    response_cache.invalidate(*project_tags(db_obj.id, db_obj.owner_id, db_obj.client_id))
 
     return db_obj
 
@@ -71,7 +78,7 @@ def update(
     if isinstance(obj_in, dict):
         update_data = obj_in
     else: 
-        update_data = obj_in.dict(exclude_unset=True)
+        update_data = obj_in.model_dump(exclude_unset=True)
 
     for field in update_data:
         if field in update_data:
@@ -80,13 +87,44 @@ def update(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    response_cache.invalidate(*project_tags(db_obj.id, db_obj.owner_id, db_obj.client_id))
 
     return db_obj
 
 def remove(db: Session, *, id: int) -> Project:
+    """
+    Remove o projeto e seus arquivos, registrando no outbox a remoção de cada
+    arquivo no processador, na mesma transação
+    """
     obj = db.query(Project).get(id)
+    tags = project_tags(obj.id, obj.owner_id, obj.client_id)
+    files = db.execute(
+        sql_delete(File).where(File.project_id == id).returning(File.processor_file_id, File.file_path)
+    ).all()
+    for processor_file_id, file_path in files:
+        # Arquivos sem o id do processador ficam lá (ver file_service.remove)
+        if processor_file_id is not None:
+            file_deletion_repository.enqueue(db, file_id=processor_file_id, file_path=file_path)
     db.delete(obj)
     db.commit()
+    response_cache.invalidate(*tags)
 
     return obj
 
+def adjust_file_stats(
+        db: Session, *, project_id: int, file_count: int, total_file_size: int
+) -> Optional[Row]:
+    """
+    Incrementa atomicamente os contadores de arquivos do projeto, sem commit,
+    para participar da mesma transação que cria/remove o arquivo.
+    Retorna (id, owner_id, client_id) do projeto para invalidar o cache de respostas.
+    """
+    return db.execute(
+        sql_update(Project)
+        .where(Project.id == project_id)
+        .values(
+            file_count=Project.file_count + file_count,
+            total_file_size=Project.total_file_size + total_file_size,
+        )
+        .returning(Project.id, Project.owner_id, Project.client_id)
+    ).first()
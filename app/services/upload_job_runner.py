@@ -0,0 +1,308 @@
+import asyncio
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from anyio import to_thread
+from fastapi import HTTPException, Request, UploadFile
+from starlette.datastructures import Headers
+
+from app.config import Settings, settings
+from app.core.exceptions import PayloadTooLargeError, ServiceOverloadedError
+from app.core.metrics import UPLOAD_JOB_QUEUE, UPLOAD_JOBS, UPLOAD_STAGING_BYTES
+from app.db.database import AsyncSessionLocal
+from app.db.models.upload_job import UploadJob
+from app.services import async_upload_job_service
+from app.services.file_deletion_worker import FileDeletionWorker
+from app.services.file_processor import FileProcessorClient, forward_upload
+
+logger = logging.getLogger(__name__)
+
+_QUEUED = UPLOAD_JOB_QUEUE.labels("queued")
+_PROCESSING = UPLOAD_JOB_QUEUE.labels("processing")
+_COMPLETED = UPLOAD_JOBS.labels("completed")
+_FAILED = UPLOAD_JOBS.labels("failed")
+
+
+@dataclass
+class StagedUpload:
+    """
+    Arquivo recebido e gravado no diretório de staging
+    """
+    path: str
+    size: int
+    filename: str
+    content_type: Optional[str]
+
+
+class UploadJobRunner:
+    """
+    Executa os uploads assíncronos em um pool de workers.
+
+    `stage` copia o arquivo recebido em blocos para o diretório de staging,
+    limitado pelo número de jobs pendentes e pelo total de bytes em disco;
+    `submit` registra o job (upload_jobs) e o coloca na fila. Cada worker
+    envia o arquivo ao processador, cria o registro do arquivo e remove a
+    cópia local. Se o registro falhar depois do envio, a remoção do arquivo
+    no processador entra no outbox junto com a falha do job. Jobs não
+    concluídos ao parar o runner ficam como falhos.
+    """
+
+    def __init__(
+        self,
+        file_processor: FileProcessorClient,
+        *,
+        workers: int,
+        staging_dir: str,
+        max_pending: int,
+        max_staged_bytes: int,
+        chunk_size: int,
+        max_size: int,
+        session_factory: Any = AsyncSessionLocal,
+        deletion_worker: Optional[FileDeletionWorker] = None,
+    ) -> None:
+        self.file_processor = file_processor
+        self.workers = workers
+        self.staging_dir = staging_dir
+        self.max_pending = max_pending
+        self.max_staged_bytes = max_staged_bytes
+        self.chunk_size = chunk_size
+        self.max_size = max_size
+        self.session_factory = session_factory
+        self.deletion_worker = deletion_worker
+        self._queue: "asyncio.Queue[Tuple[int, StagedUpload]]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        # Jobs aceitos e ainda não concluídos, com o arquivo em staging
+        self._active: Dict[int, StagedUpload] = {}
+        self._pending = 0
+        self._processing = 0
+        self._staged_bytes = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_settings(
+        cls,
+        file_processor: FileProcessorClient,
+        config: Settings = settings,
+        *,
+        deletion_worker: Optional[FileDeletionWorker] = None,
+    ) -> "UploadJobRunner":
+        return cls(
+            file_processor,
+            workers=config.UPLOAD_JOB_WORKERS,
+            staging_dir=config.UPLOAD_STAGING_DIR,
+            max_pending=config.UPLOAD_JOB_MAX_PENDING,
+            max_staged_bytes=config.UPLOAD_STAGING_MAX_BYTES,
+            chunk_size=config.UPLOAD_CHUNK_SIZE,
+            max_size=config.MAX_UPLOAD_SIZE,
+            deletion_worker=deletion_worker,
+        )
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        os.makedirs(self.staging_dir, exist_ok=True)
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"upload-job-worker-{index}")
+            for index in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        unfinished = list(self._active)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        while not self._queue.empty():
+            job_id, staged = self._queue.get_nowait()
+            self._finish(job_id, staged)
+        if unfinished:
+            try:
+                async with self.session_factory() as db:
+                    await async_upload_job_service.fail_unfinished(
+                        db, ids=unfinished, error="Upload interrompido pelo encerramento do servidor"
+                    )
+            except Exception:
+                logger.exception("Falha ao marcar uploads assíncronos interrompidos")
+
+    async def join(self) -> None:
+        """
+        Aguarda a fila esvaziar e os jobs em andamento terminarem
+        """
+        await self._queue.join()
+
+    async def stage(self, file: UploadFile) -> StagedUpload:
+        """
+        Grava o arquivo recebido no diretório de staging.
+
+        Levanta ServiceOverloadedError quando os limites de jobs pendentes
+        ou de bytes em staging seriam excedidos e PayloadTooLargeError
+        quando o arquivo excede MAX_UPLOAD_SIZE.
+        """
+        if file.size is not None and file.size > self.max_size:
+            raise PayloadTooLargeError(
+                detail=f"O arquivo excede o tamanho máximo de {self.max_size} bytes"
+            )
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise ServiceOverloadedError(detail="Muitos uploads assíncronos pendentes; tente novamente")
+
+        staged = StagedUpload(
+            path=os.path.join(self.staging_dir, uuid.uuid4().hex),
+            size=0,
+            filename=file.filename or "",
+            content_type=file.content_type,
+        )
+        self._pending += 1
+        self._refresh_metrics()
+        try:
+            output = await to_thread.run_sync(open, staged.path, "wb")
+            try:
+                while chunk := await file.read(self.chunk_size):
+                    if staged.size + len(chunk) > self.max_size:
+                        raise PayloadTooLargeError(
+                            detail=f"O arquivo excede o tamanho máximo de {self.max_size} bytes"
+                        )
+                    if self._staged_bytes + len(chunk) > self.max_staged_bytes:
+                        self.rejected += 1
+                        raise ServiceOverloadedError(
+                            detail="Espaço para uploads assíncronos esgotado; tente novamente"
+                        )
+                    # Reservar antes de gravar: uploads simultâneos dividem o limite
+                    staged.size += len(chunk)
+                    self._staged_bytes += len(chunk)
+                    UPLOAD_STAGING_BYTES.set(self._staged_bytes)
+                    await to_thread.run_sync(output.write, chunk)
+            finally:
+                await to_thread.run_sync(output.close)
+        except BaseException:
+            self._release(staged)
+            raise
+        return staged
+
+    async def submit(self, staged: StagedUpload, *, project_id: int, uploader_id: int) -> UploadJob:
+        """
+        Registra o job de um arquivo em staging e o coloca na fila
+        """
+        try:
+            async with self.session_factory() as db:
+                job = await async_upload_job_service.create(
+                    db,
+                    project_id=project_id,
+                    uploader_id=uploader_id,
+                    original_filename=staged.filename,
+                    content_type=staged.content_type,
+                    file_size=staged.size,
+                )
+        except BaseException:
+            self._release(staged)
+            raise
+        self._active[job.id] = staged
+        self._queue.put_nowait((job.id, staged))
+        return job
+
+    async def _work(self) -> None:
+        while True:
+            job_id, staged = await self._queue.get()
+            self._processing += 1
+            self._refresh_metrics()
+            try:
+                await self._process(job_id, staged)
+            except Exception:
+                # Ex.: banco indisponível ao registrar a falha; o worker segue com a fila
+                logger.exception("Falha ao registrar o resultado do upload assíncrono %s", job_id)
+            finally:
+                self._processing -= 1
+                self._finish(job_id, staged)
+                self._queue.task_done()
+
+    async def _process(self, job_id: int, staged: StagedUpload) -> None:
+        async with self.session_factory() as db:
+            processed: Optional[Dict[str, Any]] = None
+            try:
+                job = await async_upload_job_service.get(db, id=job_id)
+                if job is None:
+                    # Projeto ou usuário removido enquanto o job aguardava
+                    return
+                await async_upload_job_service.start(db, id=job_id)
+
+                error = None
+                with open(staged.path, "rb") as data:
+                    upload = UploadFile(
+                        data,
+                        size=staged.size,
+                        filename=job.original_filename,
+                        headers=Headers({"content-type": job.content_type}) if job.content_type else None,
+                    )
+                    try:
+                        processed = await forward_upload(
+                            self.file_processor, upload, project_id=job.project_id, uploader_id=job.uploader_id
+                        )
+                    except (PayloadTooLargeError, HTTPException) as exc:
+                        error = str(exc.detail)
+                    except httpx.RequestError as exc:
+                        error = f"Erro na comunicação com o processador de arquivos: {str(exc)}"
+
+                if error is None:
+                    await async_upload_job_service.complete(db, job=job, file_data=processed)
+                    self.completed += 1
+                    _COMPLETED.inc()
+                    return
+            except Exception:
+                logger.exception("Falha inesperada no upload assíncrono %s", job_id)
+                await db.rollback()
+                error = "Erro inesperado ao processar o upload"
+
+            await async_upload_job_service.fail(db, id=job_id, error=error, forwarded=processed)
+            if processed is not None and self.deletion_worker is not None:
+                self.deletion_worker.notify()
+            self.failed += 1
+            _FAILED.inc()
+
+    def _finish(self, job_id: int, staged: StagedUpload) -> None:
+        self._active.pop(job_id, None)
+        self._release(staged)
+
+    def _release(self, staged: StagedUpload) -> None:
+        """
+        Remove o arquivo em staging e devolve a vaga e os bytes reservados
+        """
+        try:
+            os.remove(staged.path)
+        except FileNotFoundError:
+            pass
+        self._pending -= 1
+        self._staged_bytes -= staged.size
+        self._refresh_metrics()
+
+    def _refresh_metrics(self) -> None:
+        _QUEUED.set(self._pending - self._processing)
+        _PROCESSING.set(self._processing)
+        UPLOAD_STAGING_BYTES.set(self._staged_bytes)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": any(not task.done() for task in self._tasks),
+            "workers": self.workers,
+            "pending": self._pending,
+            "processing": self._processing,
+            "max_pending": self.max_pending,
+            "staged_bytes": self._staged_bytes,
+            "max_staged_bytes": self.max_staged_bytes,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+
+def get_upload_job_runner(request: Request) -> UploadJobRunner:
+    """
+    Dependência que retorna o runner criado no lifespan da aplicação
+    """
+    return request.app.state.upload_job_runner
@@ -1,14 +1,21 @@
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 from sqlalchemy.orm import Session
 
-from app.core.security import get_password_hash, verify_password
+from app.core.response_cache import CLIENTS_TAG, response_cache
+from app.core.security import get_password_hash, user_principal_cache, verify_password
 from app.db.models.user import User
+from app.db.pagination import paginate
 from app.api.v1.schemas.user import UserCreate, UserUpdate
 
 def get(db: Session, id: int) -> Optional[User]:
     return db.query(User).filter(User.id == id).first()
 
+def get_multi(
+        db: Session, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[User]:
+    return paginate(db.query(User), User, skip=skip, limit=limit, cursor=cursor).all()
+
 def get_by_email(db: Session, *, email:str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
@@ -23,6 +30,7 @@ def create(db: Session, *, obj_in: UserCreate) -> User:
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    response_cache.invalidate(CLIENTS_TAG)
     
     return db_obj
 
@@ -32,7 +40,7 @@ def update(
     if isinstance(obj_in, dict):
         update_data = obj_in
     else: 
-        update_data = obj_in.dict(exclude_unset=True)
+        update_data = obj_in.model_dump(exclude_unset=True)
 
     if update_data.get("password"):
         hashed_password = get_password_hash(update_data["password"])
@@ -46,9 +54,20 @@ def update(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    user_principal_cache.invalidate(db_obj.id)
+    response_cache.invalidate(CLIENTS_TAG)
 
     return db_obj
 
+def remove(db: Session, *, id: int) -> Optional[User]:
+    obj = db.query(User).get(id)
+    db.delete(obj)
+    db.commit()
+    user_principal_cache.invalidate(id)
+    response_cache.invalidate(CLIENTS_TAG)
+
+    return obj
+
 def authentication(db: Session, *, email: str, password: str) -> Optional[User]:
     user = get_by_email(db, email=email)
     if not user: 
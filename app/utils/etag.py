@@ -0,0 +1,58 @@
+import hashlib
+from typing import Any, Sequence
+
+from fastapi import Request, Response
+
+ETAG_HEADER = "ETag"
+
+# As respostas dependem do usuário autenticado: caches compartilhados não devem
+# guardá-las e o cliente deve revalidar (If-None-Match) antes de reutilizar
+CACHE_CONTROL = "private, no-cache"
+
+
+def compute_etag(*parts: Any) -> str:
+    """
+    Gera um ETag forte a partir das versões do recurso (id, updated_at, ...)
+    """
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def page_etag(kind: str, rows: Sequence[Any]) -> str:
+    """
+    ETag de uma página de listagem a partir das colunas id e updated_at das
+    próprias linhas retornadas, no mesmo snapshot do corpo
+    """
+    return compute_etag(kind, [(row.id, row.updated_at) for row in rows])
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Indica se o If-None-Match da requisição corresponde ao ETag atual.
+
+    Segue a comparação fraca exigida para If-None-Match (RFC 9110), ou seja,
+    `W/"x"` corresponde a `"x"`.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """
+    Publica o ETag e a política de cache na resposta
+    """
+    response.headers[ETAG_HEADER] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Resposta 304 sem corpo para o ETag informado
+    """
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
@@ -0,0 +1,63 @@
+from typing import Any, AsyncIterator, Callable, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import AsyncSessionLocal
+from app.utils.serialization import RowListSerializer
+
+# Formatos aceitos pelos endpoints de exportação
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+EXPORT_FORMAT_PATTERN = "^(ndjson|csv)$"
+
+
+# Recebe a sessão aberta pelo streaming e devolve as partições do cursor
+PartitionStream = Callable[..., AsyncIterator[Sequence[Row]]]
+
+
+async def _export_chunks(
+    stream: PartitionStream,
+    serializer: RowListSerializer,
+    export_format: str,
+    session_factory: Callable[[], Any],
+) -> AsyncIterator[bytes]:
+    if export_format == "csv":
+        yield serializer.csv_header()
+    # A sessão é do próprio streaming: a da dependência get_async_db pode já
+    # ter sido fechada quando o corpo começa a ser enviado
+    db: AsyncSession
+    async with session_factory() as db:
+        async for rows in stream(db=db):
+            # Um bloco por partição do cursor: o próximo FETCH só acontece depois que
+            # o servidor ASGI aceitou o anterior, então um cliente lento não acumula
+            # memória aqui, apenas segura o cursor
+            if export_format == "csv":
+                yield serializer.dump_csv(rows)
+            else:
+                yield serializer.dump_ndjson(rows)
+
+
+def export_response(
+    stream: PartitionStream,
+    serializer: RowListSerializer,
+    *,
+    export_format: str,
+    filename: str,
+    session_factory: Callable[[], Any] = AsyncSessionLocal,
+) -> StreamingResponse:
+    """
+    Resposta em streaming (NDJSON ou CSV) a partir das partições de um cursor no servidor.
+
+    `stream` é chamado com `db=` de uma sessão aberta durante o envio, por
+    exemplo `functools.partial(async_file_service.stream_rows_by_project, project_id=...)`.
+    """
+    extension = "csv" if export_format == "csv" else "ndjson"
+    return StreamingResponse(
+        _export_chunks(stream, serializer, export_format, session_factory),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'},
+    )
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Row
+
+from app.core.profiling import serialization_timer
+
+SchemaType = TypeVar("SchemaType", bound=BaseModel)
+
+
+class RowListSerializer(Generic[SchemaType]):
+    """
+    Serializa páginas de listagem direto de linhas do banco para JSON.
+
+    A consulta seleciona apenas as colunas dos campos do schema (`columns`),
+    sem montar objetos ORM, e um TypeAdapter compilado uma única vez valida as
+    tuplas e gera os bytes JSON no pydantic-core. `columns` substitui a
+    expressão selecionada para campos específicos.
+    """
+
+    def __init__(
+        self, schema: Type[SchemaType], model: Any, *, columns: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self.schema = schema
+        self.fields: Tuple[str, ...] = tuple(schema.model_fields)
+        overrides = columns or {}
+        self.columns: Tuple[Any, ...] = tuple(
+            overrides.get(name, getattr(model, name)) for name in self.fields
+        )
+        self._adapter = TypeAdapter(List[schema])
+        self._item_adapter = TypeAdapter(schema)
+
+    def validate(self, rows: Sequence[Row]) -> List[SchemaType]:
+        # As colunas seguem a ordem dos campos: cada tupla vira um dict simples,
+        # mais barato de validar do que o acesso por atributo em Row. Colunas
+        # extras no fim da linha (ex.: updated_at para o ETag) são ignoradas
+        fields = self.fields
+        return self._adapter.validate_python([dict(zip(fields, row)) for row in rows])
+
+    def dump_json(self, rows: Sequence[Row]) -> bytes:
+        with serialization_timer():
+            return self._adapter.dump_json(self.validate(rows))
+
+    def dump_ndjson(self, rows: Sequence[Row]) -> bytes:
+        """
+        Um objeto JSON por linha (NDJSON)
+        """
+        dump = self._item_adapter.dump_json
+        with serialization_timer():
+            return b"".join(dump(item) + b"\n" for item in self.validate(rows))
+
+    def csv_header(self) -> bytes:
+        return self._write_csv([self.fields])
+
+    def dump_csv(self, rows: Sequence[Row]) -> bytes:
+        """
+        Linhas CSV na ordem de `fields`; valores aninhados vão como JSON
+        """
+        with serialization_timer():
+            items = self._adapter.dump_python(self.validate(rows), mode="json")
+            return self._write_csv(
+                [_csv_value(item[name]) for name in self.fields] for item in items
+            )
+
+    @staticmethod
+    def _write_csv(lines) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(lines)
+        return buffer.getvalue().encode("utf-8")
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return "" if value is None else value
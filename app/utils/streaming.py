@@ -0,0 +1,76 @@
+import json
+import secrets
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import UploadFile
+
+from app.core.exceptions import PayloadTooLargeError
+
+
+class MultipartUploadStream:
+    """
+    Corpo multipart/form-data gerado sob demanda a partir de um UploadFile.
+
+    O arquivo é lido em blocos de `chunk_size` bytes e repassado diretamente
+    ao cliente HTTP, de forma que o pico de memória por upload seja de poucos
+    blocos e não do tamanho do arquivo. O limite `max_size` é verificado a cada
+    bloco, abortando o envio assim que ultrapassado.
+
+    A parte "metadata" é enviada depois do arquivo para que `file_size` já
+    reflita o total de bytes efetivamente transmitidos.
+    """
+
+    def __init__(
+        self,
+        upload: UploadFile,
+        *,
+        metadata: Optional[Dict[str, Any]] = None,
+        chunk_size: int,
+        max_size: int,
+    ) -> None:
+        self.upload = upload
+        self.metadata = metadata or {}
+        self.chunk_size = chunk_size
+        self.max_size = max_size
+        self.boundary = secrets.token_hex(16)
+        self.bytes_read = 0
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def _part_header(self, name: str, filename: Optional[str] = None, content_type: Optional[str] = None) -> bytes:
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{_escape(filename)}"'
+        header = f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n"
+        if content_type:
+            header += f"Content-Type: {content_type}\r\n"
+        return (header + "\r\n").encode("utf-8")
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield self._part_header(
+            "file",
+            filename=self.upload.filename or "upload",
+            content_type=self.upload.content_type or "application/octet-stream",
+        )
+
+        while True:
+            chunk = await self.upload.read(self.chunk_size)
+            if not chunk:
+                break
+            self.bytes_read += len(chunk)
+            if self.bytes_read > self.max_size:
+                raise PayloadTooLargeError(
+                    detail=f"O arquivo excede o tamanho máximo de {self.max_size} bytes"
+                )
+            yield chunk
+
+        metadata = dict(self.metadata, file_size=self.bytes_read)
+        yield b"\r\n" + self._part_header("metadata")
+        yield json.dumps(metadata).encode("utf-8")
+        yield f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\r", "").replace("\n", "")
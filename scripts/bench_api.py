@@ -0,0 +1,296 @@
+"""
+Benchmark em processo dos endpoints mais usados da API.
+
+Executa o `app` de app/main.py via httpx.ASGITransport (sem rede nem
+uvicorn) contra o banco configurado em SQLALCHEMY_DATABASE_URI, com o
+substituto do processador de arquivos (scripts/file_processor_standin.py)
+em processo no lugar de FILE_PROCESSOR_URL.
+Os usuários, projetos e arquivos do benchmark são criados no início e
+removidos ao final.
+
+Cada cenário (login, listagem e detalhe de projetos, listagem de arquivos,
+upload e deleção) roda com N requisições concorrentes; o resultado (vazão e
+latência p50/p95/p99) é gravado em JSON e pode ser comparado com uma
+execução anterior.
+
+Uso (com o banco local já migrado):
+    alembic upgrade head
+    python -m scripts.bench_api [--requests 500] [--concurrency 10] [--output bench-api.json]
+    python -m scripts.bench_api --compare bench-api.json --output bench-api-novo.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import platform
+import subprocess
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.response_cache import response_cache
+from app.core.security import get_password_hash
+from app.db.database import engine
+from app.main import app
+from app.services.file_processor import FileProcessorClient
+from scripts.file_processor_standin import StandInConfig, create_app
+
+API = settings.API_V1_STR
+EMAIL_PREFIX = "bench-api"
+PASSWORD = "bench-api-password"
+
+SCENARIOS = ("login", "list_projects", "get_project", "list_files", "upload", "delete")
+
+
+def seed_data(projects: int, files: int) -> Dict[str, Any]:
+    hashed_password = get_password_hash(PASSWORD)
+    with Session(engine) as db:
+        owner_id, client_id = (
+            db.execute(text(
+                "INSERT INTO users (email, hashed_password, full_name, role, is_active) "
+                "VALUES (:email, :password, 'Bench', CAST(:role AS userrole), true) RETURNING id"
+            ), {"email": f"{EMAIL_PREFIX}-{role}@example.com", "password": hashed_password, "role": role}).scalar()
+            for role in ("freelancer", "client")
+        )
+        project_ids = db.execute(text(
+            "INSERT INTO projects (name, description, owner_id, client_id) "
+            "SELECT 'Bench ' || g, 'Projeto do benchmark', :owner, :client "
+            "FROM generate_series(1, :projects) AS g RETURNING id"
+        ), {"owner": owner_id, "client": client_id, "projects": projects}).scalars().all()
+        db.execute(text(
+            """
+            INSERT INTO files (filename, original_filename, file_path, file_type, file_size,
+                               content_type, metadata, processor_file_id, uploader_id, project_id)
+            SELECT 'bench-' || p.id || '-' || g, 'bench-' || g || '.pdf', '/bench/' || p.id || '/' || g,
+                   'document', 1024, 'application/pdf', jsonb_build_object('pages', g % 10),
+                   p.id * 1000 + g, :owner, p.id
+            FROM projects AS p, generate_series(1, :files) AS g
+            WHERE p.owner_id = :owner
+            """
+        ), {"owner": owner_id, "files": files})
+        db.execute(text(
+            "UPDATE projects SET file_count = :files, total_file_size = :files * 1024 WHERE owner_id = :owner"
+        ), {"owner": owner_id, "files": files})
+        db.commit()
+    return {"owner_id": owner_id, "client_id": client_id, "project_ids": list(project_ids)}
+
+
+def cleanup_data(seed: Dict[str, Any]) -> None:
+    with Session(engine) as db:
+        params = {"owner": seed["owner_id"], "client": seed["client_id"]}
+        db.execute(text(
+            "DELETE FROM files WHERE project_id IN (SELECT id FROM projects WHERE owner_id = :owner)"
+        ), params)
+        db.execute(text("DELETE FROM projects WHERE owner_id = :owner"), params)
+        db.execute(text("DELETE FROM users WHERE id IN (:owner, :client)"), params)
+        db.commit()
+
+
+def percentile(samples: List[float], percent: float) -> float:
+    # Nearest-rank sobre amostras já ordenadas
+    return samples[max(math.ceil(len(samples) * percent / 100) - 1, 0)]
+
+
+async def run_concurrent(
+    call: Callable[[int], Awaitable[httpx.Response]], requests: int, concurrency: int
+) -> Dict[str, Any]:
+    samples: List[float] = []
+    statuses: Counter = Counter()
+    indexes = iter(range(requests))
+
+    async def worker() -> None:
+        # O iterador é compartilhado: cada worker pega a próxima requisição livre
+        for index in indexes:
+            start = time.perf_counter()
+            response = await call(index)
+            samples.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    samples.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": sum(count for status, count in statuses.items() if status >= 400),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "elapsed_s": elapsed,
+        "throughput_rps": requests / elapsed,
+        "mean_ms": sum(samples) / len(samples),
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "p99_ms": percentile(samples, 99),
+        "max_ms": samples[-1],
+    }
+
+
+async def install_standin(standin: Any) -> None:
+    """
+    Troca o cliente do processador criado no lifespan (e o usado pelos workers
+    de remoções e de uploads assíncronos) por um ligado ao substituto em processo
+    """
+    file_processor = FileProcessorClient.from_settings(settings, transport=httpx.ASGITransport(app=standin))
+    await app.state.file_processor.aclose()
+    app.state.file_processor = file_processor
+    app.state.file_deletion_worker.file_processor = file_processor
+    app.state.upload_job_runner.file_processor = file_processor
+
+
+async def drain_background() -> None:
+    """
+    Conclui os uploads assíncronos e esvazia o outbox de remoções antes de sair
+    do lifespan. O worker de remoções é parado antes, para não disputar o
+    outbox com a drenagem
+    """
+    await app.state.upload_job_runner.join()
+    await app.state.file_deletion_worker.stop()
+    while await app.state.file_deletion_worker.drain_once():
+        pass
+
+
+async def login(client: httpx.AsyncClient, role: str) -> httpx.Response:
+    return await client.post(
+        f"{API}/auth/login", data={"username": f"{EMAIL_PREFIX}-{role}@example.com", "password": PASSWORD}
+    )
+
+
+async def benchmark(args: argparse.Namespace, seed: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    project_ids = seed["project_ids"]
+    payload = b"x" * args.upload_size
+    uploaded: List[int] = []
+
+    async with app.router.lifespan_context(app):
+        await install_standin(create_app(StandInConfig(latency_ms=args.processor_latency)))
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            token = (await login(client, "freelancer")).json()["access_token"]
+            client.headers["Authorization"] = f"Bearer {token}"
+
+            async def upload(index: int) -> httpx.Response:
+                response = await client.post(
+                    f"{API}/files/upload/",
+                    data={"project_id": str(project_ids[index % len(project_ids)])},
+                    files={"file": (f"bench-{index}.bin", payload, "application/octet-stream")},
+                )
+                if response.status_code == 200:
+                    uploaded.append(response.json()["id"])
+                return response
+
+            async def delete(index: int) -> httpx.Response:
+                return await client.delete(f"{API}/files/{uploaded.pop()}")
+
+            calls: Dict[str, Callable[[int], Awaitable[httpx.Response]]] = {
+                "login": lambda index: login(client, "client"),
+                "list_projects": lambda index: client.get(f"{API}/projects/"),
+                "get_project": lambda index: client.get(
+                    f"{API}/projects/{project_ids[index % len(project_ids)]}"
+                ),
+                "list_files": lambda index: client.get(
+                    f"{API}/files/", params={"project_id": project_ids[index % len(project_ids)]}
+                ),
+                "upload": upload,
+                "delete": delete,
+            }
+
+            results = {}
+            for name in args.scenarios:
+                requests = args.login_requests if name == "login" else args.requests
+                if name == "delete" and len(uploaded) < requests + args.warmup:
+                    # Arquivos a deletar, enviados fora da medição
+                    for index in range(requests + args.warmup - len(uploaded)):
+                        await upload(index)
+                for index in range(args.warmup):
+                    await calls[name](index)
+                results[name] = await run_concurrent(calls[name], requests, args.concurrency)
+                _print_result(name, results[name])
+        await drain_background()
+    return results
+
+
+def _print_result(name: str, result: Dict[str, Any]) -> None:
+    print(
+        f"  {name:14s} {result['throughput_rps']:8.1f} req/s  p50 {result['p50_ms']:7.2f} ms  "
+        f"p95 {result['p95_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms  erros {result['errors']}"
+    )
+
+
+def _print_comparison(previous: Dict[str, Any], current: Dict[str, Any]) -> None:
+    print(f"Comparação com {previous['started_at']} ({previous.get('commit') or 'sem commit'}):")
+    for name, result in current["scenarios"].items():
+        before = previous["scenarios"].get(name)
+        if before is None:
+            continue
+        changes = [
+            f"{metric} {(result[metric] / before[metric] - 1) * 100:+6.1f}%"
+            for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+            if before[metric]
+        ]
+        print(f"  {name:14s} " + "  ".join(changes))
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(args: argparse.Namespace) -> None:
+    if args.no_cache:
+        response_cache.enabled = False
+
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    seed = seed_data(args.projects, args.files)
+    print(
+        f"API em processo: {args.requests} requisições por cenário ({args.login_requests} no login), "
+        f"concorrência {args.concurrency}, {args.projects} projetos x {args.files} arquivos"
+    )
+    try:
+        scenarios = asyncio.run(benchmark(args, seed))
+    finally:
+        cleanup_data(seed)
+
+    result = {
+        "started_at": started_at,
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "options": {
+            name: value for name, value in vars(args).items() if name not in ("output", "compare")
+        },
+        "scenarios": scenarios,
+    }
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(result, output, indent=2)
+        print(f"Resultado gravado em {args.output}")
+    if args.compare:
+        with open(args.compare) as previous:
+            _print_comparison(json.load(previous), result)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500, help="requisições por cenário")
+    parser.add_argument("--login-requests", type=int, default=50, help="requisições de login (bcrypt)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=10, help="requisições descartadas por cenário")
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--files", type=int, default=20, help="arquivos por projeto")
+    parser.add_argument("--upload-size", type=int, default=64 * 1024, help="bytes por upload")
+    parser.add_argument("--processor-latency", type=float, default=0.0, help="latência simulada (ms)")
+    parser.add_argument("--no-cache", action="store_true", help="desativa o cache de respostas")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--output", help="arquivo JSON com o resultado")
+    parser.add_argument("--compare", help="resultado JSON de uma execução anterior")
+    main(parser.parse_args())
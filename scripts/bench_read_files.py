@@ -0,0 +1,136 @@
+"""
+Mede o custo de montar a página de `read_files` (consulta + serialização).
+
+Compara o caminho antigo (objetos ORM validados pelo response_model) com o
+caminho por linhas (apenas as colunas do schema + TypeAdapter compilado). Os
+dados são inseridos dentro de uma transação desfeita ao final.
+
+Uso (com o banco local já migrado):
+    alembic upgrade head
+    python -m scripts.bench_read_files [--files 100] [--iterations 300]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.endpoints.files import file_list_serializer
+from app.api.v1.schemas.file import File
+from app.db.database import AsyncSessionLocal
+from app.services import async_file_service
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - apenas para a comparação opcional
+    orjson = None
+
+file_list_adapter = TypeAdapter(List[File])
+
+
+async def _seed(db: AsyncSession, files: int) -> int:
+    user_id = (await db.execute(text(
+        "INSERT INTO users (email, hashed_password, full_name, role, is_active) "
+        "VALUES ('bench-read-files@example.com', 'x', 'Bench', 'freelancer', true) RETURNING id"
+    ))).scalar()
+    project_id = (await db.execute(text(
+        "INSERT INTO projects (name, owner_id, client_id) VALUES ('Bench', :uid, :uid) RETURNING id"
+    ), {"uid": user_id})).scalar()
+    await db.execute(text(
+        """
+        INSERT INTO files (filename, original_filename, file_path, file_type, file_size,
+                           content_type, metadata, uploader_id, project_id)
+        SELECT 'file-' || g, 'file-' || g || '.pdf', '/data/' || g, 'document', 1024,
+               'application/pdf', '{"pages": 3, "tags": ["contract", "signed"]}', :uid, :pid
+        FROM generate_series(1, :files) AS g
+        """
+    ), {"uid": user_id, "pid": project_id, "files": files})
+    return project_id
+
+
+async def _measure(
+    db: AsyncSession, build: Callable[[], Awaitable[bytes]], iterations: int
+) -> Dict[str, float]:
+    await build()
+    samples = []
+    for _ in range(iterations):
+        # Sem o identity map da iteração anterior, como em uma requisição nova
+        db.expunge_all()
+        start = time.perf_counter()
+        await build()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[int(len(samples) * 0.95) - 1],
+    }
+
+
+async def main(files: int, iterations: int) -> None:
+    async with AsyncSessionLocal() as db:
+        project_id = await _seed(db, files)
+
+        async def orm_objects() -> List[Any]:
+            return await async_file_service.get_multi_by_project(
+                db, project_id=project_id, limit=files
+            )
+
+        async def orm_response_model() -> bytes:
+            # O que o FastAPI faz com response_model=List[File]
+            objects = await orm_objects()
+            return file_list_adapter.dump_json(
+                file_list_adapter.validate_python(objects, from_attributes=True)
+            )
+
+        async def orm_stdlib_json() -> bytes:
+            # JSONResponse padrão: jsonable_encoder + json.dumps
+            objects = await orm_objects()
+            validated = file_list_adapter.validate_python(objects, from_attributes=True)
+            return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+        async def orm_orjson_response() -> bytes:
+            # Equivalente a default_response_class=ORJSONResponse
+            objects = await orm_objects()
+            validated = file_list_adapter.validate_python(objects, from_attributes=True)
+            return orjson.dumps(file_list_adapter.dump_python(validated, mode="json"))
+
+        async def rows_type_adapter() -> bytes:
+            # Caminho atual de read_files
+            rows = await async_file_service.get_rows_by_project(
+                db, project_id=project_id, columns=file_list_serializer.columns, limit=files
+            )
+            return file_list_serializer.dump_json(rows)
+
+        variants = {
+            "orm + response_model": orm_response_model,
+            "orm + json.dumps": orm_stdlib_json,
+            "rows + TypeAdapter": rows_type_adapter,
+        }
+        if orjson is not None:
+            variants["orm + orjson response"] = orm_orjson_response
+
+        results = {name: await _measure(db, build, iterations) for name, build in variants.items()}
+        await db.rollback()
+
+    baseline = results["orm + response_model"]["mean_ms"]
+    print(f"read_files: página de {files} arquivos, {iterations} iterações")
+    for name, result in results.items():
+        print(
+            f"  {name:24s} mean {result['mean_ms']:7.3f} ms  p50 {result['p50_ms']:7.3f} ms  "
+            f"p95 {result['p95_ms']:7.3f} ms  x{baseline / result['mean_ms']:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+    asyncio.run(main(args.files, args.iterations))
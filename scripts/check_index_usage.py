@@ -0,0 +1,147 @@
+"""
+Verifica se as consultas de listagem dos repositórios usam índices.
+
+Popula o banco configurado em SQLALCHEMY_DATABASE_URI dentro de uma transação
+(desfeita ao final), executa cada consulta real dos repositórios capturando o
+SQL emitido e roda EXPLAIN sobre ele, falhando se o plano fizer Seq Scan em
+qualquer tabela.
+
+Uso (com o banco local já migrado):
+    alembic upgrade head
+    python -m scripts.check_index_usage
+"""
+import json
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import event, select, text
+from sqlalchemy.orm import Session
+
+from app.db.database import engine
+from app.db.models.file import File
+from app.db.models.user import UserRole
+from app.db.repositories.file_repository import async_file_repository, file_repository
+from app.db.repositories.project_repository import project_repository
+from app.db.repositories.user_repository import user_repository
+
+USERS = 2_000
+PROJECTS = 20_000
+FILES = 200_000
+
+SEED_SQL = [
+    f"""
+    INSERT INTO users (email, hashed_password, full_name, role, is_active)
+    SELECT 'bench-' || g || '@example.com', 'x', 'User ' || g,
+           (CASE WHEN g % 10 = 0 THEN 'admin' WHEN g % 2 = 0 THEN 'freelancer' ELSE 'client' END)::userrole,
+           true
+    FROM generate_series(1, {USERS}) AS g
+    """,
+    f"""
+    INSERT INTO projects (name, description, owner_id, client_id)
+    SELECT 'Project ' || g, 'Seeded project',
+           (SELECT min(id) FROM users) + (g % {USERS}),
+           (SELECT min(id) FROM users) + ((g * 7) % {USERS})
+    FROM generate_series(1, {PROJECTS}) AS g
+    """,
+    f"""
+    INSERT INTO files (filename, original_filename, file_path, file_type, file_size,
+                       content_type, metadata, uploader_id, project_id)
+    SELECT 'file-' || g, 'file-' || g || '.pdf', '/data/' || g, 'document', 1024,
+           'application/pdf', jsonb_build_object('batch', g % 5000),
+           (SELECT min(id) FROM users) + (g % {USERS}),
+           (SELECT min(id) FROM projects) + (g % {PROJECTS})
+    FROM generate_series(1, {FILES}) AS g
+    """,
+    "ANALYZE users",
+    "ANALYZE projects",
+    "ANALYZE files",
+]
+
+
+def _capture_sql(db: Session, call: Callable[[], Any]) -> Tuple[str, Any]:
+    """
+    Executa a consulta do repositório e devolve o SQL e parâmetros emitidos
+    """
+    captured: List[Tuple[str, Any]] = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    connection = db.connection()
+    event.listen(connection, "before_cursor_execute", _before)
+    try:
+        call()
+    finally:
+        event.remove(connection, "before_cursor_execute", _before)
+    return captured[-1]
+
+
+def _plan_nodes(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(_plan_nodes(child))
+    return nodes
+
+
+def main() -> int:
+    failures = 0
+    with Session(engine) as db:
+        for statement in SEED_SQL:
+            db.execute(text(statement))
+
+        user_id = db.execute(text("SELECT min(owner_id) FROM projects")).scalar()
+        client_id = db.execute(text("SELECT min(client_id) FROM projects")).scalar()
+        project_id = db.execute(text("SELECT min(id) FROM projects")).scalar()
+
+        checks = {
+            "files by project": lambda: file_repository.get_multi_by_project(
+                db, project_id=project_id, limit=100
+            ),
+            "files by uploader": lambda: file_repository.get_multi_by_uploader(
+                db, uploader_id=user_id, limit=100
+            ),
+            "files by owner projects": lambda: file_repository.get_multi_by_owner_projects(
+                db, owner_id=user_id, limit=100
+            ),
+            "files by client projects": lambda: file_repository.get_multi_by_client_projects(
+                db, client_id=client_id, limit=100
+            ),
+            "files by metadata": lambda: db.execute(
+                async_file_repository.filter_metadata(select(File), contains={"batch": 7}).limit(100)
+            ).scalars().all(),
+            "projects by owner": lambda: project_repository.get_multi_by_owner(
+                db, owner_id=user_id, limit=100
+            ),
+            "projects by client": lambda: project_repository.get_multi_by_client(
+                db, client_id=client_id, limit=100
+            ),
+            "users by role": lambda: user_repository.get_by_role(
+                db, role=UserRole.ADMIN, limit=100
+            ),
+        }
+
+        for name, call in checks.items():
+            statement, parameters = _capture_sql(db, call)
+            explain = db.connection().exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + statement, parameters
+            ).scalar()
+            plan = (json.loads(explain) if isinstance(explain, str) else explain)[0]["Plan"]
+            nodes = [
+                node for node in _plan_nodes(plan)
+                if node.get("Relation Name") or node.get("Index Name")
+            ]
+            uses_index = all(node["Node Type"] != "Seq Scan" for node in nodes)
+            status = "ok" if uses_index else "FAIL"
+            print(f"[{status}] {name}: " + ", ".join(
+                f"{node['Node Type']} ({node.get('Index Name', '-')})" for node in nodes
+            ))
+            if not uses_index:
+                failures += 1
+
+        db.rollback()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""
+Verifica o número de consultas SQL de cada endpoint contra um orçamento.
+
+Cria um conjunto fixo de dados (usuários, projetos e arquivos) no banco de
+SQLALCHEMY_DATABASE_URI, executa cada endpoint de auth, users, projects e
+files em processo (httpx.ASGITransport, processador de arquivos substituído
+por scripts/file_processor_standin.py) e conta as consultas pelo perfil da
+requisição (app/core/profiling.py). Falha quando um endpoint passa do
+orçamento em scripts/query_budgets.json ou muda de status, mostrando as
+consultas executadas. Os dados são removidos ao final.
+
+O cache de respostas fica desligado e o cache de usuários é limpo antes de
+cada requisição, para que a contagem não dependa da ordem dos casos.
+
+Uso (com o banco local já migrado):
+    alembic upgrade head
+    python -m scripts.check_query_budgets [--verbose]
+    python -m scripts.check_query_budgets --update   # regrava o orçamento
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.profiling import RequestProfile, end_profile, start_profile
+from app.core.response_cache import response_cache
+from app.core.security import create_access_token, get_password_hash, user_principal_cache
+from app.db.database import engine
+from app.main import app
+from scripts.bench_api import drain_background, install_standin
+from scripts.file_processor_standin import create_app
+
+API = settings.API_V1_STR
+BUDGETS_PATH = os.path.join(os.path.dirname(__file__), "query_budgets.json")
+EMAIL_PREFIX = "query-budget"
+PASSWORD = "query-budget-password"
+ROLES = ("admin", "freelancer", "client")
+
+
+@dataclass
+class Case:
+    name: str
+    role: Optional[str]
+    method: str
+    url: str
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+def _email(name: str) -> str:
+    return f"{EMAIL_PREFIX}-{name}@example.com"
+
+
+def _seed() -> Dict[str, int]:
+    hashed_password = get_password_hash(PASSWORD)
+    fixture: Dict[str, int] = {}
+    with Session(engine) as db:
+        for name, role in [*((role, role) for role in ROLES), ("target", "client")]:
+            fixture[f"{name}_id"] = db.execute(text(
+                "INSERT INTO users (email, hashed_password, full_name, role, is_active) "
+                "VALUES (:email, :password, :name, CAST(:role AS userrole), true) RETURNING id"
+            ), {"email": _email(name), "password": hashed_password, "name": name, "role": role}).scalar()
+
+        project_ids = db.execute(text(
+            "INSERT INTO projects (name, description, owner_id, client_id, file_count, total_file_size) "
+            "SELECT 'Budget ' || g, 'Projeto do orçamento de consultas', :owner, :client, 3, 3072 "
+            "FROM generate_series(1, 3) AS g ORDER BY g RETURNING id"
+        ), {"owner": fixture["freelancer_id"], "client": fixture["client_id"]}).scalars().all()
+        fixture["project_id"], fixture["other_project_id"], fixture["delete_project_id"] = sorted(project_ids)
+
+        file_ids = db.execute(text(
+            """
+            INSERT INTO files (filename, original_filename, file_path, file_type, file_size,
+                               content_type, metadata, processor_file_id, uploader_id, project_id)
+            SELECT 'budget-' || p.id || '-' || g, 'budget-' || g || '.pdf', '/budget/' || p.id || '/' || g,
+                   'document', 1024, 'application/pdf', jsonb_build_object('pages', g),
+                   p.id * 1000 + g, :owner, p.id
+            FROM projects AS p, generate_series(1, 3) AS g
+            WHERE p.owner_id = :owner
+            ORDER BY p.id, g
+            RETURNING id
+            """
+        ), {"owner": fixture["freelancer_id"]}).scalars().all()
+        fixture["file_id"] = min(file_ids)
+        # Fora do projeto removido em projects.delete_project, que leva os arquivos junto
+        fixture["delete_file_id"] = db.execute(text(
+            "SELECT max(id) FROM files WHERE project_id = :project"
+        ), {"project": fixture["other_project_id"]}).scalar()
+
+        fixture["upload_job_id"] = db.execute(text(
+            "INSERT INTO upload_jobs (status, project_id, uploader_id, original_filename, content_type, "
+            "file_size, file_id) VALUES ('completed', :project, :owner, 'budget-1.pdf', 'application/pdf', "
+            "1024, :file) RETURNING id"
+        ), {"project": fixture["project_id"], "owner": fixture["freelancer_id"], "file": fixture["file_id"]}).scalar()
+        db.commit()
+    return fixture
+
+
+def _cleanup(fixture: Dict[str, int]) -> None:
+    with Session(engine) as db:
+        params = {"owner": fixture["freelancer_id"], "pattern": f"{EMAIL_PREFIX}-%"}
+        db.execute(text(
+            "DELETE FROM files WHERE project_id IN (SELECT id FROM projects WHERE owner_id = :owner)"
+        ), params)
+        db.execute(text("DELETE FROM projects WHERE owner_id = :owner"), params)
+        db.execute(text("DELETE FROM users WHERE email LIKE :pattern"), params)
+        db.commit()
+
+
+def _cases(fixture: Dict[str, int]) -> List[Case]:
+    project_id = fixture["project_id"]
+    import_rows = json.dumps([
+        {"email": _email("import-1"), "password": "secret123", "role": "client"},
+        {"email": _email("import-2"), "password": "secret123", "role": "client"},
+        {"email": _email("client"), "password": "secret123", "role": "client"},
+    ]).encode("utf-8")
+    upload = ("budget.txt", b"conteudo do arquivo", "text/plain")
+
+    return [
+        Case("auth.login_access_token", None, "POST", "/auth/login",
+             {"data": {"username": _email("freelancer"), "password": PASSWORD}}),
+        Case("auth.register_user", None, "POST", "/auth/register",
+             {"json": {"email": _email("register"), "password": "secret123", "role": "client"}}),
+        Case("auth.read_users_me", "freelancer", "GET", "/auth/me"),
+
+        Case("users.read_users[admin]", "admin", "GET", "/users/", {"params": {"limit": 10}}),
+        Case("users.read_users[client]", "client", "GET", "/users/"),
+        Case("users.read_clients[freelancer]", "freelancer", "GET", "/users/clients", {"params": {"limit": 10}}),
+        Case("users.create_user[admin]", "admin", "POST", "/users/",
+             {"json": {"email": _email("created"), "password": "secret123", "role": "client"}}),
+        Case("users.import_users[admin]", "admin", "POST", "/users/import",
+             {"files": {"file": ("users.json", import_rows, "application/json")}}),
+        Case("users.read_user_me", "client", "GET", "/users/me"),
+        Case("users.update_user_me", "client", "PUT", "/users/me", {"json": {"full_name": "Cliente"}}),
+        Case("users.read_user_by_id[admin]", "admin", "GET", f"/users/{fixture['client_id']}"),
+        Case("users.update_user[admin]", "admin", "PUT", f"/users/{fixture['target_id']}",
+             {"json": {"email": _email("target"), "full_name": "Alvo"}}),
+        Case("users.delete_user[admin]", "admin", "DELETE", f"/users/{fixture['target_id']}"),
+
+        Case("projects.create_project", "freelancer", "POST", "/projects/",
+             {"json": {"name": "Budget novo", "client_id": fixture["client_id"]}}),
+        Case("projects.read_projects[freelancer]", "freelancer", "GET", "/projects/"),
+        Case("projects.read_projects[client]", "client", "GET", "/projects/"),
+        Case("projects.read_projects[admin]", "admin", "GET", "/projects/", {"params": {"limit": 10}}),
+        Case("projects.export_projects", "freelancer", "GET", "/projects/export"),
+        Case("projects.search_projects", "freelancer", "GET", "/projects/search", {"params": {"q": "budget"}}),
+        Case("projects.read_project", "client", "GET", f"/projects/{project_id}"),
+        Case("projects.update_project", "freelancer", "PUT", f"/projects/{project_id}",
+             {"json": {"name": "Budget 1", "description": "Atualizado"}}),
+        Case("projects.delete_project", "freelancer", "DELETE", f"/projects/{fixture['delete_project_id']}"),
+
+        Case("files.upload_file", "freelancer", "POST", "/files/upload/",
+             {"data": {"project_id": str(project_id)}, "files": {"file": upload}}),
+        Case("files.upload_file[async]", "freelancer", "POST", "/files/upload/",
+             {"params": {"mode": "async"}, "data": {"project_id": str(project_id)}, "files": {"file": upload}}),
+        Case("files.read_upload_job", "freelancer", "GET", f"/files/jobs/{fixture['upload_job_id']}"),
+        Case("files.upload_files_batch", "freelancer", "POST", "/files/upload/batch/",
+             {"data": {"project_id": str(project_id)}, "files": [("files", upload), ("files", upload)]}),
+        Case("files.read_files[project]", "freelancer", "GET", "/files/", {"params": {"project_id": project_id}}),
+        Case("files.read_files[client]", "client", "GET", "/files/"),
+        Case("files.export_files", "freelancer", "GET", "/files/export", {"params": {"project_id": project_id}}),
+        Case("files.search_files", "freelancer", "GET", "/files/search", {"params": {"q": "budget"}}),
+        Case("files.read_file", "client", "GET", f"/files/{fixture['file_id']}"),
+        Case("files.delete_file", "freelancer", "DELETE", f"/files/{fixture['delete_file_id']}"),
+    ]
+
+
+class _ProfiledApp:
+    """
+    Cria o perfil da requisição por fora da aplicação e guarda o último,
+    já incluindo as consultas feitas durante respostas em streaming
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self.profile: Optional[RequestProfile] = None
+
+    async def __call__(self, scope, receive, send) -> None:
+        profile, token = start_profile(track_statements=True)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            end_profile(token)
+            self.profile = profile
+
+
+async def measure(fixture: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    profiled = _ProfiledApp(app)
+
+    async with app.router.lifespan_context(app):
+        await install_standin(create_app())
+        transport = httpx.ASGITransport(app=profiled)
+        async with httpx.AsyncClient(transport=transport, base_url="http://budget") as client:
+            for case in _cases(fixture):
+                headers = {}
+                if case.role:
+                    headers["Authorization"] = f"Bearer {create_access_token(fixture[f'{case.role}_id'])}"
+                user_principal_cache.clear()
+                response = await client.request(
+                    case.method, f"{API}{case.url}", headers=headers, **case.kwargs
+                )
+                profile = profiled.profile
+                results[case.name] = {
+                    "status": response.status_code,
+                    "queries": profile.db_queries,
+                    "statements": profile.statements or {},
+                }
+        await drain_background()
+    return results
+
+
+def _print_statements(statements: Dict[str, int]) -> None:
+    for statement, count in statements.items():
+        print(f"      {count}x {' '.join(statement.split())[:200]}")
+
+
+def main(update: bool, verbose: bool) -> int:
+    response_cache.enabled = False
+    # As consultas repetidas já aparecem no relatório abaixo
+    logging.getLogger("app.core.profiling").setLevel(logging.ERROR)
+    fixture = _seed()
+    try:
+        results = asyncio.run(measure(fixture))
+    finally:
+        _cleanup(fixture)
+
+    if update:
+        budgets = {name: {"status": r["status"], "queries": r["queries"]} for name, r in results.items()}
+        with open(BUDGETS_PATH, "w") as output:
+            json.dump(budgets, output, indent=2)
+            output.write("\n")
+        print(f"Orçamento de {len(budgets)} endpoints gravado em {BUDGETS_PATH}")
+        return 0
+
+    with open(BUDGETS_PATH) as budgets_file:
+        budgets = json.load(budgets_file)
+
+    failures = 0
+    for name, result in results.items():
+        budget = budgets.get(name)
+        failed = True
+        if budget is None:
+            verdict = "SEM ORÇAMENTO"
+        elif result["status"] != budget["status"]:
+            verdict = f"STATUS {result['status']} (esperado {budget['status']})"
+        elif result["queries"] > budget["queries"]:
+            verdict = f"ACIMA do orçamento ({budget['queries']})"
+        else:
+            failed = False
+            verdict = "ok"
+            if result["queries"] < budget["queries"]:
+                verdict = f"abaixo do orçamento ({budget['queries']}); atualize com --update"
+
+        failures += failed
+        print(f"  {name:40s} {result['status']}  {result['queries']:3d} consultas  {verdict}")
+        if failed or verbose:
+            _print_statements(result["statements"])
+
+    if failures:
+        print(f"{failures} endpoint(s) fora do orçamento; se o aumento for intencional, rode com --update")
+        return 1
+    print("Todos os endpoints dentro do orçamento")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--update", action="store_true", help="regrava o orçamento com as contagens atuais")
+    parser.add_argument("--verbose", action="store_true", help="mostra as consultas de todos os endpoints")
+    args = parser.parse_args()
+    sys.exit(main(args.update, args.verbose))
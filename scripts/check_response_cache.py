@@ -0,0 +1,201 @@
+"""
+Verifica o cache de respostas de listagem nos dois backends.
+
+Exercita ResponseCache sobre o backend em memória e sobre o backend Redis com
+um cliente fake local (GET/SET EX/INCR com expiração por um relógio
+controlado), sem precisar de servidor: miss, hit, 304 a partir do cache,
+invalidação por tag, expiração, falhas do backend e o limite das gerações no
+backend em memória. Com --redis-url, repete os cenários contra um servidor
+Redis real (requer o pacote 'redis').
+
+Uso:
+    python -m scripts.check_response_cache
+    python -m scripts.check_response_cache --redis-url redis://localhost:6379/15
+"""
+import argparse
+import asyncio
+import sys
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.core.response_cache import (
+    MemoryResponseCacheBackend,
+    RedisResponseCacheBackend,
+    ResponseCache,
+)
+
+TTL = 30
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    """
+    Subconjunto do cliente síncrono do redis-py usado pelo backend
+    """
+
+    def __init__(self, clock: Callable[[], float]) -> None:
+        self.clock = clock
+        self.data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+
+    def _live(self, key: str) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self.clock():
+            del self.data[key]
+            return None
+        return value
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._live(key)
+
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> bool:
+        self.data[key] = (value, self.clock() + ex if ex else None)
+        return True
+
+    def incr(self, key: str) -> int:
+        value = int(self._live(key) or 0) + 1
+        _, expires_at = self.data.get(key, (None, None))
+        self.data[key] = (str(value).encode("ascii"), expires_at)
+        return value
+
+
+class BrokenRedis:
+    def __getattr__(self, name: str) -> Any:
+        def fail(*args: Any, **kwargs: Any) -> Any:
+            raise ConnectionError("redis indisponível")
+
+        return fail
+
+
+def make_request(path: str = "/api/v1/projects/", query: str = "", etag: Optional[str] = None) -> Request:
+    headers = [(b"if-none-match", etag.encode("ascii"))] if etag else []
+    return Request(
+        {"type": "http", "method": "GET", "path": path, "query_string": query.encode("ascii"), "headers": headers}
+    )
+
+
+async def cached_get(cache: ResponseCache, *, tag: str, body: bytes, etag: Optional[str] = None) -> Tuple[bool, Response]:
+    """
+    Simula um endpoint de listagem: lookup e, no miss, store do corpo
+    """
+    request = make_request(etag=etag)
+    slot = await cache.lookup(request, user_id=1, tag=tag)
+    if slot.hit:
+        return True, cache.respond(request, slot)
+    response = Response(headers={"etag": '"v1"', "cache-control": "private, no-cache"})
+    return False, await cache.store(slot, body, response)
+
+
+async def check_cache(name: str, cache: ResponseCache, advance: Optional[Callable[[float], None]]) -> List[str]:
+    failures: List[str] = []
+
+    def expect(condition: bool, message: str) -> None:
+        if not condition:
+            failures.append(f"{name}: {message}")
+
+    tag, other = f"project:{uuid.uuid4().hex}", f"user:{uuid.uuid4().hex}"
+
+    hit, _ = await cached_get(cache, tag=tag, body=b"[1]")
+    expect(not hit, "primeira leitura deveria ser miss")
+    hit, response = await cached_get(cache, tag=tag, body=b"[2]")
+    expect(hit and response.body == b"[1]", "segunda leitura deveria devolver o corpo guardado")
+    expect(response.headers.get("etag") == '"v1"', "hit deveria manter o ETag")
+
+    hit, response = await cached_get(cache, tag=tag, body=b"[2]", etag='"v1"')
+    expect(hit and response.status_code == 304, "If-None-Match com o ETag guardado deveria dar 304")
+
+    await cached_get(cache, tag=other, body=b"[other]")
+    await cache.ainvalidate(tag)
+    hit, _ = await cached_get(cache, tag=tag, body=b"[3]")
+    expect(not hit, "leitura após invalidar a tag deveria ser miss")
+    hit, response = await cached_get(cache, tag=tag, body=b"[4]")
+    expect(hit and response.body == b"[3]", "nova geração deveria ser guardada")
+    hit, _ = await cached_get(cache, tag=other, body=b"[other]")
+    expect(hit, "invalidar uma tag não deveria afetar as outras")
+
+    if advance is not None:
+        advance(TTL + 1)
+        hit, _ = await cached_get(cache, tag=tag, body=b"[5]")
+        expect(not hit, "entrada deveria expirar após o TTL")
+    return failures
+
+
+async def check_generation_bound() -> List[str]:
+    failures: List[str] = []
+    backend = MemoryResponseCacheBackend(maxsize=4, ttl=TTL)
+    cache = ResponseCache(backend, ttl=TTL)
+
+    await cached_get(cache, tag="project:stale", body=b"[old]")
+    cache.invalidate("project:stale")
+    await cached_get(cache, tag="project:stale", body=b"[new]")
+    for index in range(100):
+        cache.invalidate(f"project:{index}")
+
+    size = backend._generations.stats()["size"]
+    if size > 4:
+        failures.append(f"memory: {size} gerações guardadas com maxsize=4")
+    hit, response = await cached_get(cache, tag="project:stale", body=b"[fresh]")
+    if hit and response.body == b"[old]":
+        failures.append("memory: geração descartada reabriu uma entrada já invalidada")
+    return failures
+
+
+async def check_backend_errors() -> List[str]:
+    cache = ResponseCache(RedisResponseCacheBackend(BrokenRedis()), ttl=TTL)
+    hit, response = await cached_get(cache, tag="project:1", body=b"[1]")
+    await cache.ainvalidate("project:1")
+    if hit or response.body != b"[1]" or cache.errors != 2:
+        return [f"redis indisponível: esperado miss servido com 2 erros, obtido {cache.stats()}"]
+    return []
+
+
+async def run(redis_url: Optional[str]) -> List[str]:
+    failures: List[str] = []
+
+    failures += await check_cache(
+        "memory", ResponseCache(MemoryResponseCacheBackend(maxsize=100, ttl=TTL), ttl=TTL), advance=None
+    )
+
+    clock = FakeClock()
+
+    def advance(seconds: float) -> None:
+        clock.now += seconds
+
+    fake = RedisResponseCacheBackend(FakeRedis(clock), prefix=f"check-{uuid.uuid4().hex}")
+    failures += await check_cache("redis (fake)", ResponseCache(fake, ttl=TTL), advance=advance)
+
+    failures += await check_generation_bound()
+    failures += await check_backend_errors()
+
+    if redis_url:
+        backend = RedisResponseCacheBackend.from_url(redis_url, prefix=f"check-{uuid.uuid4().hex}")
+        failures += await check_cache("redis", ResponseCache(backend, ttl=TTL), advance=None)
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", help="servidor Redis real para repetir os cenários")
+    args = parser.parse_args()
+
+    failures = asyncio.run(run(args.redis_url))
+    for failure in failures:
+        print(f"FALHA {failure}")
+    if failures:
+        sys.exit(1)
+    print("Cache de respostas OK (memory, redis fake" + (", redis" if args.redis_url else "") + ")")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Substituto local do processador de arquivos (FILE_PROCESSOR_URL).
+
+Implementa o contrato usado por app/api/v1/endpoints/files.py:
+    POST   /api/files/upload   multipart com as partes "file" e "metadata"
+    DELETE /api/files/{id}
+e expõe GET /api/stats com os contadores. A latência, o limite de vazão do
+upload (compartilhado entre conexões) e a taxa de erros são configuráveis,
+para medir a API sem o serviço real (ex.: no CI).
+
+Uso:
+    python -m scripts.file_processor_standin [--port 5000] [--latency-ms 20]
+        [--bandwidth-mbps 100] [--error-rate 0.01] [--error-status 503]
+    FILE_PROCESSOR_URL=http://localhost:5000 uvicorn app.main:app
+
+Também pode ser usado em processo: `create_app(StandInConfig(...))` com
+httpx.ASGITransport (ver scripts/bench_api.py e scripts/load_uploads.py).
+"""
+import argparse
+import asyncio
+import json
+import random
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+@dataclass
+class StandInConfig:
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    # Vazão máxima do corpo dos uploads somando todas as conexões (0 = sem limite)
+    bandwidth_bytes_per_second: float = 0.0
+    # Fração das chamadas respondidas com `error_status` (upload e delete)
+    error_rate: float = 0.0
+    error_status: int = 503
+    seed: Optional[int] = None
+
+
+class _Bandwidth:
+    """
+    Limita a vazão somada dos corpos recebidos: cada bloco reserva o seu
+    intervalo de transmissão e espera até o fim dele
+    """
+
+    def __init__(self, bytes_per_second: float) -> None:
+        self.bytes_per_second = bytes_per_second
+        self._available_at = 0.0
+
+    async def consume(self, size: int) -> None:
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._available_at)
+        self._available_at = start + size / self.bytes_per_second
+        await asyncio.sleep(self._available_at - now)
+
+
+class _ThrottledApp:
+    """
+    Middleware ASGI que aplica o limite de vazão ao `receive` dos uploads
+    """
+
+    def __init__(self, app: Any, bandwidth: _Bandwidth) -> None:
+        self.app = app
+        self.bandwidth = bandwidth
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        async def throttled_receive():
+            message = await receive()
+            if message["type"] == "http.request" and message.get("body"):
+                await self.bandwidth.consume(len(message["body"]))
+            return message
+
+        await self.app(scope, throttled_receive, send)
+
+
+class StandInState:
+    def __init__(self, config: StandInConfig) -> None:
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.next_id = 0
+        self.uploads = 0
+        self.upload_bytes = 0
+        self.deletes = 0
+        self.errors = 0
+        self.in_progress = 0
+        self.max_in_progress = 0
+
+    async def delay(self) -> None:
+        latency = self.config.latency_ms + self.random.uniform(0, self.config.latency_jitter_ms)
+        if latency:
+            await asyncio.sleep(latency / 1000)
+
+    def injected_error(self) -> Optional[JSONResponse]:
+        if self.config.error_rate and self.random.random() < self.config.error_rate:
+            self.errors += 1
+            return JSONResponse({"detail": "Erro simulado"}, status_code=self.config.error_status)
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "config": asdict(self.config),
+            "uploads": self.uploads,
+            "upload_bytes": self.upload_bytes,
+            "deletes": self.deletes,
+            "errors": self.errors,
+            "in_progress": self.in_progress,
+            "max_in_progress": self.max_in_progress,
+        }
+
+
+async def upload(request: Request) -> JSONResponse:
+    state: StandInState = request.app.state.standin
+    state.in_progress += 1
+    state.max_in_progress = max(state.max_in_progress, state.in_progress)
+    try:
+        # O corpo é lido inteiro (arquivos grandes vão para disco) antes de responder
+        async with request.form() as form:
+            file = form.get("file")
+            if file is None or isinstance(file, str):
+                return JSONResponse({"detail": "Parte 'file' ausente"}, status_code=400)
+            metadata = json.loads(form.get("metadata") or "{}")
+            size = file.size or 0
+
+        await state.delay()
+        error = state.injected_error()
+        if error is not None:
+            return error
+
+        state.next_id += 1
+        state.uploads += 1
+        state.upload_bytes += size
+        file_id = state.next_id
+        content_type = file.content_type or "application/octet-stream"
+        return JSONResponse({
+            "id": file_id,
+            "filename": f"{file_id}-{file.filename}",
+            "original_filename": file.filename,
+            "file_path": f"/standin/{metadata.get('project_id', 0)}/{file_id}",
+            "file_type": content_type.split("/")[0],
+            "file_size": size,
+            "content_type": content_type,
+            "metadata": {"processor": "standin"},
+        })
+    finally:
+        state.in_progress -= 1
+
+
+async def delete(request: Request) -> JSONResponse:
+    state: StandInState = request.app.state.standin
+    await state.delay()
+    error = state.injected_error()
+    if error is not None:
+        return error
+    state.deletes += 1
+    return JSONResponse({"id": request.path_params["file_id"], "deleted": True})
+
+
+async def stats(request: Request) -> JSONResponse:
+    return JSONResponse(request.app.state.standin.stats())
+
+
+def create_app(config: StandInConfig = StandInConfig()) -> Any:
+    app = Starlette(routes=[
+        Route("/api/files/upload", upload, methods=["POST"]),
+        Route("/api/files/{file_id:int}", delete, methods=["DELETE"]),
+        Route("/api/stats", stats, methods=["GET"]),
+    ])
+    app.state.standin = StandInState(config)
+    if config.bandwidth_bytes_per_second:
+        return _ThrottledApp(app, _Bandwidth(config.bandwidth_bytes_per_second))
+    return app
+
+
+def standin_state(app: Any) -> StandInState:
+    """
+    Estado (contadores) de um app criado por `create_app`
+    """
+    return (app.app if isinstance(app, _ThrottledApp) else app).state.standin
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latência de cada resposta")
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0, help="variação aleatória somada")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0.0, help="vazão máxima do upload (0 = sem limite)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fração de respostas com erro")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int, help="semente dos erros e da variação de latência")
+
+
+def config_from_args(args: argparse.Namespace) -> StandInConfig:
+    return StandInConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        bandwidth_bytes_per_second=args.bandwidth_mbps * 1_000_000 / 8,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(config_from_args(args)), host=args.host, port=args.port)
@@ -0,0 +1,221 @@
+"""
+Gerador de carga de uploads concorrentes pelo POST /files/upload/.
+
+Envia uploads de vários tamanhos e mede, por tamanho, vazão, latência
+(p50/p95/p99) e o pico de memória (RSS) da API. Por padrão a API roda em
+processo (httpx.ASGITransport) com o substituto do processador de arquivos
+(scripts/file_processor_standin.py) também em processo. Com --url a carga vai
+para uma API já em execução, que usa o seu próprio FILE_PROCESSOR_URL, e
+--api-pid indica o processo cujo RSS é amostrado.
+
+Os arquivos enviados são arquivos esparsos em disco, lidos em blocos pelo
+httpx, para que o gerador não infle a memória medida no modo em processo.
+Os usuários e projetos são criados no banco de SQLALCHEMY_DATABASE_URI (o
+mesmo da API) e removidos ao final, junto com os arquivos enviados.
+
+Uso (com o banco local já migrado):
+    python -m scripts.load_uploads [--sizes 64K 1M 16M] [--uploads 50] [--concurrency 8]
+        [--latency-ms 20] [--bandwidth-mbps 200] [--error-rate 0.01] [--mixed]
+
+    python -m scripts.file_processor_standin --port 5000 &
+    FILE_PROCESSOR_URL=http://localhost:5000 uvicorn app.main:app --port 8000 &
+    python -m scripts.load_uploads --url http://localhost:8000 --api-pid <pid do uvicorn>
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import threading
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+from app.main import app
+from scripts.bench_api import API, cleanup_data, install_standin, login, run_concurrent, seed_data
+from scripts.file_processor_standin import add_config_arguments, config_from_args, create_app, standin_state
+
+UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def parse_size(value: str) -> int:
+    unit = value[-1:].upper()
+    if unit in UNITS:
+        return int(float(value[:-1]) * UNITS[unit])
+    return int(value)
+
+
+def format_size(size: int) -> str:
+    for unit in ("G", "M", "K"):
+        if size >= UNITS[unit] and size % UNITS[unit] == 0:
+            return f"{size // UNITS[unit]}{unit}"
+    return str(size)
+
+
+class RssSampler:
+    """
+    Amostra o RSS de um processo em uma thread, via /proc/<pid>/status
+    (Linux); `reset` inicia uma nova janela de pico
+    """
+
+    def __init__(self, pid: int, interval: float = 0.005) -> None:
+        self.path = f"/proc/{pid}/status"
+        self.interval = interval
+        self.available = os.path.exists(self.path)
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def read(self) -> int:
+        if not self.available:
+            return 0
+        with open(self.path) as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.read())
+
+    def reset(self) -> int:
+        current = self.read()
+        self.peak = current
+        return current
+
+    def __enter__(self) -> "RssSampler":
+        if self.available:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        if self.available:
+            self._thread.join()
+
+
+async def _phase(
+    client: httpx.AsyncClient, sampler: RssSampler, paths: Dict[int, str], sizes: List[int],
+    *, project_ids: List[int], uploads: int, concurrency: int,
+) -> Dict[str, Any]:
+    sent_bytes = 0
+
+    async def upload(index: int) -> httpx.Response:
+        nonlocal sent_bytes
+        size = sizes[index % len(sizes)]
+        with open(paths[size], "rb") as file:
+            response = await client.post(
+                f"{API}/files/upload/",
+                data={"project_id": str(project_ids[index % len(project_ids)])},
+                files={"file": (f"load-{index}.bin", file, "application/octet-stream")},
+            )
+        if response.status_code == 200:
+            sent_bytes += size
+        return response
+
+    baseline = sampler.reset()
+    result = await run_concurrent(upload, uploads, concurrency)
+    mib = 1024 ** 2
+    result.update({
+        "sizes": [format_size(size) for size in sizes],
+        "throughput_mib_s": sent_bytes / mib / result["elapsed_s"],
+        "rss_baseline_mib": baseline / mib,
+        "rss_peak_mib": sampler.peak / mib,
+        "rss_growth_mib": (sampler.peak - baseline) / mib,
+    })
+    return result
+
+
+async def run(args: argparse.Namespace, seed: Dict[str, Any], paths: Dict[int, str]) -> Dict[str, Any]:
+    sizes = sorted(paths)
+    phases = [sizes] if args.mixed else [[size] for size in sizes]
+    results: Dict[str, Any] = {"phases": {}}
+
+    async with AsyncExitStack() as stack:
+        standin = None
+        if args.url:
+            client = await stack.enter_async_context(httpx.AsyncClient(base_url=args.url, timeout=None))
+            pid = args.api_pid
+        else:
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            standin = create_app(config_from_args(args))
+            await install_standin(standin)
+            client = await stack.enter_async_context(httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://load", timeout=None
+            ))
+            pid = os.getpid()
+
+        token = (await login(client, "freelancer")).json()["access_token"]
+        client.headers["Authorization"] = f"Bearer {token}"
+
+        with RssSampler(pid) if pid else RssSampler(-1) as sampler:
+            if not sampler.available:
+                print("  RSS indisponível (sem /proc ou sem --api-pid): memória não será medida")
+            for phase_sizes in phases:
+                name = "+".join(format_size(size) for size in phase_sizes)
+                result = await _phase(
+                    client, sampler, paths, phase_sizes, project_ids=seed["project_ids"],
+                    uploads=args.uploads, concurrency=args.concurrency,
+                )
+                results["phases"][name] = result
+                _print_phase(name, result)
+
+        if standin is not None:
+            results["standin"] = standin_state(standin).stats()
+    return results
+
+
+def _print_phase(name: str, result: Dict[str, Any]) -> None:
+    print(
+        f"  {name:12s} {result['throughput_rps']:7.1f} req/s {result['throughput_mib_s']:8.1f} MiB/s  "
+        f"p50 {result['p50_ms']:8.1f} ms  p95 {result['p95_ms']:8.1f} ms  p99 {result['p99_ms']:8.1f} ms  "
+        f"RSS pico {result['rss_peak_mib']:7.1f} MiB (+{result['rss_growth_mib']:.1f})  "
+        f"erros {result['errors']} {result['statuses']}"
+    )
+
+
+def main(args: argparse.Namespace) -> None:
+    sizes = sorted({parse_size(size) for size in args.sizes})
+    too_large = [format_size(size) for size in sizes if size > settings.MAX_UPLOAD_SIZE]
+    if too_large:
+        print(f"Aviso: {', '.join(too_large)} acima de MAX_UPLOAD_SIZE; espere respostas 413")
+
+    print(
+        f"Uploads: {args.uploads} por fase, concorrência {args.concurrency}, "
+        f"{'API em ' + args.url if args.url else 'API e processador em processo'}"
+    )
+    seed = seed_data(args.projects, 0)
+    try:
+        with tempfile.TemporaryDirectory(prefix="load-uploads-") as directory:
+            paths = {}
+            for size in sizes:
+                paths[size] = os.path.join(directory, f"{size}.bin")
+                with open(paths[size], "wb") as file:
+                    # Arquivo esparso: ocupa espaço em disco só quando lido
+                    file.truncate(size)
+            results = asyncio.run(run(args, seed, paths))
+    finally:
+        cleanup_data(seed)
+
+    if args.output:
+        results["options"] = {name: value for name, value in vars(args).items() if name != "output"}
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+        print(f"Resultado gravado em {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["64K", "1M", "16M"], help="tamanhos (K, M, G)")
+    parser.add_argument("--uploads", type=int, default=50, help="uploads por fase")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mixed", action="store_true", help="uma única fase alternando os tamanhos")
+    parser.add_argument("--projects", type=int, default=5)
+    parser.add_argument("--url", help="URL de uma API em execução (padrão: em processo)")
+    parser.add_argument("--api-pid", type=int, help="PID da API em --url, para medir o RSS")
+    parser.add_argument("--output", help="arquivo JSON com o resultado")
+    add_config_arguments(parser)
+    main(parser.parse_args())